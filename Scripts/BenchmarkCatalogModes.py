@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# File: BenchmarkCatalogModes.py
+# Path: Scripts/BenchmarkCatalogModes.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:32AM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: Compares the launch_server.py database serving modes (file-backed
+mmap connections vs. one shared in-memory copy) on the Books query
+patterns issued by new-desktop-library.html.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (run from the OurLibrary project root)
+- Imports launch_server.py from the current directory, not the script location
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.getcwd())
+
+from launch_server import DatabaseVersion, MemoryDatabaseVersion, BOOK_LIST_COLUMNS  # noqa: E402
+
+# Query shapes taken from new-desktop-library.html (search, filters, detail view)
+QUERY_PATTERNS = {
+    "title_search": (f"SELECT {BOOK_LIST_COLUMNS}, Thumbnail FROM Books WHERE Title LIKE ? ORDER BY Title LIMIT 200",
+                     lambda ids: (f"%{random.randint(0, 99):02d}%",)),
+    "author_search": (f"SELECT {BOOK_LIST_COLUMNS}, Thumbnail FROM Books WHERE Author LIKE ? ORDER BY Author, Title LIMIT 200",
+                      lambda ids: (f"%{random.randint(0, 9)}%",)),
+    "category_filter": ("SELECT * FROM Books WHERE Category_ID = ? ORDER BY Title LIMIT 100",
+                        lambda ids: (random.choice(ids["categories"]),)),
+    "subject_filter": ("SELECT * FROM Books WHERE Category_ID = ? AND Subject_ID = ? ORDER BY Title LIMIT 100",
+                       lambda ids: random.choice(ids["subjects"])),
+    "book_detail": ("SELECT * FROM Books WHERE ID = ?",
+                    lambda ids: (random.choice(ids["books"]),)),
+    "categories": ("SELECT ID, Category FROM Categories ORDER BY Category",
+                   lambda ids: ()),
+    "subjects": ("SELECT ID, Subject FROM Subjects WHERE Category_ID = ? ORDER BY Subject",
+                 lambda ids: (random.choice(ids["categories"]),)),
+}
+
+
+def LoadSampleIds(db_path):
+    version = DatabaseVersion(db_path, 1)
+    conn = version.acquire()
+    try:
+        return {
+            "books": [r[0] for r in conn.execute("SELECT ID FROM Books")] or [0],
+            "categories": [r[0] for r in conn.execute("SELECT ID FROM Categories")] or [0],
+            "subjects": [(r[0], r[1]) for r in conn.execute("SELECT Category_ID, ID FROM Subjects")] or [(0, 0)],
+        }
+    finally:
+        version.release(conn)
+        version.retire()
+
+
+def RunPattern(version, sql, make_params, ids, threads, iterations):
+    latencies = []
+    lock = threading.Lock()
+
+    def Worker():
+        local = []
+        conn = version.acquire()
+        try:
+            for _ in range(iterations):
+                params = make_params(ids)
+                start = time.perf_counter()
+                conn.execute(sql, params).fetchall()
+                local.append(time.perf_counter() - start)
+        finally:
+            version.release(conn)
+        with lock:
+            latencies.extend(local)
+
+    workers = [threading.Thread(target=Worker) for _ in range(threads)]
+    start = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "qps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+def BenchmarkModes(db_path, threads, iterations, mmap_mb):
+    ids = LoadSampleIds(db_path)
+    modes = {
+        "file+mmap": lambda: DatabaseVersion(db_path, threads, mmap_mb * 1024 * 1024),
+        "memory": lambda: MemoryDatabaseVersion(db_path, threads),
+    }
+
+    load_start = time.perf_counter()
+    MemoryDatabaseVersion(db_path, 1).retire()
+    load_ms = (time.perf_counter() - load_start) * 1000
+
+    print(f"Database: {db_path} ({os.path.getsize(db_path) / 1024 / 1024:.1f} MB), "
+          f"threads={threads}, iterations/thread={iterations}")
+    print(f"In-memory image load: {load_ms:.1f} ms")
+    print(f"{'pattern':<16} {'mode':<10} {'qps':>10} {'p50 ms':>9} {'p95 ms':>9}")
+
+    for name, (sql, make_params) in QUERY_PATTERNS.items():
+        for mode, factory in modes.items():
+            version = factory()
+            # Warm the pool so connection setup is not counted as query time
+            warm = [version.acquire() for _ in range(threads)]
+            for conn in warm:
+                version.release(conn)
+            result = RunPattern(version, sql, make_params, ids, threads, iterations)
+            version.retire()
+            print(f"{name:<16} {mode:<10} {result['qps']:>10.0f} {result['p50_ms']:>9.3f} {result['p95_ms']:>9.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark file-backed vs in-memory catalog serving modes")
+    parser.add_argument("--db", default="Data/Databases/OurLibrary.db", help="Path to the catalog database")
+    parser.add_argument("--threads", type=int, default=4, help="Concurrent worker threads")
+    parser.add_argument("--iterations", type=int, default=200, help="Queries per thread per pattern")
+    parser.add_argument("--mmap-mb", type=int, default=256, help="mmap_size for file-backed connections")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: database '{args.db}' not found.")
+        sys.exit(1)
+
+    BenchmarkModes(args.db, args.threads, args.iterations, args.mmap_mb)
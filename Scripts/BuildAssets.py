@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+# File: BuildAssets.py
+# Path: Scripts/BuildAssets.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  12:10PM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: Builds content-hashed, minified copies of the OurLibrary front-end
+so they can be cached with `Cache-Control: immutable`.
+
+- Scripts (web-shim.js, preload.js) and local files referenced by the pages
+  (images, stylesheets) are minified where applicable and written as
+  <name>.<hash>.<ext>.
+- Pages have their inline <script>/<style> blocks minified, local
+  stylesheet links inlined as critical CSS, and local src/href references
+  rewritten to the fingerprinted names.
+- manifest.json maps every original name to its fingerprinted file.
+
+launch_server.py keeps serving pages at their fixed URLs (they are the
+entry points and are revalidated with an ETag) while everything they pull
+in is immutable, so a repeat visit makes no asset requests.
+
+Minification is deliberately conservative: comments and indentation are
+removed but line breaks are kept, so automatic semicolon insertion and
+template literal contents are never affected.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (reads pages from, and writes output under, the current directory)
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+from BuildStaticCatalog import WriteAtomic, WriteHashed
+
+PAGES = ["index.html", "new-desktop-library.html", "setup-consent.html"]
+SCRIPTS = ["web-shim.js", "preload.js"]
+
+REGEX_PRECEDING_CHARS = set("(,=:[!&|?{};+-*%<>~^")
+REGEX_PRECEDING_WORDS = {"return", "typeof", "case", "do", "else", "in", "of", "void", "yield", "await", "delete"}
+
+BLOCK_PATTERN = re.compile(r"(<script\b[^>]*>.*?</script\s*>|<style\b[^>]*>.*?</style\s*>|<!--.*?-->)",
+                           re.IGNORECASE | re.DOTALL)
+REFERENCE_PATTERN = re.compile(r"""\b(src|href)=(["'])([^"']+)\2""", re.IGNORECASE)
+STYLESHEET_PATTERN = re.compile(r"<link\b[^>]*\brel=[\"']stylesheet[\"'][^>]*>", re.IGNORECASE)
+CSS_STRING_PATTERN = re.compile(r"""("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')""")
+
+
+# -- JavaScript ---------------------------------------------------------
+
+def ScanQuoted(source, i):
+    quote = source[i]
+    j = i + 1
+    while j < len(source):
+        if source[j] == "\\":
+            j += 2
+            continue
+        if source[j] == quote or source[j] == "\n":
+            return j + 1
+        j += 1
+    return j
+
+
+def ScanTemplate(source, i):
+    j = i + 1
+    while j < len(source):
+        c = source[j]
+        if c == "\\":
+            j += 2
+        elif c == "`":
+            return j + 1
+        elif source.startswith("${", j):
+            j = ScanExpression(source, j + 2)
+        else:
+            j += 1
+    return j
+
+
+def ScanExpression(source, i):
+    """Scan a ${...} substitution, honouring nested strings and templates."""
+    depth = 0
+    j = i
+    while j < len(source):
+        c = source[j]
+        if c in "'\"":
+            j = ScanQuoted(source, j)
+            continue
+        if c == "`":
+            j = ScanTemplate(source, j)
+            continue
+        if c == "{":
+            depth += 1
+        elif c == "}":
+            if depth == 0:
+                return j + 1
+            depth -= 1
+        j += 1
+    return j
+
+
+def ScanRegex(source, i):
+    j = i + 1
+    in_class = False
+    while j < len(source):
+        c = source[j]
+        if c == "\\":
+            j += 2
+            continue
+        if c == "\n":
+            return j
+        if c == "[":
+            in_class = True
+        elif c == "]":
+            in_class = False
+        elif c == "/" and not in_class:
+            j += 1
+            while j < len(source) and (source[j].isalnum()):
+                j += 1
+            return j
+        j += 1
+    return j
+
+
+def RegexAllowed(out):
+    tail = "".join(out[-12:]).rstrip()
+    if not tail:
+        return True
+    if tail[-1] in REGEX_PRECEDING_CHARS:
+        return True
+    word = re.search(r"[A-Za-z_$]+$", tail)
+    return bool(word) and word.group(0) in REGEX_PRECEDING_WORDS
+
+
+def MinifyJS(source):
+    out = []
+    protected = 0  # out[:protected] holds literals that must not be trimmed
+    i, n = 0, len(source)
+    at_line_start = True
+
+    def TrimTrailing():
+        while len(out) > protected and out[-1] in (" ", "\t", "\r"):
+            out.pop()
+
+    while i < n:
+        c = source[i]
+        if at_line_start and c in " \t\r":
+            i += 1
+            continue
+        at_line_start = False
+
+        if c == "\n":
+            TrimTrailing()
+            if out and out[-1] != "\n":
+                out.append("\n")
+            at_line_start = True
+            i += 1
+            continue
+        if c in "'\"`":
+            j = ScanTemplate(source, i) if c == "`" else ScanQuoted(source, i)
+            out.append(source[i:j])
+            protected = len(out)
+            i = j
+            continue
+        if c == "/" and source.startswith("//", i):
+            j = source.find("\n", i)
+            i = n if j < 0 else j
+            continue
+        if c == "/" and source.startswith("/*", i):
+            j = source.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+            if out and out[-1] not in (" ", "\n"):
+                out.append(" ")
+            continue
+        if c == "/" and RegexAllowed(out):
+            j = ScanRegex(source, i)
+            out.append(source[i:j])
+            protected = len(out)
+            i = j
+            continue
+        out.append(c)
+        i += 1
+
+    TrimTrailing()
+    return "".join(out).strip() + "\n"
+
+
+# -- CSS ----------------------------------------------------------------
+
+def MinifyCSS(source):
+    source = re.sub(r"/\*.*?\*/", "", source, flags=re.DOTALL)
+    parts = CSS_STRING_PATTERN.split(source)
+    for k in range(0, len(parts), 2):
+        text = re.sub(r"\s+", " ", parts[k])
+        text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+        parts[k] = text.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+# -- HTML ---------------------------------------------------------------
+
+def MinifyMarkup(text):
+    lines = (line.strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def ResolveLocal(reference):
+    if any(token in reference for token in ("://", "${", "data:", "mailto:", "javascript:")):
+        return None
+    path = reference.split("#")[0].split("?")[0].lstrip("/")
+    if not path or path.endswith(".html") or not os.path.isfile(path):
+        return None
+    return path
+
+
+class AssetBuilder:
+    def __init__(self, output_dir, base_url):
+        self.output_dir = output_dir
+        self.base_url = base_url
+        self.assets = {}
+
+    def Asset(self, path):
+        """Fingerprint a local file once and return its public URL."""
+        if path not in self.assets:
+            stem, ext = os.path.splitext(os.path.basename(path))
+            if ext == ".js":
+                with open(path, "r", encoding="utf-8") as f:
+                    data = MinifyJS(f.read()).encode("utf-8")
+            elif ext == ".css":
+                with open(path, "r", encoding="utf-8") as f:
+                    data = MinifyCSS(f.read()).encode("utf-8")
+            else:
+                with open(path, "rb") as f:
+                    data = f.read()
+            self.assets[path] = WriteHashed(self.output_dir, stem, ext.lstrip(".") or "bin", data)
+        return self.base_url + self.assets[path]
+
+    def RewriteReferences(self, text):
+        def Replace(match):
+            local = ResolveLocal(match.group(3))
+            if local is None:
+                return match.group(0)
+            return f"{match.group(1)}={match.group(2)}{self.Asset(local)}{match.group(2)}"
+        return REFERENCE_PATTERN.sub(Replace, text)
+
+    def InlineStylesheets(self, text):
+        def Replace(match):
+            href = re.search(r"""\bhref=["']([^"']+)["']""", match.group(0))
+            local = ResolveLocal(href.group(1)) if href else None
+            if local is None or not local.endswith(".css"):
+                return match.group(0)
+            with open(local, "r", encoding="utf-8") as f:
+                return f"<style>{MinifyCSS(f.read())}</style>"
+        return STYLESHEET_PATTERN.sub(Replace, text)
+
+    def BuildPage(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            source = self.InlineStylesheets(f.read())
+
+        out = []
+        for k, part in enumerate(BLOCK_PATTERN.split(source)):
+            if k % 2 == 0:
+                out.append(MinifyMarkup(self.RewriteReferences(part)))
+            elif part.startswith("<!--"):
+                continue
+            elif part[:6].lower() == "<style":
+                open_tag, body = part.split(">", 1)
+                body = body[:body.lower().rfind("</style")]
+                out.append(f"{open_tag}>{MinifyCSS(body)}</style>")
+            else:
+                open_tag, body = part.split(">", 1)
+                body = body[:body.lower().rfind("</script")]
+                open_tag = self.RewriteReferences(open_tag)
+                if body.strip() and "json" not in open_tag.lower():
+                    body = MinifyJS(body).rstrip("\n")
+                out.append(f"{open_tag}>{body}</script>")
+        html = "\n".join(p for p in out if p) + "\n"
+
+        stem, _ = os.path.splitext(os.path.basename(path))
+        return WriteHashed(self.output_dir, stem, "html", html.encode("utf-8"))
+
+
+def BuildAssets(output_dir, base_url):
+    for name in PAGES + SCRIPTS:
+        if not os.path.isfile(name):
+            print(f"Error: '{name}' not found. Run from the OurLibrary project root.")
+            sys.exit(1)
+
+    os.makedirs(output_dir, exist_ok=True)
+    builder = AssetBuilder(output_dir, base_url)
+
+    for name in SCRIPTS:
+        builder.Asset(name)
+    pages = {name: builder.BuildPage(name) for name in PAGES}
+
+    manifest = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "base_url": base_url,
+        "pages": pages,
+        "assets": builder.assets,
+    }
+    WriteAtomic(os.path.join(output_dir, "manifest.json"), json.dumps(manifest, indent=2).encode("utf-8"))
+
+    for original, hashed in list(pages.items()) + list(builder.assets.items()):
+        before = os.path.getsize(original)
+        after = os.path.getsize(os.path.join(output_dir, hashed))
+        print(f"{original:<28} -> {hashed:<40} {before:>8} -> {after:>8} bytes")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Minify and fingerprint OurLibrary front-end assets")
+    parser.add_argument("--output", default="Static/Assets", help="Output directory")
+    parser.add_argument("--base-url", default="/Static/Assets/", help="URL prefix the fingerprinted assets are served from")
+    args = parser.parse_args()
+
+    BuildAssets(args.output, args.base_url)
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+# File: BuildStaticCatalog.py
+# Path: Scripts/BuildStaticCatalog.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:48AM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: Pre-renders the OurLibrary catalog into content-hashed JSON and
+HTML fragments (one per category page and subject page) plus content-hashed
+thumbnails, so static hosting and launch_server.py can serve them with
+immutable caching instead of every browser rebuilding them from the raw
+database.
+
+Output layout (default Static/Catalog):
+    manifest.json                      entry point, never cached
+    index.<hash>.json                  categories, subjects, counts, page files
+    category-<id>-page-<n>.<hash>.json / .html
+    subject-<id>-page-<n>.<hash>.json / .html
+    thumbs/thumb.<hash>.<ext>
+
+Regeneration is incremental: each category's source rows are digested and
+categories whose digest matches the previous manifest are reused untouched.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (paths are relative to the directory it is run from)
+"""
+
+import argparse
+import hashlib
+import html
+import json
+import os
+import sqlite3
+import sys
+from datetime import datetime
+
+HASH_LENGTH = 12
+MANIFEST_NAME = "manifest.json"
+
+IMAGE_SIGNATURES = [
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"\xff\xd8\xff", "jpg"),
+    (b"GIF8", "gif"),
+    (b"RIFF", "webp"),
+]
+
+
+def ContentHash(data):
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def ImageExtension(data):
+    for signature, ext in IMAGE_SIGNATURES:
+        if data.startswith(signature):
+            return ext
+    return "bin"
+
+
+def WriteAtomic(path, data):
+    staging_path = path + ".tmp"
+    with open(staging_path, "wb") as f:
+        f.write(data)
+    os.replace(staging_path, path)
+
+
+def WriteHashed(output_dir, stem, ext, data):
+    name = f"{stem}.{ContentHash(data)}.{ext}"
+    path = os.path.join(output_dir, name)
+    # Content-addressed: an existing file with this name already holds these bytes
+    if not os.path.exists(path):
+        WriteAtomic(path, data)
+    return name
+
+
+def LoadManifest(output_dir):
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def RenderBookCard(book, base_url):
+    title = html.escape(book["Title"] or "")
+    author = html.escape(book["Author"] or "Unknown Author")
+    if book["Thumbnail"]:
+        thumb = (f'<img src="{base_url}{book["Thumbnail"]}" alt="{title}" loading="lazy" '
+                 f'onerror="this.style.display=\'none\'">')
+    else:
+        thumb = "📚"
+    return (f'<div class="book-card" onclick="previewBook({book["ID"]})" tabindex="0">'
+            f'<div class="book-thumbnail">{thumb}</div>'
+            f'<div class="book-info"><h3 class="book-title">{title}</h3>'
+            f'<p class="book-author">{author}</p></div></div>')
+
+
+def RenderPages(output_dir, stem, books, page_size, base_url, extra):
+    pages = max(1, (len(books) + page_size - 1) // page_size)
+    files = []
+    for page in range(1, pages + 1):
+        chunk = books[(page - 1) * page_size:page * page_size]
+        payload = dict(extra, page=page, pages=pages, total=len(books), books=chunk)
+        json_name = WriteHashed(output_dir, f"{stem}-page-{page}", "json",
+                                json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        html_name = WriteHashed(output_dir, f"{stem}-page-{page}", "html",
+                                "\n".join(RenderBookCard(b, base_url) for b in chunk).encode("utf-8"))
+        files.append({"json": json_name, "html": html_name})
+    return files
+
+
+def PagesExist(output_dir, entry):
+    page_sets = [entry["pages"]] + [s["pages"] for s in entry["subjects"].values()]
+    return all(os.path.exists(os.path.join(output_dir, name))
+               for pages in page_sets for page in pages for name in page.values())
+
+
+def ReadCategoryBooks(conn, category_id, thumbs_dir):
+    """Stream a category's books, writing thumbnails and digesting the rows."""
+    digest = hashlib.sha256()
+    books = []
+    cursor = conn.execute(
+        "SELECT ID, Title, Author, Category_ID, Subject_ID, Filename, Thumbnail "
+        "FROM Books WHERE Category_ID = ? ORDER BY Title, ID", (category_id,))
+    for row in cursor:
+        book = dict(row)
+        blob = book.pop("Thumbnail")
+        if blob:
+            blob = bytes(blob)
+            book["Thumbnail"] = "thumbs/" + WriteHashed(thumbs_dir, "thumb", ImageExtension(blob), blob)
+        else:
+            book["Thumbnail"] = None
+        digest.update(json.dumps(book, sort_keys=True).encode("utf-8"))
+        books.append(book)
+    return books, digest
+
+
+def BuildStaticCatalog(db_path, output_dir, page_size, base_url, force=False, prune=False):
+    if not os.path.exists(db_path):
+        print(f"Error: database '{db_path}' not found.")
+        sys.exit(1)
+
+    thumbs_dir = os.path.join(output_dir, "thumbs")
+    os.makedirs(thumbs_dir, exist_ok=True)
+
+    settings = {"page_size": page_size, "base_url": base_url}
+    previous = None if force else LoadManifest(output_dir)
+    if previous and previous.get("settings") != settings:
+        print("Render settings changed, regenerating every category.")
+        previous = None
+    previous_categories = (previous or {}).get("categories", {})
+
+    conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+
+    categories = [dict(r) for r in conn.execute("SELECT ID, Category FROM Categories ORDER BY Category")]
+    subjects = {}
+    for r in conn.execute("SELECT ID, Category_ID, Subject FROM Subjects ORDER BY Subject"):
+        subjects.setdefault(r["Category_ID"], []).append(dict(r))
+
+    manifest_categories = {}
+    index = []
+    rebuilt = reused = 0
+
+    for category in categories:
+        key = str(category["ID"])
+        category_subjects = subjects.get(category["ID"], [])
+        books, digest = ReadCategoryBooks(conn, category["ID"], thumbs_dir)
+        digest.update(json.dumps([category, category_subjects], sort_keys=True).encode("utf-8"))
+        digest = digest.hexdigest()
+
+        prior = previous_categories.get(key)
+        if prior and prior["digest"] == digest and PagesExist(output_dir, prior):
+            entry = prior
+            reused += 1
+        else:
+            entry = {
+                "digest": digest,
+                "books": len(books),
+                "pages": RenderPages(output_dir, f"category-{key}", books, page_size, base_url,
+                                     {"category_id": category["ID"]}),
+                "subjects": {},
+            }
+            for subject in category_subjects:
+                subject_books = [b for b in books if b["Subject_ID"] == subject["ID"]]
+                entry["subjects"][str(subject["ID"])] = {
+                    "books": len(subject_books),
+                    "pages": RenderPages(output_dir, f"subject-{subject['ID']}", subject_books, page_size,
+                                         base_url, {"category_id": category["ID"], "subject_id": subject["ID"]}),
+                }
+            rebuilt += 1
+            print(f"Rendered category {category['Category']} ({len(books)} books)")
+
+        manifest_categories[key] = entry
+        index.append({
+            "ID": category["ID"],
+            "Category": category["Category"],
+            "books": entry["books"],
+            "pages": entry["pages"],
+            "subjects": [dict(s, **entry["subjects"].get(str(s["ID"]), {"books": 0, "pages": []}))
+                         for s in category_subjects],
+        })
+
+    conn.close()
+
+    index_name = WriteHashed(output_dir, "index", "json",
+                             json.dumps(index, separators=(",", ":")).encode("utf-8"))
+    manifest = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.basename(db_path),
+        "settings": settings,
+        "index": index_name,
+        "categories": manifest_categories,
+    }
+    WriteAtomic(os.path.join(output_dir, MANIFEST_NAME), json.dumps(manifest, indent=2).encode("utf-8"))
+
+    if prune:
+        PruneUnreferenced(output_dir, manifest)
+
+    print(f"Static catalog written to {output_dir}: {rebuilt} categories rendered, {reused} unchanged.")
+    return manifest
+
+
+def PruneUnreferenced(output_dir, manifest):
+    """Delete hashed files the new manifest no longer points at."""
+    keep = {manifest["index"]}
+    thumbs = set()
+    for entry in manifest["categories"].values():
+        page_sets = [entry["pages"]] + [s["pages"] for s in entry["subjects"].values()]
+        for pages in page_sets:
+            for page in pages:
+                keep.update(page.values())
+                with open(os.path.join(output_dir, page["json"]), "r") as f:
+                    thumbs.update(b["Thumbnail"] for b in json.load(f)["books"] if b["Thumbnail"])
+
+    removed = 0
+    for name in os.listdir(output_dir):
+        if name != MANIFEST_NAME and os.path.isfile(os.path.join(output_dir, name)) and name not in keep:
+            os.remove(os.path.join(output_dir, name))
+            removed += 1
+    thumbs_dir = os.path.join(output_dir, "thumbs")
+    for name in os.listdir(thumbs_dir):
+        if "thumbs/" + name not in thumbs:
+            os.remove(os.path.join(thumbs_dir, name))
+            removed += 1
+    print(f"Pruned {removed} unreferenced files.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pre-render the OurLibrary catalog into content-hashed static files")
+    parser.add_argument("--db", default="Data/Databases/OurLibrary.db", help="Path to the catalog database")
+    parser.add_argument("--output", default="Static/Catalog", help="Output directory")
+    parser.add_argument("--page-size", type=int, default=100, help="Books per page (matches the app's LIMIT 100)")
+    parser.add_argument("--base-url", default="/Static/Catalog/", help="URL prefix used for thumbnails in HTML fragments")
+    parser.add_argument("--force", action="store_true", help="Ignore the previous manifest and render everything")
+    parser.add_argument("--prune", action="store_true", help="Remove hashed files no longer referenced")
+    args = parser.parse_args()
+
+    BuildStaticCatalog(args.db, args.output, args.page_size, args.base_url, args.force, args.prune)
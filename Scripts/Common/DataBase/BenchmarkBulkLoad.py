@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# File: BenchmarkBulkLoad.py
+# Path: Scripts/DataBase/BenchmarkBulkLoad.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  03:15PM
+
+"""
+BenchmarkBulkLoad.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Times the two MySQL ingest paths of the Hardened migrator against each other
+on the same source tables: batched executemany INSERTs (MigrationEngine.py)
+and LOAD DATA LOCAL INFILE from temporary TSV chunks (BulkLoad.py). Each
+table is copied once per path and emptied again in between, so point it at
+a scratch database; tables that already hold rows are refused.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import sqlite3
+import sys
+import time
+
+import mysql.connector
+
+from MigrationEngine import SourceTables, TransferTable, DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY, DEFAULT_MAX_BATCH_BYTES
+from BulkLoad import LoadDataTable, LoadDataUnavailable, DEFAULT_LOAD_CHUNK_BYTES
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig, CreateTargetTable
+
+
+def EmptyTable(mysql_conn, table):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"DELETE FROM `{table}`;")
+    mysql_conn.commit()
+    mysql_cur.close()
+
+
+def TargetRows(mysql_conn, table):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SELECT COUNT(*) FROM `{table}`;")
+    rows = mysql_cur.fetchone()[0]
+    mysql_cur.close()
+    return rows
+
+
+def TimePath(name, run):
+    started = time.perf_counter()
+    rows = run()
+    elapsed = time.perf_counter() - started
+    return {"path": name, "rows": rows, "seconds": elapsed, "rate": rows / elapsed if elapsed else 0.0}
+
+
+def BenchmarkTable(sqlite_conn, mysql_conn, table, columns, batch_size, load_chunk_bytes):
+    results = [TimePath("INSERT", lambda: TransferTable(sqlite_conn, mysql_conn, table, columns, batch_size,
+                                                         DEFAULT_COMMIT_EVERY, DEFAULT_MAX_BATCH_BYTES,
+                                                         progress=None))]
+    EmptyTable(mysql_conn, table)
+    try:
+        results.append(TimePath("LOAD DATA", lambda: LoadDataTable(sqlite_conn, mysql_conn, table, columns,
+                                                                   load_chunk_bytes, progress=None)))
+    except LoadDataUnavailable as e:
+        print(f"LOAD DATA LOCAL INFILE unavailable ({e}); only the INSERT path was measured")
+    EmptyTable(mysql_conn, table)
+    return results
+
+
+def RunBenchmark(sqlite_path, config, tables, batch_size, load_chunk_bytes):
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    sqlite_cur = sqlite_conn.cursor()
+    mysql_conn = mysql.connector.connect(**dict(config, allow_local_infile=True))
+
+    if not tables:
+        tables = SourceTables(sqlite_conn)
+
+    print(f"{'table':<24} {'path':<10} {'rows':>10} {'seconds':>9} {'rows/s':>12}")
+    for table in tables:
+        columns = CreateTargetTable(sqlite_cur, mysql_conn, table)
+        if not columns:
+            continue
+        if TargetRows(mysql_conn, table):
+            print(f"Error: target table `{table}` is not empty; use a scratch database.")
+            sys.exit(1)
+        results = BenchmarkTable(sqlite_conn, mysql_conn, table, columns, batch_size, load_chunk_bytes)
+        for r in results:
+            print(f"{table:<24} {r['path']:<10} {r['rows']:>10} {r['seconds']:>9.2f} {r['rate']:>12,.0f}")
+        if len(results) == 2 and results[0]["rate"]:
+            print(f"{'':<24} LOAD DATA is {results[1]['rate'] / results[0]['rate']:.1f}x the INSERT rate")
+
+    sqlite_conn.close()
+    mysql_conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare batched INSERTs with LOAD DATA LOCAL INFILE")
+    parser.add_argument("sqlite_db", help="Path to the SQLite .db file to read")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file (scratch database)")
+    parser.add_argument("--tables", nargs="*", help="Tables to benchmark (default: all)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT batch")
+    parser.add_argument("--load-chunk-mb", type=float, default=DEFAULT_LOAD_CHUNK_BYTES / 1024 / 1024,
+                        help="Size of each temporary TSV file")
+    args = parser.parse_args()
+
+    RunBenchmark(args.sqlite_db, LoadConfig(args.config), args.tables, args.batch_size,
+                 int(args.load_chunk_mb * 1024 * 1024))
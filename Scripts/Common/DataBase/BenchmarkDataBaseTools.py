@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# File: BenchmarkDataBaseTools.py
+# Path: Scripts/DataBase/BenchmarkDataBaseTools.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  09:30PM
+
+"""
+BenchmarkDataBaseTools.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Repeatable benchmark for the DataBase tools. A synthetic OurLibrary-shaped
+catalog is generated at each --scale (see SyntheticCatalog.py), or an
+existing --source is used, and each requested mode is run against it:
+
+- dump:       single-file SQL dump (SQLiteToMySQL_DataDump.py)
+- split-dump: per-table split dump with parallel writers
+- migrate:    direct migration (SQLiteToMySQL_GenericPort_Hardened.py)
+- verify:     chunked checksum verification (SQLiteToMySQL_Verify.py)
+
+Every mode runs in its own process, so the peak RSS reported is that mode's
+alone; worker processes it starts are reported separately as the largest
+child. Throughput is source rows and source MB per second of wall time.
+
+--target mysql migrates into and verifies the database named in --config,
+dropping the catalog tables first, so point it at a scratch database.
+--target sqlite needs no server: migrate copies into a SQLite stand-in
+file through the same transfer code (schema and rows only; no secondary
+indexes or foreign keys) and verify checks that file, with the MySQL
+functions the checksums use registered on the connection.
+
+Results are printed as a table and written to --output as JSON.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import contextlib
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import re
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+import zlib
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Windows: peak RSS is not reported
+
+from MigrationEngine import SourceTables, TransferTable
+from SQLiteToMySQL_DataDump import GenerateSQLDump, GenerateSplitDump
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig, MigrateDatabase, TargetTableStatement
+from SQLiteToMySQL_Verify import VerifyDatabase
+from SyntheticCatalog import GenerateCatalog, BOOKS_PER_SCALE
+
+MODES = ["dump", "split-dump", "migrate", "verify"]
+DEFAULT_SCALES = [1.0]
+DEFAULT_BENCH_WORKERS = 4
+BENCH_DATABASE = "bench_catalog"
+SHOW_COLUMNS = re.compile(r"(?i)^\s*SHOW COLUMNS FROM `([^`]+)`")
+
+
+# -- SQLite stand-in for the MySQL target --------------------------------
+
+def AsBytes(value):
+    return value if isinstance(value, bytes) else str(value).encode("utf-8")
+
+
+def ConcatWs(separator, *values):
+    return separator.join(v.decode("latin-1") if isinstance(v, bytes) else str(v)
+                          for v in values if v is not None)
+
+
+class StandInCursor:
+    """The subset of a mysql.connector cursor the transfer and verify code uses."""
+
+    def __init__(self, conn):
+        self.cursor = conn.cursor()
+
+    def execute(self, sql, params=()):
+        if sql.lstrip().upper().startswith("SET "):
+            return
+        match = SHOW_COLUMNS.match(sql)
+        if match:
+            sql = f"SELECT name, type FROM pragma_table_info('{match.group(1)}');"
+        self.cursor.execute(sql.replace("%s", "?"), params or ())
+
+    def executemany(self, sql, rows):
+        self.cursor.executemany(sql.replace("%s", "?"), rows)
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+    def close(self):
+        self.cursor.close()
+
+
+class StandInConnection:
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path, timeout=60)
+        self.conn.create_function("CRC32", 1, lambda v: None if v is None else zlib.crc32(AsBytes(v)))
+        self.conn.create_function("MD5", 1, lambda v: None if v is None else hashlib.md5(AsBytes(v)).hexdigest())
+        # SQLite's hex(NULL) is '' where MySQL's is NULL
+        self.conn.create_function("HEX", 1, lambda v: None if v is None else AsBytes(v).hex().upper())
+        self.conn.create_function("CONV", 3, lambda v, base, _: None if v is None else int(str(v), int(base)))
+        self.conn.create_function("CONCAT_WS", -1, ConcatWs)
+
+    def cursor(self):
+        return StandInCursor(self.conn)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def ConnectStandIn(path, **_config):
+    return StandInConnection(path)
+
+
+# -- modes ---------------------------------------------------------------
+
+def DropCatalogTables(source, config):
+    sqlite_conn = sqlite3.connect(source)
+    tables = SourceTables(sqlite_conn)
+    sqlite_conn.close()
+    import mysql.connector
+    mysql_conn = mysql.connector.connect(**config)
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute("SET FOREIGN_KEY_CHECKS = 0;")
+    for table in tables:
+        mysql_cur.execute(f"DROP TABLE IF EXISTS `{table}`;")
+    mysql_cur.execute("SET FOREIGN_KEY_CHECKS = 1;")
+    mysql_conn.commit()
+    mysql_cur.close()
+    mysql_conn.close()
+
+
+def MigrateStandIn(source, target_path):
+    if os.path.exists(target_path):
+        os.remove(target_path)
+    sqlite_conn = sqlite3.connect(source)
+    sqlite_cur = sqlite_conn.cursor()
+    target = StandInConnection(target_path)
+    for table in SourceTables(sqlite_conn):
+        create_stmt, columns = TargetTableStatement(sqlite_cur, table)
+        if not create_stmt:
+            continue
+        target_cur = target.cursor()
+        target_cur.execute(create_stmt)
+        target_cur.close()
+        TransferTable(sqlite_conn, target, table, columns, progress=None)
+    target.close()
+    sqlite_conn.close()
+
+
+def WorkFiles(work_dir):
+    """Paths the modes write inside the work directory."""
+    return {"dump": os.path.join(work_dir, f"{BENCH_DATABASE}.sql"),
+            "split-dump": os.path.join(work_dir, "split"),
+            "standin": os.path.join(work_dir, "standin.db")}
+
+
+def RunMode(mode, source, target, config, workers, work_dir):
+    files = WorkFiles(work_dir)
+    if mode == "dump":
+        GenerateSQLDump(source, files["dump"], BENCH_DATABASE)
+    elif mode == "split-dump":
+        GenerateSplitDump(source, files["split-dump"], BENCH_DATABASE, workers=workers)
+    elif mode == "migrate" and target == "mysql":
+        DropCatalogTables(source, config)
+        MigrateDatabase(source, config, workers=workers)
+    elif mode == "migrate":
+        MigrateStandIn(source, files["standin"])
+    elif mode == "verify" and target == "mysql":
+        return VerifyDatabase(source, config, workers)
+    else:
+        return VerifyDatabase(source, {}, workers, connect=functools.partial(ConnectStandIn, files["standin"]))
+    return True
+
+
+def PeakRssMb():
+    """Peak resident set size of this process and of its largest finished child, in MB."""
+    if resource is None:
+        return None, None
+    unit = 1 if sys.platform == "darwin" else 1024  # ru_maxrss is bytes on macOS, KB on Linux
+    own = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * unit
+    children = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * unit
+    return round(own / 1024 / 1024, 1), round(children / 1024 / 1024, 1)
+
+
+def ModeProcess(results, mode, source, target, config, workers, work_dir, verbose):
+    started = time.perf_counter()
+    try:
+        with contextlib.ExitStack() as stack:
+            if not verbose:
+                stack.enter_context(contextlib.redirect_stdout(stack.enter_context(open(os.devnull, "w"))))
+            ok = RunMode(mode, source, target, config, workers, work_dir)
+        error = None if ok else "verification found differences"
+    except BaseException as e:  # sys.exit() from the tools included
+        error = f"{type(e).__name__}: {e}"
+    peak_rss, peak_child_rss = PeakRssMb()
+    results.put({"seconds": time.perf_counter() - started, "peak_rss_mb": peak_rss,
+                 "peak_child_rss_mb": peak_child_rss, "error": error})
+
+
+def TimeMode(mode, source, target, config, workers, work_dir, verbose):
+    results = multiprocessing.Queue()
+    process = multiprocessing.Process(target=ModeProcess,
+                                      args=(results, mode, source, target, config, workers, work_dir, verbose))
+    process.start()
+    result = results.get()
+    process.join()
+    return result
+
+
+def SourceRows(source):
+    sqlite_conn = sqlite3.connect(source)
+    rows = sum(sqlite_conn.execute(f"SELECT COUNT(*) FROM `{table}`;").fetchone()[0]
+               for table in SourceTables(sqlite_conn))
+    sqlite_conn.close()
+    return rows
+
+
+def BenchmarkSource(source, label, modes, target, config, workers, work_dir, verbose):
+    rows = SourceRows(source)
+    source_mb = os.path.getsize(source) / 1024 / 1024
+    results = []
+    for mode in modes:
+        result = TimeMode(mode, source, target, config, workers, work_dir, verbose)
+        seconds = result["seconds"]
+        result.update({"source": label, "mode": mode, "target": target if mode in ("migrate", "verify") else "file",
+                       "rows": rows, "source_mb": round(source_mb, 1), "seconds": round(seconds, 3),
+                       "rows_per_second": round(rows / seconds, 1) if seconds else 0.0,
+                       "mb_per_second": round(source_mb / seconds, 2) if seconds else 0.0})
+        PrintResult(result)
+        results.append(result)
+    return results
+
+
+def PrintResult(r):
+    rss = f"{r['peak_rss_mb']:>9.0f} {r['peak_child_rss_mb']:>9.0f}" if r["peak_rss_mb"] is not None \
+        else f"{'?':>9} {'?':>9}"
+    print(f"{r['source']:<14} {r['mode']:<11} {r['rows']:>10,} {r['seconds']:>9.2f} {r['rows_per_second']:>11,.0f} "
+          f"{r['mb_per_second']:>8.1f} {rss}" + (f"  FAILED: {r['error']}" if r["error"] else ""))
+
+
+def RemoveWorkFiles(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        elif os.path.exists(path):
+            os.remove(path)
+
+
+def RunBenchmarks(scales, source, modes, target, config, workers, work_dir, output, keep, verbose):
+    # Only a directory the runner created is removed whole; in a user's --work-dir only the run's own files go
+    created = work_dir is None
+    if created:
+        work_dir = tempfile.mkdtemp(prefix="benchmark_")
+    os.makedirs(work_dir, exist_ok=True)
+    written = list(WorkFiles(work_dir).values())
+    print(f"{'source':<14} {'mode':<11} {'rows':>10} {'seconds':>9} {'rows/s':>11} {'MB/s':>8} "
+          f"{'RSS MB':>9} {'child MB':>9}")
+    results = []
+    if source:
+        results += BenchmarkSource(source, os.path.basename(source)[:14], modes, target, config, workers,
+                                   work_dir, verbose)
+    else:
+        for scale in scales:
+            catalog = os.path.join(work_dir, f"catalog_x{scale:g}.db")
+            GenerateCatalog(catalog, scale)
+            written.append(catalog)
+            results += BenchmarkSource(catalog, f"scale {scale:g}", modes, target, config, workers,
+                                       work_dir, verbose)
+
+    report = {"generated": datetime.now().isoformat(timespec="seconds"), "target": target, "workers": workers,
+              "books_per_scale": BOOKS_PER_SCALE, "cpu_count": os.cpu_count(), "results": results}
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to: {output}")
+    if keep:
+        print(f"Work files kept in: {work_dir}")
+    elif created:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    else:
+        RemoveWorkFiles(written)
+    return all(r["error"] is None for r in results)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark dump, migration and verification on synthetic catalogs")
+    parser.add_argument("--scale", type=float, nargs="+", default=DEFAULT_SCALES,
+                        help=f"Synthetic catalog scale factors ({BOOKS_PER_SCALE:,} books per 1.0)")
+    parser.add_argument("--source", help="Benchmark this SQLite file instead of generating catalogs")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=MODES, help="Modes to run, in order")
+    parser.add_argument("--target", choices=["mysql", "sqlite"], default="sqlite",
+                        help="Migrate into and verify MySQL (scratch database) or a SQLite stand-in")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file (scratch database)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_BENCH_WORKERS,
+                        help="Worker processes for split-dump, migrate and verify")
+    parser.add_argument("--work-dir", help="Directory for catalogs, dumps and the stand-in "
+                                           "(default: a temporary directory)")
+    parser.add_argument("--output", default=f"benchmark-{datetime.now():%Y%m%d-%H%M%S}.json",
+                        help="JSON results file")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated catalogs, dumps and stand-in")
+    parser.add_argument("--verbose", action="store_true", help="Show the tools' own output")
+    args = parser.parse_args()
+
+    if args.source and not os.path.exists(args.source):
+        print(f"Error: SQLite file '{args.source}' not found.")
+        sys.exit(1)
+    if "verify" in args.modes and "migrate" not in args.modes[:args.modes.index("verify")] and args.target == "sqlite":
+        print("Error: verify against the SQLite stand-in needs migrate to run before it.")
+        sys.exit(1)
+    config = LoadConfig(args.config) if args.target == "mysql" else {}
+    if args.target == "mysql":
+        print(f"Warning: the catalog tables in database `{config.get('database')}` will be dropped and rebuilt.")
+
+    ok = RunBenchmarks(args.scale, args.source, args.modes, args.target, config, args.workers, args.work_dir,
+                       args.output, args.keep, args.verbose)
+    sys.exit(0 if ok else 1)
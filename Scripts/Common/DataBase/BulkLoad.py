@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# File: BulkLoad.py
+# Path: Scripts/DataBase/BulkLoad.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  08:10PM
+
+"""
+BulkLoad.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+LOAD DATA LOCAL INFILE fast path for SQLite to MySQL data transfer. Each
+table is streamed into a temporary tab-separated file in bounded chunks
+using MySQL's default escaping (\\N for NULL, backslash escapes for tab,
+newline, carriage return, NUL and backslash). BLOB columns are written as
+hex and decoded server-side with UNHEX(). Every chunk is loaded, its rowid
+range checkpointed and committed in one transaction, and the temporary file
+is removed afterwards.
+
+LOAD DATA LOCAL turns row errors into warnings, so each chunk's loaded row
+count is checked against what was written. When the client or server does
+not allow LOCAL INFILE, LoadDataUnavailable is raised before anything is
+committed so the caller can fall back to batched INSERTs.
+
+The MySQL connection must be opened with allow_local_infile=True.
+
+Author: Himalaya Project
+"""
+
+import os
+import tempfile
+import time
+
+from MigrationEngine import IterBatches, PrintProgress, SelectRows, RecordCheckpoint, DEFAULT_BATCH_SIZE
+from SchemaMigration import TargetColumnTypes
+
+DEFAULT_LOAD_CHUNK_BYTES = 64 * 1024 * 1024
+
+# ER_NOT_ALLOWED_COMMAND, ER_CLIENT_LOCAL_FILES_DISABLED, CR_LOAD_DATA_LOCAL_INFILE_REJECTED
+LOCAL_INFILE_ERRORS = {1148, 3948, 2068}
+
+TSV_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\0": "\\0"})
+
+
+class LoadDataUnavailable(Exception):
+    pass
+
+
+def BlobColumns(sqlite_conn, mysql_conn, table, columns):
+    """Hex-encode columns that are BLOBs on the target (or declared BLOB in SQLite if unknown)."""
+    declared = {row[1]: (row[2] or "").upper() for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")}
+    target = TargetColumnTypes(mysql_conn, table)
+    return [("BLOB" in target.get(c, declared.get(c, ""))) for c in columns]
+
+
+def FormatField(value, blob):
+    if value is None:
+        return "\\N"
+    if blob:
+        if isinstance(value, str):
+            value = value.encode("utf-8")
+        elif not isinstance(value, (bytes, bytearray, memoryview)):
+            value = str(value).encode("utf-8")
+        return bytes(value).hex()
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        value = bytes(value).decode("utf-8", "replace")
+    elif isinstance(value, float):
+        return repr(value)
+    return str(value).translate(TSV_ESCAPES)
+
+
+def LoadStatement(path, table, columns, blob_flags):
+    targets = []
+    assignments = []
+    for n, (column, blob) in enumerate(zip(columns, blob_flags)):
+        if blob:
+            targets.append(f"@blob{n}")
+            assignments.append(f"`{column}` = UNHEX(@blob{n})")
+        else:
+            targets.append(f"`{column}`")
+    quoted_path = path.replace("\\", "\\\\").replace("'", "\\'")
+    statement = (f"LOAD DATA LOCAL INFILE '{quoted_path}' INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+                 "FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' "
+                 f"({', '.join(targets)})")
+    if assignments:
+        statement += " SET " + ", ".join(assignments)
+    return statement + ";"
+
+
+def WriteChunk(path, sqlite_cur, blob_flags, by_rowid, chunk_bytes):
+    """Write rows to `path` until the chunk budget is reached; returns (rows, first_rowid, last_rowid)."""
+    count = 0
+    size = 0
+    first_rowid = last_rowid = None
+    with open(path, "w", encoding="utf-8", newline="\n") as f:
+        for rows in IterBatches(sqlite_cur, DEFAULT_BATCH_SIZE):
+            for row in rows:
+                if by_rowid:
+                    last_rowid = row[0]
+                    if first_rowid is None:
+                        first_rowid = last_rowid
+                    row = row[1:]
+                line = "\t".join(FormatField(v, b) for v, b in zip(row, blob_flags)) + "\n"
+                f.write(line)
+                size += len(line)
+                count += 1
+            if size >= chunk_bytes:
+                break
+    return count, first_rowid, last_rowid
+
+
+def LoadDataTable(sqlite_conn, mysql_conn, table, columns,
+                  chunk_bytes=DEFAULT_LOAD_CHUNK_BYTES,
+                  rowid_range=None,
+                  progress=PrintProgress,
+                  checkpoint=False,
+                  temp_dir=None,
+                  metrics=None):
+    blob_flags = BlobColumns(sqlite_conn, mysql_conn, table, columns)
+    sqlite_cur = sqlite_conn.cursor()
+    mysql_cur = mysql_conn.cursor()
+    by_rowid = SelectRows(sqlite_cur, table, columns, rowid_range, checkpoint)
+
+    fd, path = tempfile.mkstemp(prefix=f"{table}-", suffix=".tsv", dir=temp_dir)
+    os.close(fd)
+    statement = LoadStatement(path, table, columns, blob_flags)
+
+    total = 0
+    try:
+        while True:
+            read_start = time.perf_counter()
+            count, first_rowid, last_rowid = WriteChunk(path, sqlite_cur, blob_flags, by_rowid, chunk_bytes)
+            if not count:
+                break
+            write_start = time.perf_counter()
+            if metrics:
+                metrics.RecordRead(table, write_start - read_start)
+            try:
+                mysql_cur.execute(statement)
+            except Exception as e:
+                if total == 0 and getattr(e, "errno", None) in LOCAL_INFILE_ERRORS:
+                    mysql_conn.rollback()
+                    raise LoadDataUnavailable(str(e)) from e
+                raise
+            loaded = mysql_cur.rowcount
+            if loaded != count:
+                mysql_cur.execute("SHOW WARNINGS LIMIT 5;")
+                warnings = "; ".join(str(w[2]) for w in mysql_cur.fetchall())
+                mysql_conn.rollback()
+                raise RuntimeError(f"LOAD DATA into `{table}` loaded {loaded} of {count} rows: {warnings}")
+            if by_rowid:
+                RecordCheckpoint(mysql_cur, table, first_rowid, last_rowid, count)
+            mysql_conn.commit()
+            total += count
+            if metrics:
+                metrics.RecordWrite(table, count, os.path.getsize(path), time.perf_counter() - write_start)
+            if progress:
+                progress(table, total)
+        if checkpoint and not by_rowid:
+            RecordCheckpoint(mysql_cur, table, 0, 0, total)
+            mysql_conn.commit()
+    finally:
+        sqlite_cur.close()
+        mysql_cur.close()
+        os.remove(path)
+    return total
@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# File: ChangeCapture.py
+# Path: Scripts/DataBase/ChangeCapture.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  06:50PM
+
+"""
+ChangeCapture.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Incremental SQLite to MySQL sync. `install` adds AFTER INSERT/UPDATE/DELETE
+triggers to every table with a primary key; they append the table name, the
+operation and the row's primary key (as a JSON array) to a `_sync_changelog`
+table in the source database. `sync` replays the changelog in batches:
+
+- entries are coalesced per row, so a row edited many times is sent once;
+- upserts read the row's current values from SQLite and are applied with
+  INSERT ... ON DUPLICATE KEY UPDATE; rows deleted since are deleted;
+- upserts run parent tables first and deletes child tables first, so the
+  target's foreign keys hold throughout a batch;
+- the last replayed changelog sequence number is stored in a
+  `_sync_position` table on MySQL in the same transaction as the changes,
+  so an interrupted sync never skips or double-applies a batch;
+- each target's position is also recorded in a `_sync_targets` table in
+  the source, and entries are pruned only once every target has replayed
+  them. A target whose pending entries are already gone is refused; bring
+  a new target in with `reset` followed by a full migration.
+
+A sync costs only the size of the pending changes. Typical use: install the
+triggers, run the full migration once, then sync whenever the catalog
+changes (changes made during the migration are simply replayed; upserts are
+idempotent). Schema changes still need a full migration.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import mysql.connector
+
+from MigrationEngine import SourceTables, CHANGELOG_TABLE, SYNC_TARGETS_TABLE
+from SchemaMigration import PrimaryKeyColumns
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig
+from SQLiteToMySQL_DataDump import TableDependencies
+
+POSITION_TABLE = "_sync_position"
+TRIGGER_PREFIX = "_sync_"
+DEFAULT_SYNC_BATCH = 5000
+KEY_LOOKUP_CHUNK = 500
+
+
+def CapturedTables(sqlite_conn):
+    """Tables with a primary key, mapped to (key columns, all columns), parents before children."""
+    tables = {}
+    ordered, _, _ = TableDependencies(sqlite_conn, SourceTables(sqlite_conn))
+    for table in ordered:
+        keys = PrimaryKeyColumns(sqlite_conn, table)
+        if not keys:
+            print(f"Warning: `{table}` has no primary key; its changes cannot be captured")
+            continue
+        tables[table] = (keys, [row[1] for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")])
+    return tables
+
+
+def KeyExpression(prefix, keys):
+    return "json_array(" + ", ".join(f'{prefix}."{k}"' for k in keys) + ")"
+
+
+def InstallCapture(sqlite_path):
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    sqlite_conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {CHANGELOG_TABLE} ("
+        "seq INTEGER PRIMARY KEY AUTOINCREMENT, table_name TEXT NOT NULL, op TEXT NOT NULL, "
+        "row_key TEXT NOT NULL, changed_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP);")
+    sqlite_conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {SYNC_TARGETS_TABLE} ("
+        "target TEXT PRIMARY KEY, last_seq INTEGER NOT NULL, synced_at TEXT NOT NULL);")
+    log = f"INSERT INTO {CHANGELOG_TABLE} (table_name, op, row_key)"
+    for table, (keys, _) in CapturedTables(sqlite_conn).items():
+        new_key, old_key = KeyExpression("NEW", keys), KeyExpression("OLD", keys)
+        quoted = table.replace("'", "''")
+        sqlite_conn.executescript(f"""
+            CREATE TRIGGER IF NOT EXISTS "{TRIGGER_PREFIX}{table}_ins" AFTER INSERT ON "{table}" BEGIN
+                {log} VALUES ('{quoted}', 'U', {new_key});
+            END;
+            CREATE TRIGGER IF NOT EXISTS "{TRIGGER_PREFIX}{table}_upd" AFTER UPDATE ON "{table}" BEGIN
+                {log} SELECT '{quoted}', 'D', {old_key} WHERE {old_key} IS NOT {new_key};
+                {log} VALUES ('{quoted}', 'U', {new_key});
+            END;
+            CREATE TRIGGER IF NOT EXISTS "{TRIGGER_PREFIX}{table}_del" AFTER DELETE ON "{table}" BEGIN
+                {log} VALUES ('{quoted}', 'D', {old_key});
+            END;
+        """)
+        print(f"Capturing changes on `{table}`")
+    sqlite_conn.commit()
+    sqlite_conn.close()
+
+
+def UninstallCapture(sqlite_path):
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    triggers = sqlite_conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='trigger' AND name LIKE '\\_sync\\_%' ESCAPE '\\';").fetchall()
+    for (name,) in triggers:
+        sqlite_conn.execute(f'DROP TRIGGER "{name}";')
+    sqlite_conn.execute(f"DROP TABLE IF EXISTS {CHANGELOG_TABLE};")
+    sqlite_conn.execute(f"DROP TABLE IF EXISTS {SYNC_TARGETS_TABLE};")
+    sqlite_conn.commit()
+    sqlite_conn.close()
+    print(f"Removed {len(triggers)} triggers and the changelog")
+
+
+def EnsurePositionTable(mysql_conn):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(
+        f"CREATE TABLE IF NOT EXISTS `{POSITION_TABLE}` ("
+        "`source` VARCHAR(255) NOT NULL PRIMARY KEY, `last_seq` BIGINT NOT NULL, `synced_at` DATETIME NOT NULL);")
+    mysql_conn.commit()
+    mysql_cur.close()
+
+
+def ReadPosition(mysql_conn, source):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SELECT `last_seq` FROM `{POSITION_TABLE}` WHERE `source` = %s;", (source,))
+    row = mysql_cur.fetchone()
+    mysql_cur.close()
+    return row[0] if row else 0
+
+
+def WritePosition(mysql_cur, source, last_seq):
+    # Part of the caller's transaction, alongside the changes it covers
+    mysql_cur.execute(
+        f"INSERT INTO `{POSITION_TABLE}` (`source`, `last_seq`, `synced_at`) VALUES (%s, %s, NOW()) "
+        "ON DUPLICATE KEY UPDATE `last_seq` = VALUES(`last_seq`), `synced_at` = VALUES(`synced_at`);",
+        (source, last_seq))
+
+
+def TargetName(config):
+    return f"{config.get('host', 'localhost')}:{config.get('port', 3306)}/{config.get('database', '')}"
+
+
+def RecordTarget(sqlite_conn, target, last_seq):
+    """Mirror a target's position in the source, so pruning waits for the slowest target."""
+    sqlite_conn.execute(
+        f"INSERT OR REPLACE INTO {SYNC_TARGETS_TABLE} (target, last_seq, synced_at) "
+        "VALUES (?, ?, CURRENT_TIMESTAMP);", (target, last_seq))
+
+
+def PruneChangelog(sqlite_conn):
+    sqlite_conn.execute(f"DELETE FROM {CHANGELOG_TABLE} WHERE seq <= "
+                        f"(SELECT MIN(last_seq) FROM {SYNC_TARGETS_TABLE});")
+    sqlite_conn.commit()
+
+
+def HasChangelog(sqlite_conn):
+    return sqlite_conn.execute("SELECT 1 FROM sqlite_master WHERE name = ?;", (CHANGELOG_TABLE,)).fetchone()
+
+
+def CoalesceChanges(entries):
+    """Last operation per (table, key), in order of that last change."""
+    latest = {}
+    for seq, table, op, row_key in entries:
+        latest.pop((table, row_key), None)
+        latest[(table, row_key)] = op
+    changes = {}
+    for (table, row_key), op in latest.items():
+        changes.setdefault(table, {"U": [], "D": []})[op].append(tuple(json.loads(row_key)))
+    return changes
+
+
+def FetchRows(sqlite_conn, table, keys, columns, key_values):
+    """Current rows for the given primary keys; keys no longer present are simply absent."""
+    col_list = ", ".join(f"`{c}`" for c in columns)
+    rows = []
+    if len(keys) == 1:
+        for start in range(0, len(key_values), KEY_LOOKUP_CHUNK):
+            chunk = [k[0] for k in key_values[start:start + KEY_LOOKUP_CHUNK]]
+            rows += sqlite_conn.execute(
+                f"SELECT {col_list} FROM `{table}` WHERE `{keys[0]}` IN ({', '.join('?' * len(chunk))});",
+                chunk).fetchall()
+    else:
+        where = " AND ".join(f"`{k}` = ?" for k in keys)
+        for key in key_values:
+            rows += sqlite_conn.execute(f"SELECT {col_list} FROM `{table}` WHERE {where};", key).fetchall()
+    return rows
+
+
+def UpsertStatement(table, keys, columns):
+    col_list = ", ".join(f"`{c}`" for c in columns)
+    placeholders = ", ".join(["%s"] * len(columns))
+    updates = ", ".join(f"`{c}` = VALUES(`{c}`)" for c in columns if c not in keys) or \
+        ", ".join(f"`{k}` = `{k}`" for k in keys)
+    return f"INSERT INTO `{table}` ({col_list}) VALUES ({placeholders}) ON DUPLICATE KEY UPDATE {updates};"
+
+
+def DeleteKeys(mysql_cur, table, keys, key_values):
+    where = " AND ".join(f"`{k}` = %s" for k in keys)
+    if len(keys) == 1:
+        for start in range(0, len(key_values), KEY_LOOKUP_CHUNK):
+            chunk = [k[0] for k in key_values[start:start + KEY_LOOKUP_CHUNK]]
+            mysql_cur.execute(f"DELETE FROM `{table}` WHERE `{keys[0]}` IN ({', '.join(['%s'] * len(chunk))});",
+                              chunk)
+    else:
+        mysql_cur.executemany(f"DELETE FROM `{table}` WHERE {where};", key_values)
+
+
+def ApplyBatch(sqlite_conn, mysql_conn, tables, changes, source, last_seq):
+    """Apply one coalesced batch: upserts parent tables first, deletes child tables first."""
+    mysql_cur = mysql_conn.cursor()
+    upserted = deleted = 0
+    # `tables` is in foreign-key order, so a child row never arrives before its parent
+    # and a parent row is never deleted while a child still references it
+    deletes = []
+    for table, (keys, columns) in tables.items():
+        ops = changes.get(table)
+        if not ops:
+            continue
+        rows = FetchRows(sqlite_conn, table, keys, columns, ops["U"]) if ops["U"] else []
+        key_index = [columns.index(k) for k in keys]
+        present = {tuple(row[i] for i in key_index) for row in rows}
+        # An upserted key that is gone from SQLite was deleted after the last captured change
+        gone = [k for k in ops["U"] if k not in present]
+        if rows:
+            mysql_cur.executemany(UpsertStatement(table, keys, columns), rows)
+        if ops["D"] or gone:
+            deletes.append((table, keys, ops["D"] + gone))
+        upserted += len(rows)
+    for table, keys, key_values in reversed(deletes):
+        DeleteKeys(mysql_cur, table, keys, key_values)
+        deleted += len(key_values)
+    WritePosition(mysql_cur, source, last_seq)
+    mysql_conn.commit()
+    mysql_cur.close()
+    return upserted, deleted
+
+
+def SyncChanges(sqlite_path, config, source=None, batch_size=DEFAULT_SYNC_BATCH, prune=True):
+    if not os.path.exists(sqlite_path):
+        print(f"Error: SQLite file '{sqlite_path}' not found.")
+        sys.exit(1)
+    source = source or os.path.basename(sqlite_path)
+    target = TargetName(config)
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    if not HasChangelog(sqlite_conn):
+        print(f"Error: no changelog in '{sqlite_path}'; run 'install' first.")
+        sys.exit(1)
+    tables = CapturedTables(sqlite_conn)
+
+    mysql_conn = mysql.connector.connect(**config)
+    EnsurePositionTable(mysql_conn)
+    position = ReadPosition(mysql_conn, source)
+    oldest = sqlite_conn.execute(f"SELECT MIN(seq) FROM {CHANGELOG_TABLE};").fetchone()[0]
+    if oldest is not None and oldest > position + 1:
+        print(f"Error: changes #{position + 1}-#{oldest - 1} were pruned before {target} replayed them. "
+              "Run 'reset' and then a full migration into it before syncing again.")
+        sys.exit(1)
+    RecordTarget(sqlite_conn, target, position)
+    sqlite_conn.commit()
+
+    started = time.perf_counter()
+    total_entries = total_upserted = total_deleted = 0
+    while True:
+        # One read transaction per batch: changelog and row values come from the same snapshot
+        sqlite_conn.execute("BEGIN;")
+        entries = sqlite_conn.execute(
+            f"SELECT seq, table_name, op, row_key FROM {CHANGELOG_TABLE} WHERE seq > ? ORDER BY seq LIMIT ?;",
+            (position, batch_size)).fetchall()
+        if not entries:
+            sqlite_conn.execute("COMMIT;")
+            break
+        upserted, deleted = ApplyBatch(sqlite_conn, mysql_conn, tables, CoalesceChanges(entries),
+                                       source, entries[-1][0])
+        # After the MySQL commit: if this is lost the recorded position only lags, which delays pruning
+        RecordTarget(sqlite_conn, target, entries[-1][0])
+        sqlite_conn.execute("COMMIT;")
+        position = entries[-1][0]
+        total_entries += len(entries)
+        total_upserted += upserted
+        total_deleted += deleted
+        print(f"  replayed changes up to #{position}: {upserted} upserts, {deleted} deletes")
+
+    if prune:
+        PruneChangelog(sqlite_conn)
+    sqlite_conn.close()
+    mysql_conn.close()
+    print(f"Sync complete: {total_entries} changelog entries -> {total_upserted} upserts, "
+          f"{total_deleted} deletes in {time.perf_counter() - started:.2f}s (position #{position})")
+
+
+def ResetPosition(sqlite_path, config, source=None):
+    """Start a target at the end of the changelog; run before its full migration so no change is missed."""
+    source = source or os.path.basename(sqlite_path)
+    target = TargetName(config)
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    if not HasChangelog(sqlite_conn):
+        print(f"Error: no changelog in '{sqlite_path}'; run 'install' first.")
+        sys.exit(1)
+    # sqlite_sequence holds the last seq handed out even when the log has been pruned empty
+    row = sqlite_conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?;", (CHANGELOG_TABLE,)).fetchone()
+    position = row[0] if row else 0
+
+    mysql_conn = mysql.connector.connect(**config)
+    EnsurePositionTable(mysql_conn)
+    mysql_cur = mysql_conn.cursor()
+    WritePosition(mysql_cur, source, position)
+    mysql_conn.commit()
+    mysql_cur.close()
+    mysql_conn.close()
+    RecordTarget(sqlite_conn, target, position)
+    sqlite_conn.commit()
+    sqlite_conn.close()
+    print(f"Replay position for '{source}' on {target} set to #{position}; run the full migration now")
+
+
+def ShowStatus(sqlite_path, config, source=None):
+    source = source or os.path.basename(sqlite_path)
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    if not HasChangelog(sqlite_conn):
+        print("Change capture is not installed.")
+        return
+    mysql_conn = mysql.connector.connect(**config)
+    EnsurePositionTable(mysql_conn)
+    position = ReadPosition(mysql_conn, source)
+    mysql_conn.close()
+    pending = sqlite_conn.execute(
+        f"SELECT table_name, COUNT(*) FROM {CHANGELOG_TABLE} WHERE seq > ? GROUP BY table_name;",
+        (position,)).fetchall()
+    targets = sqlite_conn.execute(f"SELECT target, last_seq FROM {SYNC_TARGETS_TABLE} ORDER BY target;").fetchall()
+    sqlite_conn.close()
+    print(f"Replay position for '{source}': #{position}")
+    for target, last_seq in targets:
+        print(f"  {target} has replayed up to #{last_seq}")
+    for table, count in pending:
+        print(f"  `{table}`: {count} pending changes")
+    if not pending:
+        print("  nothing pending")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Trigger-based change capture and incremental SQLite to MySQL sync")
+    parser.add_argument("command", choices=["install", "sync", "status", "reset", "uninstall"])
+    parser.add_argument("sqlite_db", help="Path to the source SQLite .db file")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file")
+    parser.add_argument("--source", help="Name the replay position is stored under (default: database file name)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_SYNC_BATCH,
+                        help="Changelog entries replayed per MySQL transaction")
+    parser.add_argument("--keep-log", action="store_true", help="Do not prune replayed changelog entries")
+    args = parser.parse_args()
+
+    if args.command == "install":
+        InstallCapture(args.sqlite_db)
+    elif args.command == "uninstall":
+        UninstallCapture(args.sqlite_db)
+    elif args.command == "status":
+        ShowStatus(args.sqlite_db, LoadConfig(args.config), args.source)
+    elif args.command == "reset":
+        ResetPosition(args.sqlite_db, LoadConfig(args.config), args.source)
+    else:
+        SyncChanges(args.sqlite_db, LoadConfig(args.config), args.source, args.batch_size, not args.keep_log)
@@ -0,0 +1,545 @@
+#!/usr/bin/env python3
+# File: MigrationEngine.py
+# Path: Scripts/DataBase/MigrationEngine.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  10:45PM
+
+"""
+MigrationEngine.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Shared row-transfer engine for the SQLite to MySQL migrators. Rows are
+streamed out of SQLite with bounded fetchmany() batches, each batch is
+further split so no single INSERT exceeds a byte budget (BLOB-heavy tables
+would otherwise overrun max_allowed_packet), and the target is committed
+every few batches. Peak memory is bounded by the batch settings, not by
+the size of the table.
+
+PipelinedTransferTable overlaps the two sides: the calling thread reads
+batches into a bounded queue while writer threads, each with its own MySQL
+connection, drain it. Per-stage busy and wait times are reported so the
+slower side (SQLite reads or MySQL writes) is visible.
+
+With checkpointing on, rows are read in rowid order and every batch's
+[first, last] rowid range is written to a side table in the same MySQL
+transaction as the batch itself. After an interruption, PendingRanges()
+returns only the rowid gaps that never committed, which is exact even when
+several writers or worker processes commit out of order.
+
+Both transfer functions accept an optional MigrationMetrics.RunMetrics and
+report every batch's read time and write (plus commit) time to it.
+
+TransferTable can also take a BlobStreamer. BLOB values larger than its
+threshold (stored PDFs, say) are then left out of the SELECT. Their rows
+are written one at a time through a prepared statement, with each large
+value read from SQLite by blobopen() and sent in 128 KB long-data packets.
+That way the value is never held whole by the SQLite cursor, a row tuple
+or the driver's packet buffer.
+
+Author: Himalaya Project
+"""
+
+import io
+import queue
+import sqlite3
+import threading
+import time
+
+DEFAULT_BATCH_SIZE = 1000
+DEFAULT_COMMIT_EVERY = 10
+DEFAULT_MAX_BATCH_BYTES = 16 * 1024 * 1024
+DEFAULT_QUEUE_DEPTH = 8
+DEFAULT_BLOB_STREAM_BYTES = 1024 * 1024
+CHECKPOINT_TABLE = "_migration_checkpoint"
+CHANGELOG_TABLE = "_sync_changelog"  # written by ChangeCapture triggers; never migrated
+SYNC_TARGETS_TABLE = "_sync_targets"  # ChangeCapture's replay position per target; never migrated
+
+
+def QuoteColumns(columns):
+    return ", ".join(f"`{c}`" for c in columns)
+
+
+def EstimateRowBytes(row):
+    size = 0
+    for val in row:
+        if isinstance(val, (bytes, bytearray, memoryview, str)):
+            size += len(val)
+        else:
+            size += 8
+    return size
+
+
+def IterBatches(cursor, batch_size):
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows
+
+
+def TimedBatches(cursor, batch_size):
+    """IterBatches, also yielding the seconds each fetch took."""
+    while True:
+        started = time.perf_counter()
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        yield rows, time.perf_counter() - started
+
+
+def BatchBytes(rows):
+    return sum(EstimateRowBytes(row) for row in rows)
+
+
+def SplitByBytes(rows, max_bytes):
+    chunk = []
+    chunk_bytes = 0
+    for row in rows:
+        row_bytes = EstimateRowBytes(row)
+        if chunk and chunk_bytes + row_bytes > max_bytes:
+            yield chunk
+            chunk = []
+            chunk_bytes = 0
+        chunk.append(row)
+        chunk_bytes += row_bytes
+    if chunk:
+        yield chunk
+
+
+def PrintProgress(table, total):
+    print(f"  `{table}`: {total} rows committed")
+
+
+def RowidFilter(rowid_range):
+    """WHERE clause and parameters for a half-open [low, high) rowid range."""
+    if not rowid_range:
+        return "", ()
+    low, high = rowid_range
+    conditions, params = [], []
+    if low is not None:
+        conditions.append("rowid >= ?")
+        params.append(low)
+    if high is not None:
+        conditions.append("rowid < ?")
+        params.append(high)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), tuple(params)
+
+
+def SourceTables(sqlite_conn):
+    return [row[0] for row in sqlite_conn.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%' AND name NOT IN (?, ?);",
+        (CHANGELOG_TABLE, SYNC_TARGETS_TABLE))]
+
+
+def HasRowid(sqlite_conn, table):
+    try:
+        sqlite_conn.execute(f"SELECT rowid FROM `{table}` LIMIT 1;")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def SelectRows(sqlite_cur, table, columns, rowid_range, checkpoint, streamed=(), threshold=0):
+    """Start the source query; returns whether rows carry a leading rowid for checkpointing.
+
+    Values of `streamed` columns longer than `threshold` bytes come back as NULL, and each row ends
+    with its rowid and a bitmask of the columns so withheld (see BlobStreamer).
+    """
+    col_list = QuoteColumns(columns)
+    if streamed:
+        large = {c: f"(typeof(`{c}`) = 'blob' AND length(`{c}`) > {int(threshold)})" for c in streamed}
+        col_list = ", ".join(f"CASE WHEN {large[c]} THEN NULL ELSE `{c}` END" if c in large else f"`{c}`"
+                             for c in columns)
+        mask = " + ".join(f"({large[c]} << {bit})" for bit, c in enumerate(streamed))
+        col_list += f", rowid, {mask}"
+    where, params = RowidFilter(rowid_range)
+    if checkpoint and HasRowid(sqlite_cur.connection, table):
+        sqlite_cur.execute(f"SELECT rowid, {col_list} FROM `{table}`{where} ORDER BY rowid;", params)
+        return True
+    sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`{where};", params)
+    return False
+
+
+# -- BLOB streaming ---------------------------------------------------------
+
+class BlobReader(io.RawIOBase):
+    """Read-only file object over one SQLite BLOB, read incrementally with blobopen()."""
+
+    def __init__(self, sqlite_conn, table, column, rowid):
+        super().__init__()
+        self.blob = sqlite_conn.blobopen(table, column, rowid, readonly=True)
+        self.size = len(self.blob)
+
+    def readable(self):
+        return True
+
+    def read(self, size=-1):
+        return self.blob.read(size)
+
+    def readinto(self, buffer):
+        data = self.blob.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def close(self):
+        if not self.closed:
+            self.blob.close()
+        super().close()
+
+
+class BlobStreamer:
+    """Writes rows whose BLOBs exceed `threshold` bytes, streaming those values from SQLite.
+
+    `stream_conn` must be a pure-Python mysql.connector connection (use_pure=True): only that
+    implementation sends file-like parameters as COM_STMT_SEND_LONG_DATA packets. Streamed rows
+    are written with REPLACE and committed on their own connection right after each batch, so a
+    resumed run that replays them overwrites rather than fails.
+    """
+
+    def __init__(self, stream_conn, threshold=DEFAULT_BLOB_STREAM_BYTES):
+        self.conn = stream_conn
+        self.cursor = stream_conn.cursor(prepared=True)
+        self.threshold = threshold
+
+    def Columns(self, sqlite_conn, table, columns):
+        """Columns that can hold BLOBs (BLOB or no declared type); none for WITHOUT ROWID tables."""
+        if not HasRowid(sqlite_conn, table):
+            return []
+        declared = {row[1]: (row[2] or "").upper() for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")}
+        return [c for c in columns if "BLOB" in declared.get(c, "") or not declared.get(c)]
+
+    def Separate(self, rows):
+        """Split SelectRows output into plain rows and (row, rowid, mask) for rows with withheld BLOBs."""
+        plain, large = [], []
+        for row in rows:
+            if row[-1]:
+                large.append((row[:-2], row[-2], row[-1]))
+            else:
+                plain.append(row[:-2])
+        return plain, large
+
+    def Write(self, sqlite_conn, table, columns, streamed, large):
+        """Insert the rows with their withheld BLOBs streamed; returns the BLOB bytes sent."""
+        statement = "REPLACE" + InsertStatement(table, columns)[len("INSERT"):]
+        sent = 0
+        for row, rowid, mask in large:
+            values = list(row)
+            readers = []
+            for bit, column in enumerate(streamed):
+                if mask & (1 << bit):
+                    reader = BlobReader(sqlite_conn, table, column, rowid)
+                    values[columns.index(column)] = reader
+                    readers.append(reader)
+                    sent += reader.size
+            self.cursor.execute(statement, values)
+            for reader in readers:
+                reader.close()
+        self.conn.commit()
+        return sent
+
+    def Close(self):
+        self.cursor.close()
+        self.conn.close()
+
+
+# -- checkpoints ------------------------------------------------------------
+
+def EnsureCheckpointTable(mysql_conn, reset=False):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(
+        f"CREATE TABLE IF NOT EXISTS `{CHECKPOINT_TABLE}` ("
+        "`table_name` VARCHAR(255) NOT NULL, "
+        "`first_rowid` BIGINT NOT NULL, "
+        "`last_rowid` BIGINT NOT NULL, "
+        "`row_count` BIGINT NOT NULL, "
+        "PRIMARY KEY (`table_name`, `first_rowid`));")
+    if reset:
+        mysql_cur.execute(f"DELETE FROM `{CHECKPOINT_TABLE}`;")
+    mysql_conn.commit()
+    mysql_cur.close()
+
+
+def DropCheckpointTable(mysql_conn):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"DROP TABLE IF EXISTS `{CHECKPOINT_TABLE}`;")
+    mysql_conn.commit()
+    mysql_cur.close()
+
+
+def RecordCheckpoint(mysql_cur, table, first_rowid, last_rowid, row_count):
+    # Runs inside the caller's transaction so the range commits atomically with its rows
+    mysql_cur.execute(
+        f"INSERT INTO `{CHECKPOINT_TABLE}` (`table_name`, `first_rowid`, `last_rowid`, `row_count`) "
+        "VALUES (%s, %s, %s, %s);", (table, first_rowid, last_rowid, row_count))
+
+
+def CommittedRanges(mysql_conn, table):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(
+        f"SELECT `first_rowid`, `last_rowid`, `row_count` FROM `{CHECKPOINT_TABLE}` "
+        "WHERE `table_name` = %s ORDER BY `first_rowid`;", (table,))
+    rows = mysql_cur.fetchall()
+    mysql_cur.close()
+    return rows
+
+
+def PendingRanges(sqlite_conn, mysql_conn, table):
+    """Half-open rowid ranges of `table` not yet committed on the target.
+
+    Returns [None] (the whole table) when nothing was checkpointed, and []
+    when every source row is already covered. WITHOUT ROWID tables only get a
+    completion marker, so a partially copied one is emptied and redone.
+    """
+    committed = CommittedRanges(mysql_conn, table)
+    if not HasRowid(sqlite_conn, table):
+        if committed:
+            return []
+        mysql_cur = mysql_conn.cursor()
+        mysql_cur.execute(f"DELETE FROM `{table}`;")
+        mysql_conn.commit()
+        mysql_cur.close()
+        return [None]
+    if not committed:
+        return [None]
+
+    gaps = []
+    low = None
+    for first, last, _ in committed:
+        if low is None or first > low:
+            gaps.append((low, first))
+        low = last + 1 if low is None else max(low, last + 1)
+    gaps.append((low, None))
+
+    pending = []
+    for gap in gaps:
+        where, params = RowidFilter(gap)
+        if sqlite_conn.execute(f"SELECT 1 FROM `{table}`{where} LIMIT 1;", params).fetchone():
+            pending.append(gap)
+    return pending
+
+
+def CheckpointedRows(mysql_conn, table):
+    return sum(row[2] for row in CommittedRanges(mysql_conn, table))
+
+
+def InsertStatement(table, columns):
+    placeholders = ", ".join(["%s"] * len(columns))
+    return f"INSERT INTO `{table}` ({QuoteColumns(columns)}) VALUES ({placeholders});"
+
+
+def TransferTable(sqlite_conn, mysql_conn, table, columns,
+                  batch_size=DEFAULT_BATCH_SIZE,
+                  commit_every=DEFAULT_COMMIT_EVERY,
+                  max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                  rowid_range=None,
+                  progress=PrintProgress,
+                  checkpoint=False,
+                  metrics=None,
+                  target_table=None,
+                  blob_streamer=None):
+    insert_stmt = InsertStatement(target_table or table, columns)
+
+    sqlite_cur = sqlite_conn.cursor()
+    mysql_cur = mysql_conn.cursor()
+    streamed = blob_streamer.Columns(sqlite_conn, table, columns) if blob_streamer else []
+    by_rowid = SelectRows(sqlite_cur, table, columns, rowid_range, checkpoint, streamed,
+                          blob_streamer.threshold if streamed else 0)
+
+    total = 0
+    batches_since_commit = 0
+    for rows, read_time in TimedBatches(sqlite_cur, batch_size):
+        if metrics:
+            metrics.RecordRead(table, read_time)
+        write_start = time.perf_counter()
+        if by_rowid:
+            RecordCheckpoint(mysql_cur, table, rows[0][0], rows[-1][0], len(rows))
+            rows = [row[1:] for row in rows]
+        streamed_rows = streamed_bytes = 0
+        if streamed:
+            rows, large = blob_streamer.Separate(rows)
+            if large:
+                streamed_rows = len(large)
+                streamed_bytes = (blob_streamer.Write(sqlite_conn, target_table or table, columns, streamed, large)
+                                  + BatchBytes(row for row, _, _ in large))
+        for chunk in SplitByBytes(rows, max_batch_bytes):
+            mysql_cur.executemany(insert_stmt, chunk)
+        total += len(rows) + streamed_rows
+        batches_since_commit += 1
+        commit = batches_since_commit >= commit_every
+        if commit:
+            mysql_conn.commit()
+            batches_since_commit = 0
+        if metrics:
+            metrics.RecordWrite(table, len(rows) + streamed_rows, BatchBytes(rows) + streamed_bytes,
+                                time.perf_counter() - write_start)
+        if commit and progress:
+            progress(table, total)
+
+    final_start = time.perf_counter()
+    if checkpoint and not by_rowid:
+        RecordCheckpoint(mysql_cur, table, 0, 0, total)
+    mysql_conn.commit()
+    if metrics:
+        metrics.RecordWrite(table, 0, 0, time.perf_counter() - final_start)
+    if progress and batches_since_commit:
+        progress(table, total)
+    sqlite_cur.close()
+    mysql_cur.close()
+    return total
+
+
+class StageStats:
+    """Rows moved and time split between useful work and waiting for the other stage."""
+
+    def __init__(self, name):
+        self.name = name
+        self.rows = 0
+        self.busy = 0.0
+        self.waiting = 0.0
+        self.lock = threading.Lock()
+
+    def Add(self, rows, busy, waiting):
+        with self.lock:
+            self.rows += rows
+            self.busy += busy
+            self.waiting += waiting
+
+    def Rate(self):
+        return self.rows / self.busy if self.busy else 0.0
+
+
+def PrintStageReport(table, reader, writer, writers, elapsed):
+    print(f"  `{table}` pipeline ({elapsed:.2f}s wall):")
+    print(f"    read : {reader.rows} rows, {reader.busy:.2f}s busy ({reader.Rate():,.0f} rows/s), "
+          f"{reader.waiting:.2f}s blocked on full queue")
+    print(f"    write: {writer.rows} rows over {writers} writers, {writer.busy:.2f}s busy "
+          f"({writer.Rate():,.0f} rows/s per writer), {writer.waiting:.2f}s starved")
+    # Whichever stage spent the larger share of the wall clock doing work is the one
+    # the other stage was waiting on
+    read_utilization = reader.busy / elapsed if elapsed else 0.0
+    write_utilization = writer.busy / (writers * elapsed) if elapsed else 0.0
+    bottleneck = "MySQL writes" if write_utilization >= read_utilization else "SQLite reads"
+    print(f"    bottleneck: {bottleneck} (read {read_utilization:.0%} busy, "
+          f"writers {write_utilization:.0%} busy)")
+
+
+def PipelinedTransferTable(sqlite_conn, connect_mysql, table, columns,
+                           writers=2,
+                           batch_size=DEFAULT_BATCH_SIZE,
+                           commit_every=DEFAULT_COMMIT_EVERY,
+                           max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                           queue_depth=DEFAULT_QUEUE_DEPTH,
+                           rowid_range=None,
+                           progress=PrintProgress,
+                           checkpoint=False,
+                           metrics=None):
+    insert_stmt = InsertStatement(table, columns)
+
+    batches = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    errors = []
+    reader_stats = StageStats("read")
+    writer_stats = StageStats("write")
+    committed = [0]
+    committed_lock = threading.Lock()
+
+    def Writer():
+        mysql_conn = None
+        try:
+            mysql_conn = connect_mysql()
+            mysql_cur = mysql_conn.cursor()
+            since_commit = 0
+            uncommitted_rows = 0
+            while True:
+                wait_start = time.perf_counter()
+                rows = batches.get()
+                waited = time.perf_counter() - wait_start
+                if rows is None:
+                    break
+                work_start = time.perf_counter()
+                if by_rowid:
+                    RecordCheckpoint(mysql_cur, table, rows[0][0], rows[-1][0], len(rows))
+                    rows = [row[1:] for row in rows]
+                for chunk in SplitByBytes(rows, max_batch_bytes):
+                    mysql_cur.executemany(insert_stmt, chunk)
+                since_commit += 1
+                uncommitted_rows += len(rows)
+                total = None
+                if since_commit >= commit_every:
+                    mysql_conn.commit()
+                    with committed_lock:
+                        committed[0] += uncommitted_rows
+                        total = committed[0]
+                    since_commit = uncommitted_rows = 0
+                work_time = time.perf_counter() - work_start
+                writer_stats.Add(len(rows), work_time, waited)
+                if metrics:
+                    metrics.RecordWrite(table, len(rows), BatchBytes(rows), work_time)
+                if total is not None and progress:
+                    progress(table, total)
+            mysql_conn.commit()
+            with committed_lock:
+                committed[0] += uncommitted_rows
+            mysql_cur.close()
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        finally:
+            if mysql_conn is not None:
+                mysql_conn.close()
+
+    sqlite_cur = sqlite_conn.cursor()
+    by_rowid = SelectRows(sqlite_cur, table, columns, rowid_range, checkpoint)
+    threads = [threading.Thread(target=Writer, name=f"writer-{table}-{n}") for n in range(writers)]
+    for t in threads:
+        t.start()
+
+    started = time.perf_counter()
+    try:
+        while not stop.is_set():
+            read_start = time.perf_counter()
+            rows = sqlite_cur.fetchmany(batch_size)
+            read_time = time.perf_counter() - read_start
+            if not rows:
+                break
+            put_start = time.perf_counter()
+            while not stop.is_set():
+                try:
+                    batches.put(rows, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            reader_stats.Add(len(rows), read_time, time.perf_counter() - put_start)
+            if metrics:
+                metrics.RecordRead(table, read_time)
+    finally:
+        sqlite_cur.close()
+        for _ in threads:
+            while True:
+                try:
+                    batches.put(None, timeout=0.5)
+                    break
+                except queue.Full:
+                    if stop.is_set():
+                        # Writers are gone; drop queued batches so sentinels fit
+                        try:
+                            batches.get_nowait()
+                        except queue.Empty:
+                            pass
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+    if checkpoint and not by_rowid:
+        mysql_conn = connect_mysql()
+        mysql_cur = mysql_conn.cursor()
+        RecordCheckpoint(mysql_cur, table, 0, 0, committed[0])
+        mysql_conn.commit()
+        mysql_conn.close()
+    if progress:
+        progress(table, committed[0])
+    PrintStageReport(table, reader_stats, writer_stats, writers, time.perf_counter() - started)
+    return committed[0]
@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+# File: MigrationMetrics.py
+# Path: Scripts/DataBase/MigrationMetrics.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  08:10PM
+
+"""
+MigrationMetrics.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Throughput instrumentation for the SQLite to MySQL migrators. The transfer
+functions report every SQLite read and every MySQL write (rows, estimated
+bytes, seconds) to a RunMetrics object, which keeps per table:
+
+- rows and bytes moved, and rows/s and bytes/s over the table's wall time;
+- time spent reading from SQLite versus writing (and committing) to MySQL;
+- a histogram of per-batch write latency with p50/p95/p99.
+
+Expected row counts come from sqlite_stat1 when ANALYZE has been run, and
+from COUNT(*) otherwise, so progress lines carry a live per-table and
+whole-run ETA. Worker processes keep their own RunMetrics and send a
+Snapshot() back, which the parent Merge()s. At the end WriteReport() saves
+everything, plus phase timings and the run settings, as JSON so successive
+migrations can be compared.
+
+Author: Himalaya Project
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+# Upper bounds (milliseconds) of the latency buckets; a final bucket holds anything slower
+LATENCY_BOUNDS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]
+LIVE_INTERVAL_SECONDS = 2.0
+
+
+def EstimateRows(sqlite_conn, table):
+    """Row count from sqlite_stat1 if the table has been ANALYZEd, else COUNT(*)."""
+    try:
+        row = sqlite_conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? LIMIT 1;", (table,)).fetchone()
+        if row and row[0]:
+            return int(row[0].split()[0])
+    except Exception:
+        pass  # no sqlite_stat1 table
+    return sqlite_conn.execute(f"SELECT COUNT(*) FROM `{table}`;").fetchone()[0]
+
+
+def FormatDuration(seconds):
+    if seconds is None:
+        return "?"
+    seconds = int(seconds)
+    if seconds < 60:
+        return f"{seconds}s"
+    if seconds < 3600:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+
+
+class LatencyHistogram:
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS_MS) + 1)
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def Add(self, seconds):
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(LATENCY_BOUNDS_MS) and ms > LATENCY_BOUNDS_MS[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def Merge(self, data):
+        self.counts = [a + b for a, b in zip(self.counts, data["counts"])]
+        self.total_ms += data["total_ms"]
+        self.max_ms = max(self.max_ms, data["max_ms"])
+
+    def Percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of samples (max for the last bucket)."""
+        count = sum(self.counts)
+        if not count:
+            return 0.0
+        seen = 0
+        for bucket, n in enumerate(self.counts):
+            seen += n
+            if seen >= fraction * count:
+                return float(LATENCY_BOUNDS_MS[bucket]) if bucket < len(LATENCY_BOUNDS_MS) else self.max_ms
+        return self.max_ms
+
+    def ToDict(self):
+        count = sum(self.counts)
+        return {"bounds_ms": LATENCY_BOUNDS_MS, "counts": self.counts, "count": count,
+                "total_ms": round(self.total_ms, 3), "mean_ms": round(self.total_ms / count, 3) if count else 0.0,
+                "max_ms": round(self.max_ms, 3), "p50_ms": self.Percentile(0.50),
+                "p95_ms": self.Percentile(0.95), "p99_ms": self.Percentile(0.99)}
+
+
+class TableMetrics:
+    def __init__(self, expected_rows=None):
+        self.expected_rows = expected_rows
+        self.rows = 0
+        self.bytes = 0
+        self.batches = 0
+        self.read_seconds = 0.0
+        self.write_seconds = 0.0
+        self.first_at = None
+        self.last_at = None
+        self.latency = LatencyHistogram()
+
+    def Touch(self, seconds=0.0):
+        """Extend the table's wall-clock window to now; `seconds` is how long the work just finished took."""
+        now = time.time()
+        if self.first_at is None:
+            self.first_at = now - seconds
+        self.last_at = now
+
+    def Elapsed(self):
+        return (self.last_at - self.first_at) if self.first_at else 0.0
+
+    def RowRate(self):
+        elapsed = self.Elapsed()
+        return self.rows / elapsed if elapsed else 0.0
+
+    def Merge(self, data):
+        self.rows += data["rows"]
+        self.bytes += data["bytes"]
+        self.batches += data["batches"]
+        self.read_seconds += data["read_seconds"]
+        self.write_seconds += data["write_seconds"]
+        if data["first_at"] is not None:
+            self.first_at = min(self.first_at or data["first_at"], data["first_at"])
+            self.last_at = max(self.last_at or data["last_at"], data["last_at"])
+        self.latency.Merge(data["write_latency"])
+
+    def ToDict(self):
+        elapsed = self.Elapsed()
+        busy = self.read_seconds + self.write_seconds
+        return {"expected_rows": self.expected_rows, "rows": self.rows, "bytes": self.bytes,
+                "batches": self.batches, "first_at": self.first_at, "last_at": self.last_at,
+                "wall_seconds": round(elapsed, 3),
+                "rows_per_second": round(self.rows / elapsed, 1) if elapsed else 0.0,
+                "bytes_per_second": round(self.bytes / elapsed, 1) if elapsed else 0.0,
+                "read_seconds": round(self.read_seconds, 3), "write_seconds": round(self.write_seconds, 3),
+                "read_share": round(self.read_seconds / busy, 3) if busy else 0.0,
+                "write_latency": self.latency.ToDict()}
+
+
+class RunMetrics:
+    """Thread-safe per-table counters for one migration run (or one worker process)."""
+
+    def __init__(self, live=True):
+        self.live = live
+        self.tables = {}
+        self.phases = {}
+        self.started_at = time.time()
+        self.load_started_at = None
+        self.last_live = 0.0
+        self.lock = threading.Lock()
+
+    def Table(self, table):
+        if table not in self.tables:
+            self.tables[table] = TableMetrics()
+        return self.tables[table]
+
+    def Expect(self, table, rows):
+        with self.lock:
+            self.Table(table).expected_rows = rows
+
+    def RecordRead(self, table, seconds):
+        with self.lock:
+            if self.load_started_at is None:
+                self.load_started_at = time.time() - seconds
+            metrics = self.Table(table)
+            metrics.read_seconds += seconds
+            metrics.Touch(seconds)
+
+    def RecordWrite(self, table, rows, nbytes, seconds):
+        with self.lock:
+            if self.load_started_at is None:
+                self.load_started_at = time.time() - seconds
+            metrics = self.Table(table)
+            metrics.rows += rows
+            metrics.bytes += nbytes
+            metrics.write_seconds += seconds
+            if rows:
+                # A final commit with no rows of its own adds to write time, not to batch latency
+                metrics.batches += 1
+                metrics.latency.Add(seconds)
+            metrics.Touch(seconds)
+
+    @contextlib.contextmanager
+    def Phase(self, name):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = round(self.phases.get(name, 0.0) + time.perf_counter() - started, 3)
+
+    def Totals(self):
+        rows = sum(m.rows for m in self.tables.values())
+        expected = sum(max(m.expected_rows or 0, m.rows) for m in self.tables.values())
+        elapsed = time.time() - self.load_started_at if self.load_started_at else 0.0
+        rate = rows / elapsed if elapsed else 0.0
+        return rows, expected, rate
+
+    def TableEta(self, metrics):
+        rate = metrics.RowRate()
+        if metrics.expected_rows is None or not rate:
+            return None
+        return max(metrics.expected_rows - metrics.rows, 0) / rate
+
+    def RunEta(self):
+        rows, expected, rate = self.Totals()
+        return (expected - rows) / rate if rate else None
+
+    def Progress(self, table, total=None):
+        """Progress callback for the transfer functions: a rate-limited line with live ETAs."""
+        if not self.live:
+            return
+        with self.lock:
+            now = time.time()
+            metrics = self.Table(table)
+            done = metrics.expected_rows is not None and metrics.rows >= metrics.expected_rows
+            if now - self.last_live < LIVE_INTERVAL_SECONDS and not done:
+                return
+            self.last_live = now
+            expected = f"/{metrics.expected_rows:,}" if metrics.expected_rows else ""
+            share = f" ({metrics.rows / metrics.expected_rows:.0%})" if metrics.expected_rows else ""
+            elapsed = metrics.Elapsed()
+            mb_rate = metrics.bytes / elapsed / 1024 / 1024 if elapsed else 0.0
+            print(f"  `{table}`: {metrics.rows:,}{expected} rows{share}, {metrics.RowRate():,.0f} rows/s, "
+                  f"{mb_rate:.1f} MB/s, ETA {FormatDuration(self.TableEta(metrics))} "
+                  f"(run ETA {FormatDuration(self.RunEta())})")
+
+    def Snapshot(self):
+        with self.lock:
+            return {table: m.ToDict() for table, m in self.tables.items()}
+
+    def Merge(self, snapshot):
+        with self.lock:
+            for table, data in snapshot.items():
+                if self.load_started_at is None and data["first_at"] is not None:
+                    self.load_started_at = data["first_at"]
+                self.Table(table).Merge(data)
+
+    def PrintSummary(self):
+        print(f"{'table':<24} {'rows':>12} {'rows/s':>10} {'MB/s':>8} {'read s':>8} {'write s':>8} "
+              f"{'p50 ms':>8} {'p99 ms':>8}")
+        for table, m in self.tables.items():
+            data = m.ToDict()
+            latency = data["write_latency"]
+            print(f"{table:<24} {m.rows:>12,} {data['rows_per_second']:>10,.0f} "
+                  f"{data['bytes_per_second'] / 1024 / 1024:>8.1f} {m.read_seconds:>8.2f} {m.write_seconds:>8.2f} "
+                  f"{latency['p50_ms']:>8.0f} {latency['p99_ms']:>8.0f}")
+        for name, seconds in self.phases.items():
+            print(f"  phase {name}: {seconds:.2f}s")
+
+    def WriteReport(self, path, source=None, settings=None):
+        rows = sum(m.rows for m in self.tables.values())
+        nbytes = sum(m.bytes for m in self.tables.values())
+        elapsed = time.time() - self.started_at
+        load_seconds = self.phases.get("load", elapsed)
+        report = {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(timespec="seconds"),
+            "finished_at": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_seconds": round(elapsed, 3),
+            "source": source,
+            "source_bytes": os.path.getsize(source) if source and os.path.exists(source) else None,
+            "settings": settings or {},
+            "phases": self.phases,
+            "totals": {"rows": rows, "bytes": nbytes,
+                       "rows_per_second": round(rows / load_seconds, 1) if load_seconds else 0.0,
+                       "bytes_per_second": round(nbytes / load_seconds, 1) if load_seconds else 0.0,
+                       "read_seconds": round(sum(m.read_seconds for m in self.tables.values()), 3),
+                       "write_seconds": round(sum(m.write_seconds for m in self.tables.values()), 3)},
+            "tables": self.Snapshot(),
+        }
+        with open(path, "w") as f:
+            json.dump(report, f, indent=2)
+        return report
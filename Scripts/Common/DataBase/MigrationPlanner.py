@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# File: MigrationPlanner.py
+# Path: Scripts/DataBase/MigrationPlanner.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  08:50PM
+
+"""
+MigrationPlanner.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Pre-cutover estimate for `SQLiteToMySQL_GenericPort_Hardened.py --plan`:
+how long the migration will take, how much disk MySQL will need, and which
+batch and parallelism settings to use.
+
+The source is profiled without copying anything: page and payload bytes per
+table and index from the dbstat virtual table (a sampled row-size estimate
+when SQLite lacks dbstat), row counts (sqlite_stat1 or COUNT(*)) and, for
+BLOB columns, average and maximum sizes plus how many values InnoDB will
+store off-page.
+
+A short calibration then copies the first --calibration-rows rows of every
+table into scratch `_plan_<table>` tables on the target, timing the load
+(read vs write, via MigrationMetrics) and the secondary index build, and
+drops them again. Rates measured on the sample are projected onto the full
+row counts. Target storage is an InnoDB model of the profile (row overhead,
+page fill, 16 KB off-page BLOB pages, secondary indexes); treat it, like the
+duration, as an estimate to size headroom, not a guarantee.
+
+Author: Himalaya Project
+"""
+
+import json
+import math
+import os
+import sqlite3
+import time
+
+from MigrationEngine import (TransferTable, HasRowid, SourceTables, DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY,
+                             DEFAULT_MAX_BATCH_BYTES)
+from MigrationMetrics import RunMetrics, EstimateRows, FormatDuration
+from ParallelMigration import EstimateTableBytes, DEFAULT_SPLIT_ROWS
+from SchemaMigration import IndexStatements, MAX_IDENTIFIER_LENGTH, DEFAULT_INDEX_WORKERS
+
+DEFAULT_CALIBRATION_ROWS = 2000
+SCRATCH_PREFIX = "_plan_"
+
+# InnoDB storage model (DYNAMIC row format)
+INNODB_PAGE_BYTES = 16384
+INNODB_LOB_PAGE_PAYLOAD = 16300
+INNODB_OFF_PAGE_THRESHOLD = 8000
+INNODB_ROW_OVERHEAD = 20  # record header, transaction id and roll pointer
+INNODB_PAGE_FILL = 15 / 16
+INNODB_INDEX_FACTOR = 1.5
+DISK_HEADROOM = 1.5  # redo/undo logs, binary log and index-build sort files
+
+# Setting recommendations
+TARGET_BATCH_BYTES = 4 * 1024 * 1024
+TARGET_TRANSACTION_BYTES = 64 * 1024 * 1024
+PARALLEL_MIN_ROWS = 200000
+PARALLEL_EFFICIENCY = 0.7
+MAX_RECOMMENDED_WORKERS = 8
+
+
+# -- source profile --------------------------------------------------------
+
+def HasDbstat(sqlite_conn):
+    try:
+        sqlite_conn.execute("SELECT 1 FROM dbstat LIMIT 1;")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+
+def PageUsage(sqlite_conn, name):
+    """(pages, on-disk bytes, payload bytes) of one table or index from dbstat."""
+    row = sqlite_conn.execute("SELECT COUNT(*), SUM(pgsize), SUM(payload) FROM dbstat WHERE name = ?;",
+                              (name,)).fetchone()
+    return row[0], row[1] or 0, row[2] or 0
+
+
+def BlobProfile(sqlite_conn, table, columns):
+    """Sizes of BLOB values per column, and what InnoDB would store off-page."""
+    profile = {}
+    for column in columns:
+        row = sqlite_conn.execute(
+            f"SELECT COUNT(*), AVG(LENGTH(`{column}`)), MAX(LENGTH(`{column}`)), "
+            f"SUM(CASE WHEN LENGTH(`{column}`) > ? THEN LENGTH(`{column}`) ELSE 0 END), "
+            f"SUM(CASE WHEN LENGTH(`{column}`) > ? THEN (LENGTH(`{column}`) + ? - 1) / ? ELSE 0 END) "
+            f"FROM `{table}` WHERE typeof(`{column}`) = 'blob';",
+            (INNODB_OFF_PAGE_THRESHOLD, INNODB_OFF_PAGE_THRESHOLD, INNODB_LOB_PAGE_PAYLOAD,
+             INNODB_LOB_PAGE_PAYLOAD)).fetchone()
+        if row[0]:
+            profile[column] = {"values": row[0], "avg_bytes": round(row[1] or 0, 1), "max_bytes": row[2] or 0,
+                               "off_page_bytes": row[3] or 0, "off_page_pages": row[4] or 0}
+    return profile
+
+
+def ProfileTable(sqlite_conn, table, dbstat):
+    info = sqlite_conn.execute(f"PRAGMA table_info(`{table}`);").fetchall()
+    columns = [row[1] for row in info]
+    rows = EstimateRows(sqlite_conn, table)
+    # A non-integer primary key's autoindex becomes InnoDB's clustered index, not a secondary one
+    indexes = [row[1] for row in sqlite_conn.execute(f"PRAGMA index_list(`{table}`);").fetchall()
+               if row[3] != "pk"]
+    if dbstat:
+        pages, disk_bytes, payload = PageUsage(sqlite_conn, table)
+        index_payload = 0
+        for index in indexes:
+            index_pages, index_disk, index_bytes = PageUsage(sqlite_conn, index)
+            disk_bytes += index_disk
+            index_payload += index_bytes
+    else:
+        payload = EstimateTableBytes(sqlite_conn, table, columns, rows)
+        pages, disk_bytes, index_payload = None, None, None
+    blob_candidates = [row[1] for row in info if "BLOB" in (row[2] or "").upper() or not row[2]]
+    blobs = BlobProfile(sqlite_conn, table, blob_candidates)
+    max_row = sum(b["max_bytes"] for b in blobs.values()) + (payload / rows if rows else 0)
+    return {"rows": rows, "columns": columns, "secondary_indexes": len(indexes),
+            "source_pages": pages, "source_bytes": disk_bytes, "payload_bytes": payload,
+            "index_payload_bytes": index_payload, "avg_row_bytes": round(payload / rows, 1) if rows else 0,
+            "max_row_bytes": int(max_row), "blobs": blobs}
+
+
+def ProjectStorage(profile):
+    """InnoDB data and index bytes for a profiled table."""
+    off_bytes = sum(b["off_page_bytes"] for b in profile["blobs"].values())
+    off_pages = sum(b["off_page_pages"] for b in profile["blobs"].values())
+    inline = max(profile["payload_bytes"] - off_bytes, 0)
+    data_bytes = (inline + profile["rows"] * INNODB_ROW_OVERHEAD) / INNODB_PAGE_FILL
+    data_bytes += off_pages * INNODB_PAGE_BYTES
+    index_bytes = (profile["index_payload_bytes"] or 0) * INNODB_INDEX_FACTOR
+    return int(data_bytes), int(index_bytes)
+
+
+# -- calibration -----------------------------------------------------------
+
+def DropScratch(mysql_conn, scratch):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"DROP TABLE IF EXISTS `{scratch}`;")
+    mysql_conn.commit()
+    mysql_cur.close()
+
+
+def CalibrateTable(sqlite_conn, mysql_conn, table, sample_rows, table_statement, batch_size):
+    """Copy the first `sample_rows` rows into a scratch table and time the load and index build."""
+    if not HasRowid(sqlite_conn, table):
+        return None
+    scratch = f"{SCRATCH_PREFIX}{table}"[:MAX_IDENTIFIER_LENGTH]
+    create_stmt, columns = table_statement(sqlite_conn.cursor(), table, scratch)
+    if not create_stmt:
+        return None
+    boundary = sqlite_conn.execute(f"SELECT rowid FROM `{table}` ORDER BY rowid LIMIT 1 OFFSET ?;",
+                                   (sample_rows,)).fetchone()
+    rowid_range = (None, boundary[0]) if boundary else None
+
+    DropScratch(mysql_conn, scratch)
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(create_stmt)
+    mysql_conn.commit()
+    metrics = RunMetrics(live=False)
+    try:
+        started = time.perf_counter()
+        rows = TransferTable(sqlite_conn, mysql_conn, table, columns, batch_size, DEFAULT_COMMIT_EVERY,
+                             DEFAULT_MAX_BATCH_BYTES, rowid_range=rowid_range, progress=None,
+                             metrics=metrics, target_table=scratch)
+        load_seconds = time.perf_counter() - started
+        index_seconds = 0.0
+        # Checked against the scratch table, so planned TEXT/BLOB columns get their key prefixes
+        statement = IndexStatements(sqlite_conn, mysql_conn, table, scratch)
+        if statement and rows:
+            started = time.perf_counter()
+            try:
+                mysql_cur.execute(statement)
+                mysql_conn.commit()
+                index_seconds = time.perf_counter() - started
+            except Exception as e:
+                print(f"Warning: could not time the index build for `{table}` ({e})")
+                index_seconds = None
+    finally:
+        mysql_cur.close()
+        DropScratch(mysql_conn, scratch)
+    measured = metrics.Snapshot().get(table)
+    if not rows or not measured:
+        return None
+    return {"rows": rows, "load_seconds": round(load_seconds, 3),
+            "index_seconds": None if index_seconds is None else round(index_seconds, 3),
+            "rows_per_second": round(rows / load_seconds, 1) if load_seconds else None,
+            "bytes_per_second": round(measured["bytes"] / load_seconds, 1) if load_seconds else None,
+            "read_share": measured["read_share"]}
+
+
+def MaxAllowedPacket(mysql_conn):
+    try:
+        mysql_cur = mysql_conn.cursor()
+        mysql_cur.execute("SELECT @@max_allowed_packet;")
+        value = mysql_cur.fetchone()[0]
+        mysql_cur.close()
+        return int(value)
+    except Exception:
+        return None
+
+
+# -- projection ------------------------------------------------------------
+
+def ProjectTable(profile, calibration, fallback_bytes_rate):
+    """(load seconds, index seconds) for the full table, or (None, None) without a rate."""
+    rows = profile["rows"]
+    if not rows:
+        return 0.0, 0.0
+    if calibration and calibration["rows_per_second"]:
+        scale = rows / calibration["rows"]
+        index_seconds = calibration["index_seconds"]
+        return rows / calibration["rows_per_second"], None if index_seconds is None else index_seconds * scale
+    if fallback_bytes_rate:
+        return profile["payload_bytes"] / fallback_bytes_rate, 0.0
+    return None, None
+
+
+def Recommend(profiles, calibrations, max_packet):
+    total_rows = sum(p["rows"] for p in profiles.values())
+    total_payload = sum(p["payload_bytes"] for p in profiles.values())
+    avg_row = total_payload / total_rows if total_rows else 1
+    max_row = max((p["max_row_bytes"] for p in profiles.values()), default=0)
+    largest = max((p["rows"] for p in profiles.values()), default=0)
+
+    batch_size = int(min(max(TARGET_BATCH_BYTES / max(avg_row, 1), 50), 10000))
+    commit_every = max(1, int(TARGET_TRANSACTION_BYTES / max(batch_size * avg_row, 1)))
+    max_batch_mb = max(DEFAULT_MAX_BATCH_BYTES / 1024 / 1024, math.ceil(2 * max_row / 1024 / 1024))
+    workers = 1 if total_rows < PARALLEL_MIN_ROWS else min(os.cpu_count() or 1, MAX_RECOMMENDED_WORKERS)
+    split_rows = max(10000, largest // (workers * 4)) if workers > 1 else DEFAULT_SPLIT_ROWS
+
+    notes = []
+    read_shares = [c["read_share"] for c in calibrations.values() if c]
+    if read_shares and sum(read_shares) / len(read_shares) < 0.3:
+        notes.append("MySQL writes dominate the calibration; --load-data and --bulk-load should help most")
+    elif read_shares:
+        notes.append("SQLite reads are a large share of the calibration; more --workers will help more than "
+                     "write-side tuning")
+    if max_packet:
+        if max_batch_mb * 1024 * 1024 > max_packet:
+            max_batch_mb = max(1, max_packet // (1024 * 1024) - 1)
+        if max_row > max_packet:
+            notes.append(f"largest row (~{max_row / 1024 / 1024:.1f} MB) exceeds max_allowed_packet "
+                         f"({max_packet / 1024 / 1024:.0f} MB); raise it on the server before migrating")
+    return {"batch_size": batch_size, "commit_every": commit_every, "max_batch_mb": max_batch_mb,
+            "workers": workers, "split_rows": split_rows, "notes": notes}
+
+
+def PrintPlan(plan):
+    print(f"{'table':<24} {'rows':>12} {'source MB':>10} {'avg row':>9} {'target MB':>10} "
+          f"{'load':>8} {'indexes':>8}")
+    for table, entry in plan["tables"].items():
+        p = entry["profile"]
+        source_mb = (p["source_bytes"] or p["payload_bytes"]) / 1024 / 1024
+        target_mb = (entry["target_data_bytes"] + entry["target_index_bytes"]) / 1024 / 1024
+        print(f"{table:<24} {p['rows']:>12,} {source_mb:>10.1f} {p['avg_row_bytes']:>9,.0f} {target_mb:>10.1f} "
+              f"{FormatDuration(entry['load_seconds']):>8} {FormatDuration(entry['index_seconds']):>8}")
+    totals = plan["totals"]
+    print(f"Projected target storage: {totals['target_bytes'] / 1024 / 1024:,.1f} MB "
+          f"(data {totals['target_data_bytes'] / 1024 / 1024:,.1f} MB, "
+          f"indexes {totals['target_index_bytes'] / 1024 / 1024:,.1f} MB); "
+          f"provision at least {totals['recommended_free_bytes'] / 1024 / 1024:,.0f} MB free")
+    print(f"Projected duration: {FormatDuration(totals['serial_seconds'])} serial, "
+          f"{FormatDuration(totals['parallel_seconds'])} with the recommended settings")
+    r = plan["recommended"]
+    print(f"Recommended: --batch-size {r['batch_size']} --commit-every {r['commit_every']} "
+          f"--max-batch-mb {r['max_batch_mb']:g} --workers {r['workers']}"
+          + (f" --split-rows {r['split_rows']}" if r["workers"] > 1 else ""))
+    for note in r["notes"]:
+        print(f"  note: {note}")
+
+
+def PlanMigration(sqlite_path, mysql_conn, table_statement, calibration_rows=DEFAULT_CALIBRATION_ROWS,
+                  batch_size=DEFAULT_BATCH_SIZE, index_workers=DEFAULT_INDEX_WORKERS, plan_path=None):
+    """`table_statement(sqlite_cur, table, name)` returns the CREATE TABLE for a scratch copy."""
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    dbstat = HasDbstat(sqlite_conn)
+    if not dbstat:
+        print("Warning: SQLite was built without dbstat; sizes are estimated from a row sample")
+    tables = SourceTables(sqlite_conn)
+    profiles = {table: ProfileTable(sqlite_conn, table, dbstat) for table in tables}
+
+    calibrations = {}
+    max_packet = None
+    if mysql_conn is not None and calibration_rows > 0:
+        print(f"Calibrating against the target with up to {calibration_rows} rows per table")
+        for table in tables:
+            if profiles[table]["rows"]:
+                calibrations[table] = CalibrateTable(sqlite_conn, mysql_conn, table, calibration_rows,
+                                                     table_statement, batch_size)
+        max_packet = MaxAllowedPacket(mysql_conn)
+    sqlite_conn.close()
+
+    measured = [c for c in calibrations.values() if c and c["bytes_per_second"]]
+    fallback_rate = (sum(c["bytes_per_second"] for c in measured) / len(measured)) if measured else None
+
+    plan = {"source": sqlite_path, "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "calibration_rows": calibration_rows, "dbstat": dbstat, "tables": {}}
+    load_total = 0.0
+    index_times = []
+    unknown_indexes = []
+    unknown = False
+    for table, profile in profiles.items():
+        data_bytes, index_bytes = ProjectStorage(profile)
+        load_seconds, index_seconds = ProjectTable(profile, calibrations.get(table), fallback_rate)
+        if load_seconds is None:
+            unknown = True
+        else:
+            load_total += load_seconds
+            if index_seconds is None:
+                unknown_indexes.append(table)
+            else:
+                index_times.append(index_seconds)
+        plan["tables"][table] = {"profile": profile, "calibration": calibrations.get(table),
+                                 "target_data_bytes": data_bytes, "target_index_bytes": index_bytes,
+                                 "load_seconds": load_seconds, "index_seconds": index_seconds}
+
+    recommended = Recommend(profiles, calibrations, max_packet)
+    # Index builds run per table across index_workers connections
+    index_wall = max(max(index_times, default=0.0), sum(index_times) / max(index_workers, 1))
+    workers = recommended["workers"]
+    parallel_load = load_total / (workers * PARALLEL_EFFICIENCY) if workers > 1 else load_total
+    target_data = sum(t["target_data_bytes"] for t in plan["tables"].values())
+    target_index = sum(t["target_index_bytes"] for t in plan["tables"].values())
+    plan["totals"] = {
+        "rows": sum(p["rows"] for p in profiles.values()),
+        "source_bytes": os.path.getsize(sqlite_path),
+        "target_data_bytes": target_data, "target_index_bytes": target_index,
+        "target_bytes": target_data + target_index,
+        "recommended_free_bytes": int((target_data + target_index) * DISK_HEADROOM),
+        "serial_seconds": None if unknown else round(load_total + index_wall, 1),
+        "parallel_seconds": None if unknown else round(parallel_load + index_wall, 1),
+    }
+    plan["recommended"] = recommended
+    if unknown_indexes:
+        recommended["notes"].append("index build time not measured for " + ", ".join(unknown_indexes) +
+                                    "; durations leave it out")
+    if unknown:
+        recommended["notes"].append("no calibration rate available; durations need --calibration-rows > 0 "
+                                    "and a reachable target")
+
+    PrintPlan(plan)
+    if plan_path:
+        with open(plan_path, "w") as f:
+            json.dump(plan, f, indent=2)
+        print(f"Plan saved to {plan_path}")
+    return plan
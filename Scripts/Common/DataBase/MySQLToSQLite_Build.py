@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+# File: MySQLToSQLite_Build.py
+# Path: Scripts/DataBase/MySQLToSQLite_Build.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  10:20PM
+
+"""
+MySQLToSQLite_Build.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Builds a fresh SQLite database (e.g. the OurLibrary.db shipped to clients)
+from a MySQL master catalog: the reverse of the migrators.
+
+The schema is read from information_schema. Column types map to SQLite
+affinities (integer types -> INTEGER, DECIMAL -> NUMERIC, FLOAT/DOUBLE ->
+REAL, BLOB/BINARY -> BLOB, everything else -> TEXT), a single integer
+primary key becomes the rowid alias, and foreign keys are declared in the
+CREATE TABLE. Secondary and unique indexes are created after all rows are
+in; the indexes InnoDB adds on its own for foreign keys (named after the
+constraint) are left out. Migration bookkeeping tables (checkpoints,
+change capture, planner scratch tables) are skipped.
+
+Rows are streamed with unbuffered (server-side) cursors in primary-key
+order and bulk-inserted in batches inside one transaction per table, with
+the build tuned for a one-off write: journal_mode=OFF, synchronous=OFF,
+a large page cache (--cache-mb), --page-size set before the first table,
+and an exclusive lock. The file is built as <output>.partial and only
+renamed into place after VACUUM, ANALYZE and a quick_check, so a failed
+build never leaves a half-written database behind.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+
+import mysql.connector
+
+from MigrationEngine import BatchBytes, CHECKPOINT_TABLE, CHANGELOG_TABLE
+from MigrationMetrics import RunMetrics
+from MigrationPlanner import SCRATCH_PREFIX
+from ChangeCapture import POSITION_TABLE
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig
+
+DEFAULT_BUILD_BATCH = 5000
+DEFAULT_CACHE_MB = 256
+DEFAULT_PAGE_SIZE = 4096
+BOOKKEEPING_TABLES = {CHECKPOINT_TABLE, CHANGELOG_TABLE, POSITION_TABLE}
+
+INTEGER_TYPES = {"tinyint", "smallint", "mediumint", "int", "integer", "bigint", "year", "bit"}
+REAL_TYPES = {"float", "double", "real"}
+BLOB_TYPES = {"tinyblob", "blob", "mediumblob", "longblob", "binary", "varbinary"}
+
+
+def SqliteType(data_type):
+    data_type = data_type.lower()
+    if data_type in INTEGER_TYPES:
+        return "INTEGER"
+    if data_type in ("decimal", "numeric"):
+        return "NUMERIC"
+    if data_type in REAL_TYPES:
+        return "REAL"
+    return "BLOB" if data_type in BLOB_TYPES else "TEXT"
+
+
+def SqliteValue(value):
+    """A mysql.connector value in a form sqlite3 can bind, rendered as MySQL would print it."""
+    if isinstance(value, bytearray):
+        return bytes(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, timedelta):
+        seconds = int(value.total_seconds())
+        sign = "-" if seconds < 0 else ""
+        seconds = abs(seconds)
+        return f"{sign}{seconds // 3600:02d}:{seconds % 3600 // 60:02d}:{seconds % 60:02d}"
+    if isinstance(value, set):
+        return ",".join(sorted(value))
+    return value
+
+
+def DefaultClause(default):
+    if default is None:
+        return ""
+    text = str(default)
+    if text.upper() in ("CURRENT_TIMESTAMP", "CURRENT_DATE", "CURRENT_TIME"):
+        return f" DEFAULT {text.upper()}"
+    try:
+        float(text)
+        return f" DEFAULT {text}"
+    except ValueError:
+        return " DEFAULT '" + text.replace("'", "''") + "'"
+
+
+# -- schema --------------------------------------------------------------
+
+def QueryRows(mysql_conn, statement, params=()):
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(statement, params)
+    rows = mysql_cur.fetchall()
+    mysql_cur.close()
+    return rows
+
+
+def MysqlTables(mysql_conn):
+    """(table, estimated rows) for the catalog's base tables, without migration bookkeeping."""
+    rows = QueryRows(mysql_conn, "SELECT TABLE_NAME, TABLE_ROWS FROM information_schema.TABLES "
+                                 "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_TYPE = 'BASE TABLE' "
+                                 "ORDER BY TABLE_NAME;")
+    return [(name, rows_estimate) for name, rows_estimate in rows
+            if name not in BOOKKEEPING_TABLES and not name.startswith(SCRATCH_PREFIX)]
+
+
+def ReadTableSchema(mysql_conn, table):
+    columns = QueryRows(mysql_conn, "SELECT COLUMN_NAME, DATA_TYPE, IS_NULLABLE, COLUMN_DEFAULT "
+                                    "FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+                                    "AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION;", (table,))
+    statistics = QueryRows(mysql_conn, "SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME "
+                                       "FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+                                       "AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX;", (table,))
+    references = QueryRows(mysql_conn, "SELECT k.CONSTRAINT_NAME, k.COLUMN_NAME, k.REFERENCED_TABLE_NAME, "
+                                       "k.REFERENCED_COLUMN_NAME, r.UPDATE_RULE, r.DELETE_RULE "
+                                       "FROM information_schema.KEY_COLUMN_USAGE k "
+                                       "JOIN information_schema.REFERENTIAL_CONSTRAINTS r "
+                                       "ON r.CONSTRAINT_SCHEMA = k.CONSTRAINT_SCHEMA "
+                                       "AND r.CONSTRAINT_NAME = k.CONSTRAINT_NAME "
+                                       "WHERE k.TABLE_SCHEMA = DATABASE() AND k.TABLE_NAME = %s "
+                                       "AND k.REFERENCED_TABLE_NAME IS NOT NULL "
+                                       "ORDER BY k.CONSTRAINT_NAME, k.ORDINAL_POSITION;", (table,))
+
+    indexes = {}
+    for name, non_unique, column in statistics:
+        indexes.setdefault(name, {"unique": not int(non_unique), "columns": []})["columns"].append(column)
+    foreign_keys = {}
+    for name, column, parent, parent_column, on_update, on_delete in references:
+        fk = foreign_keys.setdefault(name, {"columns": [], "parent": parent, "parent_columns": [],
+                                            "on_update": on_update, "on_delete": on_delete})
+        fk["columns"].append(column)
+        fk["parent_columns"].append(parent_column)
+    primary = indexes.pop("PRIMARY", {"columns": []})["columns"]
+    for name in foreign_keys:
+        indexes.pop(name, None)  # InnoDB's implicit index for the constraint
+    return {"columns": columns, "primary": primary, "indexes": indexes, "foreign_keys": foreign_keys}
+
+
+def SqliteTableStatement(table, schema):
+    primary = schema["primary"]
+    rowid_key = None
+    if len(primary) == 1:
+        types = {name: SqliteType(data_type) for name, data_type, _, _ in schema["columns"]}
+        rowid_key = primary[0] if types[primary[0]] == "INTEGER" else None
+
+    column_defs = []
+    for name, data_type, nullable, default in schema["columns"]:
+        definition = f"`{name}` {SqliteType(data_type)}"
+        if name == rowid_key:
+            definition += " PRIMARY KEY"
+        elif nullable == "NO":
+            definition += " NOT NULL"
+        column_defs.append(definition + DefaultClause(default))
+    if primary and not rowid_key:
+        column_defs.append(f"PRIMARY KEY ({', '.join(f'`{c}`' for c in primary)})")
+    for fk in schema["foreign_keys"].values():
+        column_defs.append(f"FOREIGN KEY ({', '.join(f'`{c}`' for c in fk['columns'])}) "
+                           f"REFERENCES `{fk['parent']}` ({', '.join(f'`{c}`' for c in fk['parent_columns'])}) "
+                           f"ON UPDATE {fk['on_update']} ON DELETE {fk['on_delete']}")
+    return f"CREATE TABLE `{table}` (\n    " + ",\n    ".join(column_defs) + "\n);"
+
+
+def SqliteIndexStatements(table, schema, used_names):
+    statements = []
+    for name, index in sorted(schema["indexes"].items()):
+        if name.lower().startswith("sqlite_"):
+            # Reserved in SQLite; use the migrators' name for unique indexes
+            name = f"UQ_{table}_{'_'.join(index['columns'])}"
+        # SQLite index names are database-wide; MySQL's are per table
+        unique_name = name if name not in used_names else f"{table}_{name}"
+        used_names.add(unique_name)
+        statements.append(f"CREATE {'UNIQUE ' if index['unique'] else ''}INDEX `{unique_name}` ON `{table}` "
+                          f"({', '.join(f'`{c}`' for c in index['columns'])});")
+    return statements
+
+
+# -- build ---------------------------------------------------------------
+
+def TuneForBuild(sqlite_conn, page_size, cache_mb):
+    sqlite_conn.execute(f"PRAGMA page_size = {int(page_size)};")
+    sqlite_conn.execute("PRAGMA journal_mode = OFF;")
+    sqlite_conn.execute("PRAGMA synchronous = OFF;")
+    sqlite_conn.execute(f"PRAGMA cache_size = {-int(cache_mb * 1024)};")
+    sqlite_conn.execute("PRAGMA temp_store = MEMORY;")
+    sqlite_conn.execute("PRAGMA locking_mode = EXCLUSIVE;")
+    sqlite_conn.execute("PRAGMA foreign_keys = OFF;")
+
+
+def CopyTable(mysql_conn, sqlite_conn, table, schema, batch_size, metrics):
+    columns = [row[0] for row in schema["columns"]]
+    quoted = ", ".join(f"`{c}`" for c in columns)
+    order = f" ORDER BY {', '.join(f'`{c}`' for c in schema['primary'])}" if schema["primary"] else ""
+    insert_stmt = f"INSERT INTO `{table}` ({quoted}) VALUES ({', '.join(['?'] * len(columns))});"
+
+    mysql_cur = mysql_conn.cursor(buffered=False)
+    mysql_cur.execute(f"SELECT {quoted} FROM `{table}`{order};")
+    total = 0
+    while True:
+        started = time.perf_counter()
+        rows = mysql_cur.fetchmany(batch_size)
+        metrics.RecordRead(table, time.perf_counter() - started)
+        if not rows:
+            break
+        started = time.perf_counter()
+        rows = [tuple(SqliteValue(v) for v in row) for row in rows]
+        sqlite_conn.executemany(insert_stmt, rows)
+        metrics.RecordWrite(table, len(rows), BatchBytes(rows), time.perf_counter() - started)
+        total += len(rows)
+        metrics.Progress(table)
+    mysql_cur.close()
+    sqlite_conn.commit()
+    return total
+
+
+def BuildDatabase(config, output_path, batch_size=DEFAULT_BUILD_BATCH, page_size=DEFAULT_PAGE_SIZE,
+                  cache_mb=DEFAULT_CACHE_MB, force=False):
+    if os.path.exists(output_path) and not force:
+        print(f"Error: '{output_path}' already exists (use --force to replace it).")
+        sys.exit(1)
+    partial_path = output_path + ".partial"
+    if os.path.exists(partial_path):
+        os.remove(partial_path)
+
+    metrics = RunMetrics()
+    mysql_conn = mysql.connector.connect(**config)
+    sqlite_conn = sqlite3.connect(partial_path)
+    TuneForBuild(sqlite_conn, page_size, cache_mb)
+
+    tables = MysqlTables(mysql_conn)
+    schemas = {}
+    with metrics.Phase("schema"):
+        for table, estimated_rows in tables:
+            schemas[table] = ReadTableSchema(mysql_conn, table)
+            sqlite_conn.execute(SqliteTableStatement(table, schemas[table]))
+            metrics.Expect(table, estimated_rows)
+        sqlite_conn.commit()
+
+    with metrics.Phase("load"):
+        for table, _ in tables:
+            rows = CopyTable(mysql_conn, sqlite_conn, table, schemas[table], batch_size, metrics)
+            print(f"Copied {rows} rows into `{table}`")
+    mysql_conn.close()
+
+    with metrics.Phase("indexes"):
+        used_names = set()
+        for table, _ in tables:
+            for statement in SqliteIndexStatements(table, schemas[table], used_names):
+                sqlite_conn.execute(statement)
+        sqlite_conn.commit()
+
+    with metrics.Phase("finish"):
+        sqlite_conn.execute("PRAGMA locking_mode = NORMAL;")
+        sqlite_conn.execute("PRAGMA journal_mode = DELETE;")
+        sqlite_conn.execute("VACUUM;")
+        sqlite_conn.execute("ANALYZE;")
+        check = sqlite_conn.execute("PRAGMA quick_check;").fetchone()[0]
+    sqlite_conn.close()
+    if check != "ok":
+        print(f"Error: quick_check failed on the built database: {check} (left at {partial_path})")
+        sys.exit(1)
+
+    os.replace(partial_path, output_path)
+    metrics.PrintSummary()
+    print(f"Built {output_path} from {len(tables)} tables ({os.path.getsize(output_path) / 1024 / 1024:.1f} MB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a SQLite database from a MySQL catalog")
+    parser.add_argument("output_db", help="Path of the SQLite file to build")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BUILD_BATCH, help="Rows fetched and inserted per batch")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, choices=[1024, 2048, 4096, 8192, 16384, 32768, 65536],
+                        help="SQLite page size of the built file")
+    parser.add_argument("--cache-mb", type=float, default=DEFAULT_CACHE_MB, help="SQLite page cache during the build")
+    parser.add_argument("--force", action="store_true", help="Replace the output file if it exists")
+    args = parser.parse_args()
+
+    BuildDatabase(LoadConfig(args.config), args.output_db, args.batch_size, args.page_size, args.cache_mb, args.force)
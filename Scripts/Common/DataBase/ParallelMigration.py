@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# File: ParallelMigration.py
+# Path: Scripts/DataBase/ParallelMigration.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  10:45PM
+
+"""
+ParallelMigration.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Process-pool scheduler for SQLite to MySQL data transfer. Tables are turned
+into work units (large rowid tables are split into rowid ranges of roughly
+equal row counts), sorted largest-first, and handed to worker processes that
+each hold their own SQLite reader and MySQL connection. The parent process
+aggregates per-commit progress from every worker into one progress view
+with an ETA, and merges each finished unit's metrics (MigrationMetrics.py)
+into the run's metrics when one is passed in.
+
+Tables must already exist on the target; only row data is moved here. When
+resuming, each table's work units are the rowid gaps left uncommitted by the
+interrupted run rather than the whole table.
+
+Author: Himalaya Project
+"""
+
+import multiprocessing
+import queue
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from MigrationEngine import (TransferTable, HasRowid, RowidFilter, BlobStreamer,
+                             DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY, DEFAULT_MAX_BATCH_BYTES)
+from BulkLoad import LoadDataTable, LoadDataUnavailable, DEFAULT_LOAD_CHUNK_BYTES
+from SchemaMigration import ApplyBulkSession
+from MigrationMetrics import RunMetrics, FormatDuration
+
+DEFAULT_SPLIT_ROWS = 250000
+PROGRESS_INTERVAL_SECONDS = 2.0
+
+# Per-process state populated by InitWorker
+WORKER = {}
+
+
+def EstimateTableBytes(sqlite_conn, table, columns, rows):
+    lengths = " + ".join(f"IFNULL(LENGTH(`{c}`), 0)" for c in columns)
+    avg = sqlite_conn.execute(
+        f"SELECT AVG({lengths}) FROM (SELECT * FROM `{table}` LIMIT 1000);").fetchone()[0]
+    return int((avg or 0) * rows)
+
+
+def RowidRanges(sqlite_conn, table, rows, split_rows, rowid_range=None):
+    where, params = RowidFilter(rowid_range)
+    boundaries = []
+    for offset in range(split_rows, rows, split_rows):
+        row = sqlite_conn.execute(
+            f"SELECT rowid FROM `{table}`{where} ORDER BY rowid LIMIT 1 OFFSET ?;", params + (offset,)).fetchone()
+        if row:
+            boundaries.append(row[0])
+    low, high = rowid_range or (None, None)
+    edges = [low] + boundaries + [high]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def PlanWorkUnits(sqlite_conn, table_columns, split_rows=DEFAULT_SPLIT_ROWS, pending=None):
+    """`pending` optionally maps a table to the rowid ranges still to copy (see PendingRanges)."""
+    units = []
+    for table, columns in table_columns.items():
+        splittable = HasRowid(sqlite_conn, table)
+        for pending_range in (pending or {}).get(table, [None]):
+            where, params = RowidFilter(pending_range)
+            rows = sqlite_conn.execute(f"SELECT COUNT(*) FROM `{table}`{where};", params).fetchone()[0]
+            if rows == 0:
+                continue
+            est_bytes = EstimateTableBytes(sqlite_conn, table, columns, rows)
+            if rows > split_rows and splittable:
+                ranges = RowidRanges(sqlite_conn, table, rows, split_rows, pending_range)
+            else:
+                ranges = [pending_range]
+            for rowid_range in ranges:
+                units.append({
+                    "table": table,
+                    "columns": columns,
+                    "rowid_range": rowid_range,
+                    "rows": rows // len(ranges),
+                    "est_bytes": est_bytes // len(ranges),
+                })
+    # Largest first, so the longest units start early and small tables fill the tail
+    units.sort(key=lambda u: u["est_bytes"], reverse=True)
+    for index, unit in enumerate(units):
+        unit["index"] = index
+    return units
+
+
+def InitWorker(sqlite_path, mysql_config, settings, progress_queue):
+    import mysql.connector
+    WORKER["sqlite"] = sqlite3.connect(sqlite_path)
+    WORKER["mysql"] = mysql.connector.connect(**mysql_config)
+    if settings["bulk_load"]:
+        ApplyBulkSession(WORKER["mysql"])
+    WORKER["blobs"] = None
+    if settings["blob_stream_bytes"]:
+        # Only the pure-Python connection streams file-like parameters
+        stream_conn = mysql.connector.connect(**dict(mysql_config, use_pure=True))
+        if settings["bulk_load"]:
+            ApplyBulkSession(stream_conn)
+        WORKER["blobs"] = BlobStreamer(stream_conn, settings["blob_stream_bytes"])
+    WORKER["settings"] = settings
+    WORKER["progress"] = progress_queue
+
+
+def RunWorkUnit(unit):
+    """Returns (unit index, rows copied, metrics snapshot or None)."""
+    settings = WORKER["settings"]
+    metrics = RunMetrics(live=False) if settings["metrics"] else None
+
+    def Report(table, total):
+        WORKER["progress"].put((unit["index"], total))
+
+    if settings["load_data"]:
+        try:
+            rows = LoadDataTable(WORKER["sqlite"], WORKER["mysql"], unit["table"], unit["columns"],
+                                 settings["load_chunk_bytes"], rowid_range=unit["rowid_range"],
+                                 progress=Report, checkpoint=settings["checkpoint"], metrics=metrics)
+            return unit["index"], rows, metrics and metrics.Snapshot()
+        except LoadDataUnavailable as e:
+            print(f"LOAD DATA LOCAL INFILE unavailable ({e}); worker falling back to batched INSERTs")
+            settings["load_data"] = False
+    rows = TransferTable(WORKER["sqlite"], WORKER["mysql"], unit["table"], unit["columns"],
+                         settings["batch_size"], settings["commit_every"], settings["max_batch_bytes"],
+                         rowid_range=unit["rowid_range"], progress=Report,
+                         checkpoint=settings["checkpoint"], metrics=metrics, blob_streamer=WORKER["blobs"])
+    return unit["index"], rows, metrics and metrics.Snapshot()
+
+
+def PrintProgressView(units, committed, finished, started_at):
+    done_rows = sum(committed.values())
+    total_rows = sum(u["rows"] for u in units) or 1
+    elapsed = time.time() - started_at
+    rate = done_rows / elapsed if elapsed else 0
+    eta = (total_rows - done_rows) / rate if rate else None
+    print(f"[progress] units {len(finished)}/{len(units)}, rows {done_rows}/{total_rows} "
+          f"({done_rows / total_rows:.1%}), {rate:,.0f} rows/s, ETA {FormatDuration(eta)}")
+
+
+def MigrateParallel(sqlite_path, mysql_config, table_columns, workers,
+                    split_rows=DEFAULT_SPLIT_ROWS,
+                    batch_size=DEFAULT_BATCH_SIZE,
+                    commit_every=DEFAULT_COMMIT_EVERY,
+                    max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                    checkpoint=False,
+                    pending=None,
+                    load_data=False,
+                    load_chunk_bytes=DEFAULT_LOAD_CHUNK_BYTES,
+                    bulk_load=False,
+                    metrics=None,
+                    blob_stream_bytes=0):
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    units = PlanWorkUnits(sqlite_conn, table_columns, split_rows, pending)
+    sqlite_conn.close()
+
+    print(f"Scheduling {len(units)} work units across {workers} worker processes")
+    settings = {"batch_size": batch_size, "commit_every": commit_every, "max_batch_bytes": max_batch_bytes,
+                "checkpoint": checkpoint, "load_data": load_data, "load_chunk_bytes": load_chunk_bytes,
+                "bulk_load": bulk_load, "metrics": metrics is not None, "blob_stream_bytes": blob_stream_bytes}
+    progress_queue = multiprocessing.Queue()
+    committed = {}
+    finished = set()
+    per_table = {}
+    started_at = time.time()
+    last_report = started_at
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=InitWorker,
+                             initargs=(sqlite_path, mysql_config, settings, progress_queue)) as pool:
+        pending = {pool.submit(RunWorkUnit, unit) for unit in units}
+        while pending:
+            done, pending = wait(pending, timeout=PROGRESS_INTERVAL_SECONDS, return_when=FIRST_COMPLETED)
+            for future in done:
+                try:
+                    index, rows, snapshot = future.result()
+                except Exception as e:
+                    for other in pending:
+                        other.cancel()
+                    print(f"Error: parallel migration failed: {e}")
+                    sys.exit(1)
+                committed[index] = rows
+                finished.add(index)
+                if snapshot:
+                    metrics.Merge(snapshot)
+                table = units[index]["table"]
+                per_table[table] = per_table.get(table, 0) + rows
+            while True:
+                try:
+                    index, total = progress_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if index not in finished:
+                    committed[index] = total
+            if time.time() - last_report >= PROGRESS_INTERVAL_SECONDS or not pending:
+                PrintProgressView(units, committed, finished, started_at)
+                last_report = time.time()
+
+    for table, rows in per_table.items():
+        print(f"Inserted {rows} rows into `{table}`")
+    return per_table
@@ -3,7 +3,7 @@
 # Path: Scripts/DataBase/SQLiteToMySQL_DataDump.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-06-15
-# Last Modified: 2025-07-17  09:59AM
+# Last Modified: 2026-10-19  06:50PM
 
 """
 SQLiteToMySQL_SchemaAndDataDump_AutoDBName.py
@@ -14,12 +14,42 @@ Converts an arbitrary SQLite database to a MySQL-compatible SQL script.
 The database name is automatically derived from the output SQL filename.
 Does not touch MySQL directly.
 
+Rows are streamed in batches and written as multi-row (extended) INSERTs
+capped at --max-statement-kb, one transaction per table. Strings use
+MySQL's backslash escapes and BLOBs are written as X'..' hex literals.
+Output ending in .gz or .zst (or --compress) is compressed as it is written;
+zstd needs the optional 'zstandard' package.
+
+With --split-dir, the dump is written as a directory that several MySQL
+sessions can import at once (see SQLiteToMySQL_DumpLoader.py):
+    schema.sql           CREATE TABLEs (parents first)
+    <table>.<unit>.<part>.sql[.gz|.zst]
+                         self-contained data files, rolled over at --file-mb
+    post.sql             secondary indexes, added after the data, then
+                         foreign keys (which may reference a UNIQUE index)
+    manifest.json        per-table row counts, parent tables and files
+                         (rows, bytes, sha256)
+Tables are split into rowid ranges (--split-rows) and written by a pool of
+--workers processes, largest first.
+
 Author: Himalaya Project
 """
 
 import sqlite3
 import argparse
+import gzip
+import hashlib
+import io
+import json
+import math
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from MigrationEngine import IterBatches, RowidFilter, SourceTables, DEFAULT_BATCH_SIZE
+from ParallelMigration import PlanWorkUnits, DEFAULT_SPLIT_ROWS
+from SchemaMigration import IndexStatements, ForeignKeyStatement
 
 TYPE_MAP = {
     "INTEGER": "INT",
@@ -29,73 +59,321 @@ TYPE_MAP = {
     "NUMERIC": "FLOAT"
 }
 
-def GenerateSQLDump(sqlite_path, output_path, db_name):
+DEFAULT_MAX_STATEMENT_BYTES = 1024 * 1024  # stays well under the default max_allowed_packet
+COMPRESSION_EXTENSIONS = {".gz": "gzip", ".zst": "zstd"}
+DEFAULT_COMPRESSION_LEVELS = {"gzip": 6, "zstd": 3}
+COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+DEFAULT_FILE_BYTES = 256 * 1024 * 1024
+MANIFEST_NAME = "manifest.json"
+DATA_FILE_HEADER = "SET NAMES utf8mb4;\nSET UNIQUE_CHECKS = 0;\nSET AUTOCOMMIT = 0;\n\n"
+
+# Same escapes mysqldump uses inside quoted strings
+SQL_STRING_ESCAPES = str.maketrans({"\\": "\\\\", "'": "\\'", "\"": "\\\"", "\0": "\\0",
+                                    "\n": "\\n", "\r": "\\r", "\x1a": "\\Z"})
+
+def SqlLiteral(val):
+    if val is None:
+        return "NULL"
+    if isinstance(val, int):
+        return str(val)
+    if isinstance(val, float):
+        # MySQL has no literal for inf/nan
+        return repr(val) if math.isfinite(val) else "NULL"
+    if isinstance(val, (bytes, bytearray, memoryview)):
+        return f"X'{bytes(val).hex()}'"
+    return "'" + str(val).translate(SQL_STRING_ESCAPES) + "'"
+
+def Utf8Length(text):
+    return len(text) if text.isascii() else len(text.encode("utf-8"))
+
+def ExtendedInserts(sqlite_cur, table, col_list, max_statement_bytes=DEFAULT_MAX_STATEMENT_BYTES,
+                    batch_size=DEFAULT_BATCH_SIZE):
+    """Yield (statement, rows, bytes) multi-row INSERTs, each at most max_statement_bytes of
+    UTF-8 (a single oversized row still gets a statement of its own)."""
+    prefix = f"INSERT INTO `{table}` ({col_list}) VALUES\n"
+    prefix_bytes = Utf8Length(prefix)
+    tuples = []
+    size = prefix_bytes
+    for rows in IterBatches(sqlite_cur, batch_size):
+        for row in rows:
+            value = "(" + ",".join(SqlLiteral(v) for v in row) + ")"
+            value_bytes = Utf8Length(value)
+            if tuples and size + value_bytes + 2 > max_statement_bytes:
+                yield prefix + ",\n".join(tuples) + ";\n", len(tuples), size
+                tuples = []
+                size = prefix_bytes
+            tuples.append(value)
+            size += value_bytes + 2
+    if tuples:
+        yield prefix + ",\n".join(tuples) + ";\n", len(tuples), size
+
+def DetectCompression(output_path):
+    return COMPRESSION_EXTENSIONS.get(os.path.splitext(output_path)[1].lower(), "none")
+
+def OpenDumpOutput(output_path, compression="none", level=None):
+    """Text stream for the dump, compressed on the fly when asked."""
+    if compression == "gzip":
+        return gzip.open(output_path, "wt", encoding="utf-8",
+                         compresslevel=level or DEFAULT_COMPRESSION_LEVELS["gzip"])
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError:
+            print("Error: zstd output needs the 'zstandard' package (pip install zstandard).")
+            sys.exit(1)
+        compressor = zstandard.ZstdCompressor(level=level or DEFAULT_COMPRESSION_LEVELS["zstd"])
+        return io.TextIOWrapper(compressor.stream_writer(open(output_path, "wb"), closefd=True), encoding="utf-8")
+    return open(output_path, "w", encoding="utf-8")
+
+def DatabaseNameFromPath(output_path):
+    name = os.path.basename(output_path)
+    if os.path.splitext(name)[1].lower() in COMPRESSION_EXTENSIONS:
+        name = os.path.splitext(name)[0]
+    return os.path.splitext(name)[0]
+
+def CreateTableStatement(sqlite_cur, table):
+    sqlite_cur.execute(f"PRAGMA table_info(`{table}`);")
+    columns_info = sqlite_cur.fetchall()
+
+    column_defs = []
+    primary_keys = []
+    for col in columns_info:
+        col_name = col[1]
+        col_type = col[2].upper()
+        col_type_mysql = TYPE_MAP.get(col_type, "VARCHAR(255)")
+        column_defs.append(f"`{col_name}` {col_type_mysql}")
+        if col[5]:
+            primary_keys.append(f"`{col_name}`")
+
+    create_stmt = f"CREATE TABLE `{table}` ({', '.join(column_defs)}"
+    if primary_keys:
+        create_stmt += f", PRIMARY KEY ({', '.join(primary_keys)})"
+    create_stmt += ");\n\n"
+    return create_stmt, [col[1] for col in columns_info]
+
+def WriteTableData(f, sqlite_conn, table, columns, max_statement_bytes=DEFAULT_MAX_STATEMENT_BYTES):
+    """Stream one table's rows as extended INSERTs inside a single transaction; returns the row count."""
+    col_list = ", ".join(f"`{c}`" for c in columns)
+    sqlite_cur = sqlite_conn.cursor()
+    sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`;")
+    total = 0
+    for statement, rows, _ in ExtendedInserts(sqlite_cur, table, col_list, max_statement_bytes):
+        f.write(statement)
+        total += rows
+    sqlite_cur.close()
+    f.write("COMMIT;\n\n")
+    return total
+
+def GenerateSQLDump(sqlite_path, output_path, db_name, compression="none", level=None,
+                    max_statement_bytes=DEFAULT_MAX_STATEMENT_BYTES):
     sqlite_conn = sqlite3.connect(sqlite_path)
     sqlite_cur = sqlite_conn.cursor()
 
-    with open(output_path, "w") as f:
+    with OpenDumpOutput(output_path, compression, level) as f:
         f.write(f"-- SQL Dump Generated by Himalaya SQLite to MySQL Tool\n\n")
         f.write(f"CREATE DATABASE IF NOT EXISTS `{db_name}`;\n")
         f.write(f"USE `{db_name}`;\n\n")
-        f.write("SET FOREIGN_KEY_CHECKS = 0;\n\n")
+        f.write("SET NAMES utf8mb4;\n")
+        f.write("SET FOREIGN_KEY_CHECKS = 0;\n")
+        f.write("SET UNIQUE_CHECKS = 0;\n")
+        f.write("SET AUTOCOMMIT = 0;\n\n")
 
-        sqlite_cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-        tables = [row[0] for row in sqlite_cur.fetchall()]
+        tables = SourceTables(sqlite_conn)
 
         for table in tables:
             f.write(f"-- Table: {table}\n")
-            sqlite_cur.execute(f"PRAGMA table_info({table});")
-            columns_info = sqlite_cur.fetchall()
-
-            column_defs = []
-            primary_keys = []
-            for col in columns_info:
-                col_name = col[1]
-                col_type = col[2].upper()
-                col_type_mysql = TYPE_MAP.get(col_type, "VARCHAR(255)")
-                column_defs.append(f"`{col_name}` {col_type_mysql}")
-                if col[5]:
-                    primary_keys.append(f"`{col_name}`")
-
-            create_stmt = f"CREATE TABLE `{table}` ({', '.join(column_defs)}"
-            if primary_keys:
-                create_stmt += f", PRIMARY KEY ({', '.join(primary_keys)})"
-            create_stmt += ");\n\n"
+            create_stmt, columns = CreateTableStatement(sqlite_cur, table)
             f.write(create_stmt)
+            rows = WriteTableData(f, sqlite_conn, table, columns, max_statement_bytes)
+            print(f"Dumped {rows} rows from `{table}`")
 
-            columns = [col[1] for col in columns_info]
-            col_list = ", ".join(f"`{c}`" for c in columns)
+        f.write("SET AUTOCOMMIT = 1;\n")
+        f.write("SET UNIQUE_CHECKS = 1;\n")
+        f.write("SET FOREIGN_KEY_CHECKS = 1;\n")
+    sqlite_conn.close()
+    print(f"SQL dump written to: {output_path} ({os.path.getsize(output_path)} bytes, compression: {compression})")
+    print(f"Database name used in script: {db_name}")
 
-            sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`;")
-            rows = sqlite_cur.fetchall()
+def FileChecksum(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
 
-            for row in rows:
-                values = []
-                for val in row:
-                    if val is None:
-                        values.append("NULL")
-                    elif isinstance(val, (int, float)):
-                        values.append(str(val))
-                    else:
-                        escaped = str(val).replace("'", "''")
-                        values.append(f"'{escaped}'")
-                insert_stmt = f"INSERT INTO `{table}` ({col_list}) VALUES ({', '.join(values)});\n"
-                f.write(insert_stmt)
+def TableDependencies(sqlite_conn, tables):
+    """Parent tables of each table, plus the tables caught in reference cycles (or self-references)."""
+    parents = {}
+    for table in tables:
+        refs = {row[2] for row in sqlite_conn.execute(f"PRAGMA foreign_key_list(`{table}`);")}
+        parents[table] = refs & set(tables)
+    cyclic = {t for t, refs in parents.items() if t in refs}
 
-            f.write("\n")
+    # Kahn's algorithm; whatever cannot be ordered sits on (or behind) a cycle
+    remaining = {t: refs - {t} for t, refs in parents.items()}
+    ordered = []
+    while True:
+        ready = sorted(t for t, refs in remaining.items() if not refs)
+        if not ready:
+            break
+        for t in ready:
+            ordered.append(t)
+            del remaining[t]
+        for refs in remaining.values():
+            refs.difference_update(ready)
+    cyclic |= set(remaining)
+    ordered += sorted(remaining)
+    depends_on = {t: sorted(parents[t] - cyclic - {t}) for t in tables}
+    return ordered, depends_on, cyclic
 
-        f.write("SET FOREIGN_KEY_CHECKS = 1;\n")
+def DumpWorkUnit(job):
+    """Write one table (or rowid range of one) to size-capped data files; returns their manifest entries."""
+    sqlite_path, unit, output_dir, compression, level, max_statement_bytes, file_bytes = job
+    table = unit["table"]
+    col_list = ", ".join(f"`{c}`" for c in unit["columns"])
+    where, params = RowidFilter(unit["rowid_range"])
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    sqlite_cur = sqlite_conn.cursor()
+    sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`{where};", params)
+
+    files = []
+    f = None
+    written = rows = 0
+
+    def Finish():
+        f.write("COMMIT;\n")
+        f.close()
+        path = os.path.join(output_dir, files[-1]["file"])
+        files[-1].update(rows=rows, bytes=os.path.getsize(path), sha256=FileChecksum(path))
+
+    for statement, count, size in ExtendedInserts(sqlite_cur, table, col_list, max_statement_bytes):
+        if f is None:
+            name = f"{table}.{unit['index']:03d}.{len(files) + 1:03d}.sql{COMPRESSION_SUFFIXES[compression]}"
+            files.append({"file": name})
+            f = OpenDumpOutput(os.path.join(output_dir, name), compression, level)
+            f.write(DATA_FILE_HEADER)
+            written = rows = 0
+        f.write(statement)
+        written += size
+        rows += count
+        if written >= file_bytes:
+            Finish()
+            f = None
+    if f is not None:
+        Finish()
     sqlite_conn.close()
-    print(f"SQL dump written to: {output_path}")
-    print(f"Database name used in script: {db_name}")
+    return unit["index"], files
+
+def RemovePreviousSplitDump(output_dir):
+    """Delete the data files of an earlier dump in the same directory so none are left stale."""
+    manifest_path = os.path.join(output_dir, MANIFEST_NAME)
+    if not os.path.exists(manifest_path):
+        return
+    with open(manifest_path, "r") as f:
+        previous = json.load(f)
+    for entry in previous["tables"].values():
+        for data_file in entry["files"]:
+            path = os.path.join(output_dir, data_file["file"])
+            if os.path.exists(path):
+                os.remove(path)
+    os.remove(manifest_path)
+
+def GenerateSplitDump(sqlite_path, output_dir, db_name, compression="none", level=None,
+                      max_statement_bytes=DEFAULT_MAX_STATEMENT_BYTES, file_bytes=DEFAULT_FILE_BYTES,
+                      workers=4, split_rows=DEFAULT_SPLIT_ROWS):
+    if compression == "zstd":
+        # Fail in the parent rather than in every worker
+        OpenDumpOutput(os.devnull, compression).close()
+    os.makedirs(output_dir, exist_ok=True)
+    RemovePreviousSplitDump(output_dir)
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    sqlite_cur = sqlite_conn.cursor()
+    tables = SourceTables(sqlite_conn)
+    ordered, depends_on, cyclic = TableDependencies(sqlite_conn, tables)
+
+    table_columns = {}
+    with open(os.path.join(output_dir, "schema.sql"), "w", encoding="utf-8") as f:
+        f.write(f"-- Schema for `{db_name}` generated by Himalaya SQLite to MySQL Tool\n\n")
+        for table in ordered:
+            create_stmt, columns = CreateTableStatement(sqlite_cur, table)
+            f.write(create_stmt)
+            table_columns[table] = columns
+    with open(os.path.join(output_dir, "post.sql"), "w", encoding="utf-8") as f:
+        f.write("-- Secondary indexes, added once the data is loaded, then foreign keys\n\n")
+        for table in ordered:
+            statement = IndexStatements(sqlite_conn, None, table)
+            if statement:
+                f.write(statement + "\n")
+        # Foreign keys last, as in the direct migrator: one may reference a UNIQUE index created above
+        for table in ordered:
+            statement = ForeignKeyStatement(sqlite_conn, None, table, tables)
+            if statement:
+                f.write(statement + "\n")
+
+    units = PlanWorkUnits(sqlite_conn, table_columns, split_rows)
+    sqlite_conn.close()
+    print(f"Writing {len(units)} work units across {workers} worker processes")
+
+    unit_files = {}
+    jobs = [(sqlite_path, unit, output_dir, compression, level, max_statement_bytes, file_bytes) for unit in units]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for index, files in pool.map(DumpWorkUnit, jobs):
+            unit_files[index] = files
+
+    manifest_tables = {}
+    for table in ordered:
+        files = [entry for unit in units if unit["table"] == table for entry in unit_files[unit["index"]]]
+        manifest_tables[table] = {
+            "rows": sum(entry["rows"] for entry in files),
+            "depends_on": depends_on[table],
+            "fk_checks": table not in cyclic,
+            "files": sorted(files, key=lambda e: e["file"]),
+        }
+        print(f"Dumped {manifest_tables[table]['rows']} rows from `{table}` into {len(files)} file(s)")
+
+    manifest = {
+        "database": db_name,
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.basename(sqlite_path),
+        "compression": compression,
+        "schema": "schema.sql",
+        "post": "post.sql",
+        "order": ordered,
+        "tables": manifest_tables,
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Split dump written to: {output_dir} (manifest: {MANIFEST_NAME})")
+    return manifest
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Convert SQLite DB to MySQL SQL dump. DB name is derived from output filename.")
     parser.add_argument("sqlite_db", help="Path to the SQLite .db file")
-    parser.add_argument("output_sql", help="Output .sql file path (e.g., 'MyDatabase.sql')")
+    parser.add_argument("output_sql", help="Output .sql file path (e.g., 'MyDatabase.sql', 'MyDatabase.sql.gz', 'MyDatabase.sql.zst'), "
+                                           "or the output directory with --split-dir")
+    parser.add_argument("--compress", choices=["auto", "none", "gzip", "zstd"], default="auto",
+                        help="Compress while writing (auto: from the .gz/.zst extension)")
+    parser.add_argument("--level", type=int, help="Compression level (default: gzip 6, zstd 3)")
+    parser.add_argument("--max-statement-kb", type=int, default=DEFAULT_MAX_STATEMENT_BYTES // 1024,
+                        help="Size cap for each extended INSERT (keep below the server's max_allowed_packet)")
+    parser.add_argument("--split-dir", action="store_true",
+                        help="Write a directory of per-table files plus manifest.json for parallel import")
+    parser.add_argument("--workers", type=int, default=4, help="Processes writing data files in --split-dir mode")
+    parser.add_argument("--file-mb", type=float, default=DEFAULT_FILE_BYTES / 1024 / 1024,
+                        help="Roll over to a new data file after this many (uncompressed) MB")
+    parser.add_argument("--split-rows", type=int, default=DEFAULT_SPLIT_ROWS,
+                        help="Split tables larger than this into rowid ranges written in parallel")
     args = parser.parse_args()
 
     # Derive database name from the output filename
-    db_name = os.path.splitext(os.path.basename(args.output_sql))[0]
+    db_name = DatabaseNameFromPath(args.output_sql)
 
-    GenerateSQLDump(args.sqlite_db, args.output_sql, db_name)
+    if args.split_dir:
+        compression = "none" if args.compress == "auto" else args.compress
+        GenerateSplitDump(args.sqlite_db, args.output_sql, db_name, compression, args.level,
+                          args.max_statement_kb * 1024, int(args.file_mb * 1024 * 1024),
+                          args.workers, args.split_rows)
+    else:
+        compression = DetectCompression(args.output_sql) if args.compress == "auto" else args.compress
+        GenerateSQLDump(args.sqlite_db, args.output_sql, db_name, compression, args.level,
+                        args.max_statement_kb * 1024)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# File: SQLiteToMySQL_DumpLoader.py
+# Path: Scripts/DataBase/SQLiteToMySQL_DumpLoader.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  06:10PM
+
+"""
+SQLiteToMySQL_DumpLoader.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Imports a split dump written by `SQLiteToMySQL_DataDump.py --split-dir`
+using several MySQL sessions at once. Every file's sha256 is checked against
+the manifest first, then schema.sql is applied, the data files are imported
+concurrently, post.sql adds the secondary indexes and then the foreign keys,
+and the row count of each table is compared with the manifest.
+
+Tables load parents first: a table's files only start once all of its
+parent tables have finished. Tables in reference cycles (and everything
+with --no-fk-checks) load with FOREIGN_KEY_CHECKS=0 and do not wait;
+--no-fk-checks lets every file start immediately and adds the foreign keys
+without re-validating the rows.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import mysql.connector
+
+from SQLiteToMySQL_DataDump import FileChecksum, MANIFEST_NAME
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig
+
+DEFAULT_LOADER_WORKERS = 4
+
+
+def LoadManifest(dump_dir):
+    path = os.path.join(dump_dir, MANIFEST_NAME)
+    if not os.path.exists(path):
+        print(f"Error: '{path}' not found; expected a directory written with --split-dir.")
+        sys.exit(1)
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def VerifyChecksums(dump_dir, manifest):
+    bad = []
+    for entry in manifest["tables"].values():
+        for data_file in entry["files"]:
+            path = os.path.join(dump_dir, data_file["file"])
+            if not os.path.exists(path) or FileChecksum(path) != data_file["sha256"]:
+                bad.append(data_file["file"])
+    if bad:
+        print(f"Error: {len(bad)} data file(s) missing or failing their checksum: {', '.join(bad[:10])}")
+        sys.exit(1)
+    print("All data file checksums match the manifest.")
+
+
+def OpenDumpFile(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    if path.endswith(".zst"):
+        try:
+            import zstandard
+        except ImportError:
+            print("Error: .zst files need the 'zstandard' package (pip install zstandard).")
+            sys.exit(1)
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True),
+                                encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def ReadStatements(path):
+    """Yield statements one at a time. The dump writer escapes newlines inside
+    string literals, so a statement ends at the first line ending in ';'."""
+    lines = []
+    with OpenDumpFile(path) as f:
+        for line in f:
+            if not lines and (not line.strip() or line.startswith("--")):
+                continue
+            lines.append(line)
+            if line.rstrip("\n").endswith(";"):
+                yield "".join(lines)
+                lines = []
+
+
+def ExecuteFile(connect_mysql, path, fk_checks=True):
+    started = time.perf_counter()
+    mysql_conn = connect_mysql()
+    try:
+        mysql_cur = mysql_conn.cursor()
+        if not fk_checks:
+            mysql_cur.execute("SET FOREIGN_KEY_CHECKS = 0;")
+        for statement in ReadStatements(path):
+            mysql_cur.execute(statement)
+        mysql_conn.commit()
+        mysql_cur.close()
+    finally:
+        mysql_conn.close()
+    return time.perf_counter() - started
+
+
+def LoadDataFiles(dump_dir, manifest, connect_mysql, workers, fk_checks):
+    tables = manifest["tables"]
+    remaining = {table: len(entry["files"]) for table, entry in tables.items()}
+    started = set()
+    done = set()
+    futures = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def SubmitReady():
+            progressed = True
+            while progressed:
+                progressed = False
+                for table in manifest["order"]:
+                    entry = tables[table]
+                    checks = fk_checks and entry["fk_checks"]
+                    parents = entry["depends_on"] if checks else []
+                    if table in started or not all(p in done for p in parents):
+                        continue
+                    started.add(table)
+                    if not entry["files"]:
+                        done.add(table)
+                        progressed = True
+                    for data_file in entry["files"]:
+                        path = os.path.join(dump_dir, data_file["file"])
+                        futures[pool.submit(ExecuteFile, connect_mysql, path, checks)] = (table, data_file)
+
+        SubmitReady()
+        while futures:
+            finished, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+            for future in finished:
+                table, data_file = futures.pop(future)
+                try:
+                    elapsed = future.result()
+                except Exception as e:
+                    print(f"Error: importing {data_file['file']} failed: {e}")
+                    for other in futures:
+                        other.cancel()
+                    sys.exit(1)
+                print(f"Loaded {data_file['file']} ({data_file['rows']} rows) in {elapsed:.2f}s")
+                remaining[table] -= 1
+                if remaining[table] == 0:
+                    done.add(table)
+                    print(f"Table `{table}` complete")
+            SubmitReady()
+
+
+def VerifyRowCounts(mysql_conn, manifest):
+    mysql_cur = mysql_conn.cursor()
+    mismatched = 0
+    for table, entry in manifest["tables"].items():
+        mysql_cur.execute(f"SELECT COUNT(*) FROM `{table}`;")
+        rows = mysql_cur.fetchone()[0]
+        if rows != entry["rows"]:
+            print(f"Error: `{table}` has {rows} rows, manifest expects {entry['rows']}")
+            mismatched += 1
+    mysql_cur.close()
+    if mismatched:
+        sys.exit(1)
+    print("Row counts match the manifest.")
+
+
+def LoadSplitDump(dump_dir, config, workers=DEFAULT_LOADER_WORKERS, fk_checks=True, verify=True):
+    manifest = LoadManifest(dump_dir)
+    if verify:
+        VerifyChecksums(dump_dir, manifest)
+
+    db_name = manifest["database"]
+    server_config = {k: v for k, v in config.items() if k != "database"}
+    mysql_conn = mysql.connector.connect(**server_config)
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"CREATE DATABASE IF NOT EXISTS `{db_name}`;")
+    mysql_cur.close()
+    mysql_conn.close()
+
+    db_config = dict(config, database=db_name)
+
+    def Connect():
+        return mysql.connector.connect(**db_config)
+
+    started = time.perf_counter()
+    ExecuteFile(Connect, os.path.join(dump_dir, manifest["schema"]))
+    LoadDataFiles(dump_dir, manifest, Connect, workers, fk_checks)
+    elapsed = ExecuteFile(Connect, os.path.join(dump_dir, manifest["post"]), fk_checks)
+    print(f"Secondary indexes and foreign keys built in {elapsed:.2f}s")
+
+    mysql_conn = Connect()
+    VerifyRowCounts(mysql_conn, manifest)
+    mysql_conn.close()
+    print(f"Imported `{db_name}` in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a split SQL dump into MySQL with concurrent sessions")
+    parser.add_argument("dump_dir", help="Directory written by SQLiteToMySQL_DataDump.py --split-dir")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_LOADER_WORKERS, help="Concurrent MySQL sessions")
+    parser.add_argument("--no-fk-checks", action="store_true",
+                        help="Load with FOREIGN_KEY_CHECKS=0 and ignore table dependency order")
+    parser.add_argument("--skip-verify", action="store_true", help="Do not check file checksums before loading")
+    args = parser.parse_args()
+
+    LoadSplitDump(args.dump_dir, LoadConfig(args.config), args.workers, not args.no_fk_checks, not args.skip_verify)
@@ -4,7 +4,7 @@
 # Path: Scripts/DataBase/SQLiteToMySQL_GenericPort.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-06-15
-# Last Modified: 2025-07-17  10:00AM
+# Last Modified: 2026-10-19  04:30PM
 
 """
 SQLiteToMySQL_GenericPort.py
@@ -13,6 +13,7 @@ Standard: AIDEV-PascalCase-2.1
 Purpose:
 Generic utility to port an arbitrary SQLite database to MySQL for development, testing,
 or data analysis purposes. Handles tables, columns, primary keys, and basic data transfer.
+Secondary indexes and foreign keys are added after the data (see SchemaMigration.py).
 
 Author: Himalaya Project
 """
@@ -20,6 +21,9 @@ Author: Himalaya Project
 import sqlite3
 import mysql.connector
 
+from MigrationEngine import SourceTables, TransferTable, PipelinedTransferTable
+from SchemaMigration import MigrateIndexesAndKeys
+
 # CONFIGURATION
 SQLITE_DB_PATH = "SourceDatabase.db"
 MYSQL_CONFIG = {
@@ -29,6 +33,11 @@ MYSQL_CONFIG = {
     "database": "TargetDatabase"
 }
 
+BATCH_SIZE = 1000      # rows fetched from SQLite per batch
+COMMIT_EVERY = 10      # batches per MySQL commit
+PIPELINE_WRITERS = 2   # concurrent MySQL writers fed by the SQLite reader (0 = read/write in turn)
+INDEX_WORKERS = 4      # tables whose indexes are built concurrently after the load
+
 TYPE_MAP = {
     "INTEGER": "INT",
     "TEXT": "VARCHAR(255)",
@@ -45,8 +54,7 @@ def MigrateDatabase():
     mysql_cur = mysql_conn.cursor()
 
     # Get list of tables
-    sqlite_cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-    tables = [row[0] for row in sqlite_cur.fetchall()]
+    tables = SourceTables(sqlite_conn)
 
     for table in tables:
         print(f"Processing table: {table}")
@@ -76,19 +84,18 @@ def MigrateDatabase():
         mysql_cur.execute(create_stmt)
         mysql_conn.commit()
 
-        # Transfer data
+        # Transfer data in bounded batches
         columns = [col[1] for col in columns_info]
-        col_list = ", ".join(f"`{c}`" for c in columns)
-        placeholders = ", ".join(["%s"] * len(columns))
-
-        sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`;")
-        rows = sqlite_cur.fetchall()
-
-        if rows:
-            insert_stmt = f"INSERT INTO `{table}` ({col_list}) VALUES ({placeholders});"
-            mysql_cur.executemany(insert_stmt, rows)
-            mysql_conn.commit()
-            print(f"Inserted {len(rows)} rows into `{table}`")
+        if PIPELINE_WRITERS > 0:
+            inserted = PipelinedTransferTable(sqlite_conn, lambda: mysql.connector.connect(**MYSQL_CONFIG),
+                                              table, columns, PIPELINE_WRITERS, BATCH_SIZE, COMMIT_EVERY)
+        else:
+            inserted = TransferTable(sqlite_conn, mysql_conn, table, columns, BATCH_SIZE, COMMIT_EVERY)
+        if inserted:
+            print(f"Inserted {inserted} rows into `{table}`")
+
+    MigrateIndexesAndKeys(sqlite_conn, mysql_conn, lambda: mysql.connector.connect(**MYSQL_CONFIG),
+                          tables, INDEX_WORKERS)
 
     sqlite_conn.close()
     mysql_conn.close()
@@ -4,7 +4,7 @@
 # Path: Scripts/DataBase/SQLiteToMySQL_GenericPort_Hardened.py
 # Standard: AIDEV-PascalCase-2.1
 # Created: 2025-06-15
-# Last Modified: 2025-07-17  10:01AM
+# Last Modified: 2026-10-19  10:45PM
 
 """
 SQLiteToMySQL_GenericPort_Hardened.py
@@ -13,25 +13,56 @@ Standard: AIDEV-PascalCase-2.1
 Purpose:
 Portable, configurable utility to migrate an arbitrary SQLite database to MySQL.
 Includes structured config file support and command-line argument parsing.
+Rows are streamed in bounded batches with periodic commits (see MigrationEngine.py).
+With --workers N, tables (and rowid ranges of large tables) are copied by a
+pool of worker processes, largest first (see ParallelMigration.py).
+With --pipeline-writers N, SQLite reads overlap with N concurrent MySQL
+writer connections and per-stage throughput is reported.
+Every committed batch is checkpointed in a `_migration_checkpoint` side table
+on the target; after an interruption, --resume copies only the rows that never
+committed. The side table is dropped once the migration completes.
+With --load-data, tables are bulk-loaded through LOAD DATA LOCAL INFILE
+(see BulkLoad.py), falling back to batched INSERTs if the server refuses it.
+Secondary indexes (built concurrently, --index-workers) and foreign keys are
+added after the data is in; --bulk-load additionally
+disables foreign-key and unique checks on the loading sessions
+(see SchemaMigration.py).
+With --infer-types, column values are profiled and the narrowest MySQL type
+that holds them is used instead of TYPE_MAP; the plan is printed and saved
+(--type-plan) so it can be reviewed or edited before it is applied
+(see TypeInference.py).
+Progress lines carry rows/s, MB/s and a live ETA; at the end a per-table
+summary (read vs write time, batch latency percentiles) is printed and a
+JSON run report is written (--report) so runs can be compared
+(see MigrationMetrics.py).
+With --plan, nothing is migrated: the source is profiled, a short
+calibration load runs against scratch tables on the target, and the
+projected duration, MySQL storage and recommended settings are printed and
+saved (see MigrationPlanner.py).
+BLOBs larger than --blob-stream-kb are streamed from SQLite to MySQL in
+chunks instead of being copied whole (batched INSERT path, serial or
+--workers; see BlobStreamer in MigrationEngine.py).
 
 Author: Himalaya Project
 """
 
 import sqlite3
-import mysql.connector
 import argparse
 import json
 import os
 import sys
+import time
 
-# Type mapping for SQLite to MySQL
-TYPE_MAP = {
-    "INTEGER": "INT",
-    "TEXT": "VARCHAR(255)",
-    "REAL": "FLOAT",
-    "BLOB": "LONGBLOB",
-    "NUMERIC": "FLOAT"
-}
+from MigrationEngine import (TransferTable, PipelinedTransferTable, EnsureCheckpointTable,
+                             DropCheckpointTable, PendingRanges, CheckpointedRows, SourceTables, BlobStreamer,
+                             DEFAULT_BATCH_SIZE, DEFAULT_COMMIT_EVERY, DEFAULT_MAX_BATCH_BYTES, DEFAULT_QUEUE_DEPTH,
+                             DEFAULT_BLOB_STREAM_BYTES)
+from ParallelMigration import MigrateParallel, DEFAULT_SPLIT_ROWS
+from BulkLoad import LoadDataTable, LoadDataUnavailable, DEFAULT_LOAD_CHUNK_BYTES
+from SchemaMigration import BulkLoadSession, ApplyBulkSession, MigrateIndexesAndKeys, DEFAULT_INDEX_WORKERS
+from TypeInference import BuildTypePlan, PrintTypePlan, SaveTypePlan, LoadTypePlan, DEFAULT_SAMPLE_ROWS, TYPE_MAP
+from MigrationMetrics import RunMetrics, EstimateRows
+from MigrationPlanner import PlanMigration, DEFAULT_CALIBRATION_ROWS
 
 def LoadConfig(config_path):
     if not os.path.exists(config_path):
@@ -40,68 +71,274 @@ def LoadConfig(config_path):
     with open(config_path, "r") as f:
         return json.load(f)
 
-def MigrateDatabase(sqlite_path, config):
+def TargetTableStatement(sqlite_cur, table, type_plan=None, name=None):
+    """CREATE TABLE for `table` on MySQL (optionally under another name) and its column list."""
+    sqlite_cur.execute(f"PRAGMA table_info({table});")
+    columns_info = sqlite_cur.fetchall()
+
+    column_defs = []
+    primary_keys = []
+    for col in columns_info:
+        col_name = col[1]
+        col_type = col[2].upper()
+        planned = (type_plan or {}).get(table, {}).get(col_name)
+        col_type_mysql = planned["type"] if planned else TYPE_MAP.get(col_type, "VARCHAR(255)")
+        column_defs.append(f"`{col_name}` {col_type_mysql}")
+        if col[5]:  # PK flag
+            primary_keys.append(f"`{col_name}`")
+
+    if not column_defs:
+        return None, None
+
+    create_stmt = f"CREATE TABLE IF NOT EXISTS `{name or table}` ({', '.join(column_defs)}"
+    if primary_keys:
+        create_stmt += f", PRIMARY KEY ({', '.join(primary_keys)})"
+    create_stmt += ");"
+    return create_stmt, [col[1] for col in columns_info]
+
+def CreateTargetTable(sqlite_cur, mysql_conn, table, type_plan=None):
+    create_stmt, columns = TargetTableStatement(sqlite_cur, table, type_plan)
+    if not create_stmt:
+        return None
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(create_stmt)
+    mysql_conn.commit()
+    mysql_cur.close()
+    return columns
+
+def LoadTablesSerially(sqlite_conn, mysql_conn, connect_writer, table_columns, pending, batch_size,
+                       commit_every, max_batch_bytes, pipeline_writers, queue_depth, load_data,
+                       load_chunk_bytes, metrics, blob_streamer=None):
+    for table, columns in table_columns.items():
+        inserted = 0
+        for rowid_range in pending.get(table, [None]):
+            if load_data:
+                try:
+                    inserted += LoadDataTable(sqlite_conn, mysql_conn, table, columns, load_chunk_bytes,
+                                              rowid_range=rowid_range, progress=metrics.Progress,
+                                              checkpoint=True, metrics=metrics)
+                    continue
+                except LoadDataUnavailable as e:
+                    print(f"LOAD DATA LOCAL INFILE unavailable ({e}); falling back to batched INSERTs")
+                    load_data = False
+            if pipeline_writers > 0:
+                inserted += PipelinedTransferTable(sqlite_conn, connect_writer,
+                                                   table, columns, pipeline_writers, batch_size,
+                                                   commit_every, max_batch_bytes, queue_depth,
+                                                   rowid_range=rowid_range, progress=metrics.Progress,
+                                                   checkpoint=True, metrics=metrics)
+            else:
+                inserted += TransferTable(sqlite_conn, mysql_conn, table, columns,
+                                          batch_size, commit_every, max_batch_bytes,
+                                          rowid_range=rowid_range, progress=metrics.Progress,
+                                          checkpoint=True, metrics=metrics, blob_streamer=blob_streamer)
+        if inserted:
+            print(f"Inserted {inserted} rows into `{table}`")
+
+def MigrateDatabase(sqlite_path, config, batch_size=DEFAULT_BATCH_SIZE,
+                    commit_every=DEFAULT_COMMIT_EVERY, max_batch_bytes=DEFAULT_MAX_BATCH_BYTES,
+                    workers=1, split_rows=DEFAULT_SPLIT_ROWS, pipeline_writers=0,
+                    queue_depth=DEFAULT_QUEUE_DEPTH, resume=False, load_data=False,
+                    load_chunk_bytes=DEFAULT_LOAD_CHUNK_BYTES, bulk_load=False,
+                    index_workers=DEFAULT_INDEX_WORKERS, type_plan=None, report_path=None,
+                    blob_stream_bytes=DEFAULT_BLOB_STREAM_BYTES):
     if not os.path.exists(sqlite_path):
         print(f"Error: SQLite file '{sqlite_path}' not found.")
         sys.exit(1)
+    if load_data and pipeline_writers > 0:
+        print("Error: --load-data and --pipeline-writers cannot be combined.")
+        sys.exit(1)
+    if load_data:
+        config = dict(config, allow_local_infile=True)
+    if blob_stream_bytes and not hasattr(sqlite3.Connection, "blobopen"):
+        print("Warning: BLOB streaming needs Python 3.11+ (sqlite3 blobopen); large BLOBs are copied whole")
+        blob_stream_bytes = 0
 
+    import mysql.connector
+    metrics = RunMetrics()
     sqlite_conn = sqlite3.connect(sqlite_path)
     sqlite_cur = sqlite_conn.cursor()
 
     mysql_conn = mysql.connector.connect(**config)
-    mysql_cur = mysql_conn.cursor()
-
-    sqlite_cur.execute("SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%';")
-    tables = [row[0] for row in sqlite_cur.fetchall()]
+    EnsureCheckpointTable(mysql_conn, reset=not resume)
 
-    for table in tables:
-        print(f"Processing table: {table}")
+    tables = SourceTables(sqlite_conn)
 
-        sqlite_cur.execute(f"PRAGMA table_info({table});")
-        columns_info = sqlite_cur.fetchall()
+    table_columns = {}
+    with metrics.Phase("schema"):
+        for table in tables:
+            print(f"Processing table: {table}")
+            columns = CreateTargetTable(sqlite_cur, mysql_conn, table, type_plan)
+            if columns:
+                table_columns[table] = columns
 
-        column_defs = []
-        primary_keys = []
-        for col in columns_info:
-            col_name = col[1]
-            col_type = col[2].upper()
-            col_type_mysql = TYPE_MAP.get(col_type, "VARCHAR(255)")
-            column_defs.append(f"`{col_name}` {col_type_mysql}")
-            if col[5]:  # PK flag
-                primary_keys.append(f"`{col_name}`")
+    pending = {}
+    for table in table_columns:
+        expected = EstimateRows(sqlite_conn, table)
+        if resume:
+            pending[table] = PendingRanges(sqlite_conn, mysql_conn, table)
+            if pending[table] != [None]:
+                already = CheckpointedRows(mysql_conn, table)
+                expected = max(expected - already, 0)
+                print(f"Resuming `{table}`: {already} rows already committed, "
+                      f"{len(pending[table])} rowid range(s) left")
+            elif not pending[table]:
+                expected = 0
+        metrics.Expect(table, expected)
 
-        if not column_defs:
-            continue
+    def ConnectWriter():
+        writer_conn = mysql.connector.connect(**config)
+        return ApplyBulkSession(writer_conn) if bulk_load else writer_conn
 
-        create_stmt = f"CREATE TABLE IF NOT EXISTS `{table}` ({', '.join(column_defs)}"
-        if primary_keys:
-            create_stmt += f", PRIMARY KEY ({', '.join(primary_keys)})"
-        create_stmt += ");"
-        mysql_cur.execute(create_stmt)
-        mysql_conn.commit()
+    with metrics.Phase("load"):
+        if workers > 1:
+            # Workers open their own connections; the parent only creates schema and indexes
+            MigrateParallel(sqlite_path, config, table_columns, workers, split_rows,
+                            batch_size, commit_every, max_batch_bytes, checkpoint=True, pending=pending,
+                            load_data=load_data, load_chunk_bytes=load_chunk_bytes, bulk_load=bulk_load,
+                            metrics=metrics, blob_stream_bytes=blob_stream_bytes)
+        else:
+            blob_streamer = None
+            if blob_stream_bytes:
+                # Only the pure-Python connection streams file-like parameters
+                stream_conn = mysql.connector.connect(**dict(config, use_pure=True))
+                blob_streamer = BlobStreamer(ApplyBulkSession(stream_conn) if bulk_load else stream_conn,
+                                             blob_stream_bytes)
+            with BulkLoadSession(mysql_conn, bulk_load):
+                LoadTablesSerially(sqlite_conn, mysql_conn, ConnectWriter, table_columns, pending, batch_size,
+                                   commit_every, max_batch_bytes, pipeline_writers, queue_depth, load_data,
+                                   load_chunk_bytes, metrics, blob_streamer)
+            if blob_streamer:
+                blob_streamer.Close()
 
-        columns = [col[1] for col in columns_info]
-        col_list = ", ".join(f"`{c}`" for c in columns)
-        placeholders = ", ".join(["%s"] * len(columns))
-
-        sqlite_cur.execute(f"SELECT {col_list} FROM `{table}`;")
-        rows = sqlite_cur.fetchall()
-
-        if rows:
-            insert_stmt = f"INSERT INTO `{table}` ({col_list}) VALUES ({placeholders});"
-            mysql_cur.executemany(insert_stmt, rows)
-            mysql_conn.commit()
-            print(f"Inserted {len(rows)} rows into `{table}`")
+    with metrics.Phase("indexes"):
+        MigrateIndexesAndKeys(sqlite_conn, mysql_conn, ConnectWriter, list(table_columns), index_workers)
 
     sqlite_conn.close()
+    DropCheckpointTable(mysql_conn)
     mysql_conn.close()
+    metrics.PrintSummary()
+    if report_path:
+        settings = {"batch_size": batch_size, "commit_every": commit_every, "max_batch_bytes": max_batch_bytes,
+                    "workers": workers, "split_rows": split_rows, "pipeline_writers": pipeline_writers,
+                    "queue_depth": queue_depth, "resume": resume, "load_data": load_data,
+                    "load_chunk_bytes": load_chunk_bytes, "bulk_load": bulk_load,
+                    "index_workers": index_workers, "type_plan": type_plan is not None,
+                    "blob_stream_bytes": blob_stream_bytes}
+        metrics.WriteReport(report_path, sqlite_path, settings)
+        print(f"Run report written to {report_path}")
     print("Migration completed successfully.")
 
+def PrepareTypePlan(sqlite_path, plan_path, infer, sample_rows):
+    """Profile and save a new type plan, or load a reviewed one; None when neither was asked for."""
+    if infer:
+        if not os.path.exists(sqlite_path):
+            print(f"Error: SQLite file '{sqlite_path}' not found.")
+            sys.exit(1)
+        sqlite_conn = sqlite3.connect(sqlite_path)
+        tables = SourceTables(sqlite_conn)
+        type_plan = BuildTypePlan(sqlite_conn, tables, sample_rows)
+        sqlite_conn.close()
+        SaveTypePlan(type_plan, plan_path)
+        print(f"Type plan saved to {plan_path}")
+    else:
+        if plan_path is None:
+            return None
+        type_plan = LoadTypePlan(plan_path)
+        if type_plan is None:
+            print(f"Error: type plan '{plan_path}' not found.")
+            sys.exit(1)
+        print(f"Using reviewed type plan {plan_path}")
+    PrintTypePlan(type_plan)
+    return type_plan
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Generic SQLite to MySQL Port Utility (Himalaya Hardened)")
     parser.add_argument("sqlite_db", help="Path to the SQLite .db file to migrate")
     parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows fetched from SQLite per batch")
+    parser.add_argument("--commit-every", type=int, default=DEFAULT_COMMIT_EVERY, help="Batches per MySQL commit")
+    parser.add_argument("--max-batch-mb", type=float, default=DEFAULT_MAX_BATCH_BYTES / 1024 / 1024,
+                        help="Upper bound on a single INSERT's payload (keep below max_allowed_packet)")
+
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for parallel table transfer")
+    parser.add_argument("--split-rows", type=int, default=DEFAULT_SPLIT_ROWS,
+                        help="In parallel mode, split tables larger than this into rowid ranges of this many rows")
+
+    parser.add_argument("--pipeline-writers", type=int, default=0,
+                        help="Overlap SQLite reads with this many concurrent MySQL writer connections")
+    parser.add_argument("--queue-depth", type=int, default=DEFAULT_QUEUE_DEPTH,
+                        help="Batches buffered between the reader and the writers in pipeline mode")
+
+    parser.add_argument("--load-data", action="store_true",
+                        help="Bulk-load tables with LOAD DATA LOCAL INFILE (falls back to INSERTs if refused)")
+    parser.add_argument("--load-chunk-mb", type=float, default=DEFAULT_LOAD_CHUNK_BYTES / 1024 / 1024,
+                        help="Size of each temporary TSV file loaded and committed in one transaction")
+
+    parser.add_argument("--bulk-load", action="store_true",
+                        help="Disable foreign-key/unique checks and autocommit on loading sessions (restored afterwards)")
+
+    parser.add_argument("--blob-stream-kb", type=float, default=DEFAULT_BLOB_STREAM_BYTES / 1024,
+                        help="Stream BLOBs larger than this from SQLite in chunks instead of copying them whole "
+                             "(0 = off)")
+
+    parser.add_argument("--index-workers", type=int, default=DEFAULT_INDEX_WORKERS,
+                        help="Tables whose secondary indexes are built concurrently after the load")
+
+    parser.add_argument("--infer-types", action="store_true",
+                        help="Profile column values and pick the narrowest MySQL types (saved to --type-plan)")
+    parser.add_argument("--sample-rows", type=int, default=DEFAULT_SAMPLE_ROWS,
+                        help="Rows reservoir-sampled per table for pattern checks (0 = every row)")
+    parser.add_argument("--type-plan", help="Type plan JSON to write with --infer-types "
+                                            "(default: <sqlite_db>.typeplan.json), or a reviewed plan to apply")
+    parser.add_argument("--type-plan-only", action="store_true",
+                        help="Print and save the type plan, then stop without migrating")
+
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted migration from its checkpoints instead of starting over")
+
+    parser.add_argument("--plan", action="store_true",
+                        help="Profile the source, calibrate against the target and project duration, storage "
+                             "and settings, then stop without migrating")
+    parser.add_argument("--calibration-rows", type=int, default=DEFAULT_CALIBRATION_ROWS,
+                        help="Rows per table copied into scratch tables to calibrate --plan (0 = no calibration)")
+
+    parser.add_argument("--report", help="JSON run report path "
+                                         "(default: <sqlite_db>.migration-<timestamp>.json)")
+    parser.add_argument("--no-report", action="store_true", help="Do not write a JSON run report")
 
     args = parser.parse_args()
+    infer_types = args.infer_types or args.type_plan_only
+    # A plan is only applied when asked for, never picked up from a leftover file next to the source
+    plan_path = args.type_plan or (os.path.splitext(args.sqlite_db)[0] + ".typeplan.json" if infer_types else None)
+    type_plan = PrepareTypePlan(args.sqlite_db, plan_path, infer_types, args.sample_rows)
+    if args.type_plan_only:
+        sys.exit(0)
+
+    if args.plan:
+        mysql_conn = None
+        if args.calibration_rows > 0:
+            import mysql.connector
+            try:
+                mysql_conn = mysql.connector.connect(**LoadConfig(args.config))
+            except mysql.connector.Error as e:
+                print(f"Warning: cannot reach the target ({e}); planning without calibration")
+        PlanMigration(args.sqlite_db, mysql_conn,
+                      lambda cur, table, name: TargetTableStatement(cur, table, type_plan, name),
+                      args.calibration_rows, args.batch_size, args.index_workers,
+                      os.path.splitext(args.sqlite_db)[0] + ".migration-plan.json")
+        if mysql_conn is not None:
+            mysql_conn.close()
+        sys.exit(0)
+
+    report_path = None
+    if not args.no_report:
+        report_path = args.report or (os.path.splitext(args.sqlite_db)[0] +
+                                      time.strftime(".migration-%Y%m%d-%H%M%S.json"))
+
     config = LoadConfig(args.config)
-    MigrateDatabase(args.sqlite_db, config)
+    MigrateDatabase(args.sqlite_db, config, args.batch_size, args.commit_every,
+                    int(args.max_batch_mb * 1024 * 1024), args.workers, args.split_rows,
+                    args.pipeline_writers, args.queue_depth, args.resume, args.load_data,
+                    int(args.load_chunk_mb * 1024 * 1024), args.bulk_load, args.index_workers, type_plan,
+                    report_path, int(args.blob_stream_kb * 1024))
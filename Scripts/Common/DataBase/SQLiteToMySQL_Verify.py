@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+# File: SQLiteToMySQL_Verify.py
+# Path: Scripts/DataBase/SQLiteToMySQL_Verify.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  09:30PM
+
+"""
+SQLiteToMySQL_Verify.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Proves a migrated MySQL database matches its SQLite source, row for row.
+
+Tables with an integer primary key are split into key ranges of
+--chunk-rows rows. For every chunk both sides compute an order-independent
+checksum: the row count plus the sums of a CRC32 and a 32-bit MD5 prefix of
+each row's canonical text. MySQL computes its side server-side, so only three
+numbers per chunk cross the network; the SQLite side is computed locally.
+Chunks are checked in parallel by worker processes.
+
+Only chunks whose checksums differ are drilled into: they are split into
+--fanout sub-ranges and re-checked until a range holds at most --leaf-rows
+rows, where per-row digests are compared to list the missing, extra and
+different primary keys. Tables keyed otherwise are checked as one chunk and
+compared per row on a mismatch; tables without a primary key can only be
+reported as matching or not.
+
+A row's canonical text is built from the target column types so the same
+value renders identically on both sides: BLOBs as hex, DECIMAL at the
+column's scale, FLOAT/DOUBLE as DECIMAL(65,10) (FLOAT values rounded to
+single precision first), DATE/DATETIME in MySQL's format, everything else
+as text.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import struct
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+from MigrationEngine import SourceTables
+from SchemaMigration import PrimaryKeyColumns, TargetColumnTypes
+from SQLiteToMySQL_GenericPort_Hardened import LoadConfig
+
+DEFAULT_VERIFY_WORKERS = 4
+DEFAULT_CHUNK_ROWS = 10000
+DEFAULT_LEAF_ROWS = 500
+DEFAULT_FANOUT = 8
+DEFAULT_SHOW_ROWS = 20
+
+FIELD_SEPARATOR = "\x1f"
+NULL_MARKER = "\x1e"
+APPROX_SCALE = 10
+
+# Per-process state populated by InitWorker
+WORKER = {}
+
+
+# -- canonical row text ----------------------------------------------------
+
+def TypeArguments(mysql_type):
+    match = re.search(r"\(([\d,\s]+)\)", mysql_type)
+    return [int(n) for n in match.group(1).split(",")] if match else []
+
+
+def FormatHex(value):
+    if isinstance(value, str):
+        value = value.encode("utf-8")
+    elif not isinstance(value, (bytes, bytearray, memoryview)):
+        value = str(value).encode("utf-8")
+    return bytes(value).hex().upper()
+
+
+def FormatText(value):
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return bytes(value).decode("utf-8", "replace")
+    if isinstance(value, float):
+        return repr(value)
+    return str(value)
+
+
+def FormatInteger(value):
+    try:
+        return str(int(value))
+    except (TypeError, ValueError):
+        return FormatText(value)
+
+
+def FormatFixed(value, scale, single=False):
+    try:
+        if isinstance(value, float) or single:
+            value = float(value)
+            if single:
+                value = struct.unpack("f", struct.pack("f", value))[0]
+            value = repr(value)
+        number = Decimal(str(value)).quantize(Decimal(1).scaleb(-scale), rounding=ROUND_HALF_UP)
+    except (InvalidOperation, ValueError, OverflowError, struct.error):
+        return FormatText(value)
+    return f"{number.copy_abs() if number == 0 else number:f}"
+
+
+def FormatDate(value):
+    try:
+        return date.fromisoformat(str(value)[:10]).isoformat()
+    except ValueError:
+        return FormatText(value)
+
+
+def FormatDatetime(value, fsp):
+    try:
+        stamp = datetime.fromisoformat(str(value))
+    except ValueError:
+        return FormatText(value)
+    text = stamp.strftime("%Y-%m-%d %H:%M:%S")
+    if fsp:
+        text += "." + f"{stamp.microsecond:06d}"[:fsp]
+    return text
+
+
+def CanonicalColumns(columns, target_types):
+    """(MySQL expression, Python formatter) per column, rendering values identically."""
+    forms = []
+    for column in columns:
+        mysql_type = target_types.get(column, "")
+        quoted = f"`{column}`"
+        args = TypeArguments(mysql_type)
+        if "BLOB" in mysql_type or "BINARY" in mysql_type:
+            forms.append((f"HEX({quoted})", FormatHex))
+        elif mysql_type.startswith(("DECIMAL", "NUMERIC")):
+            scale = args[1] if len(args) > 1 else 0
+            forms.append((f"CAST({quoted} AS CHAR)", lambda v, s=scale: FormatFixed(v, s)))
+        elif mysql_type.startswith(("FLOAT", "DOUBLE", "REAL")):
+            single = mysql_type.startswith("FLOAT")
+            forms.append((f"CAST({quoted} AS DECIMAL(65,{APPROX_SCALE}))",
+                          lambda v, f=single: FormatFixed(v, APPROX_SCALE, f)))
+        elif mysql_type.startswith(("DATETIME", "TIMESTAMP")):
+            fsp = args[0] if args else 0
+            forms.append((f"CAST({quoted} AS CHAR)", lambda v, p=fsp: FormatDatetime(v, p)))
+        elif mysql_type.startswith("DATE"):
+            forms.append((f"CAST({quoted} AS CHAR)", FormatDate))
+        elif "INT" in mysql_type:
+            forms.append((f"CAST({quoted} AS CHAR)", FormatInteger))
+        else:
+            forms.append((quoted, FormatText))
+    return forms
+
+
+def RowText(forms):
+    fields = ", ".join(f"IFNULL({expr}, CHAR(30))" for expr, _ in forms)
+    return f"CONCAT_WS(CHAR(31), {fields})"
+
+
+def DigestExpressions(forms):
+    text = RowText(forms)
+    return f"CRC32({text})", f"CAST(CONV(SUBSTRING(MD5({text}), 1, 8), 16, 10) AS UNSIGNED)"
+
+
+def RowDigest(row, forms):
+    text = FIELD_SEPARATOR.join(NULL_MARKER if v is None else fmt(v) for v, (_, fmt) in zip(row, forms))
+    data = text.encode("utf-8")
+    return zlib.crc32(data), int(hashlib.md5(data).hexdigest()[:8], 16)
+
+
+# -- chunking --------------------------------------------------------------
+
+def KeyFilter(key, key_range, placeholder="?"):
+    if key_range is None:
+        return "", ()
+    low, high = key_range
+    conditions = []
+    params = []
+    if low is not None:
+        conditions.append(f"`{key}` >= {placeholder}")
+        params.append(low)
+    if high is not None:
+        conditions.append(f"`{key}` < {placeholder}")
+        params.append(high)
+    return (" WHERE " + " AND ".join(conditions) if conditions else ""), tuple(params)
+
+
+def IntegerKey(sqlite_conn, table, keys):
+    """The primary key column if it is a single integer column, else None."""
+    if len(keys) != 1:
+        return None
+    declared = {row[1]: (row[2] or "").upper() for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")}
+    return keys[0] if "INT" in declared[keys[0]] else None
+
+
+def KeyRanges(sqlite_conn, table, key, key_range, parts_of):
+    """Split `key_range` into ranges of `parts_of` source rows each, in one ordered key scan."""
+    where, params = KeyFilter(key, key_range)
+    boundaries = []
+    for n, (value,) in enumerate(sqlite_conn.execute(
+            f"SELECT `{key}` FROM `{table}`{where} ORDER BY `{key}`;", params)):
+        if n and n % parts_of == 0:
+            boundaries.append(value)
+    low, high = key_range or (None, None)
+    edges = [low] + boundaries + [high]
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def PlanChunks(sqlite_conn, tables, chunk_rows):
+    chunks = []
+    for table in tables:
+        columns = [row[1] for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")]
+        keys = PrimaryKeyColumns(sqlite_conn, table)
+        int_key = IntegerKey(sqlite_conn, table, keys)
+        ranges = KeyRanges(sqlite_conn, table, int_key, None, chunk_rows) if int_key else [None]
+        for key_range in ranges:
+            chunks.append({"index": len(chunks), "table": table, "columns": columns, "keys": keys,
+                           "int_key": int_key, "key_range": key_range})
+    return chunks
+
+
+# -- checksums -------------------------------------------------------------
+
+def SqliteChecksum(sqlite_conn, table, columns, forms, int_key, key_range):
+    where, params = KeyFilter(int_key, key_range)
+    count = crc_sum = md5_sum = 0
+    cursor = sqlite_conn.execute(f"SELECT {', '.join(f'`{c}`' for c in columns)} FROM `{table}`{where};", params)
+    for row in cursor:
+        crc, md5 = RowDigest(row, forms)
+        count += 1
+        crc_sum += crc
+        md5_sum += md5
+    return count, crc_sum, md5_sum
+
+
+def MysqlChecksum(mysql_conn, table, forms, int_key, key_range):
+    where, params = KeyFilter(int_key, key_range, "%s")
+    crc, md5 = DigestExpressions(forms)
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SELECT COUNT(*), SUM({crc}), SUM({md5}) FROM `{table}`{where};", params)
+    count, crc_sum, md5_sum = mysql_cur.fetchone()
+    mysql_cur.close()
+    return int(count), int(crc_sum or 0), int(md5_sum or 0)
+
+
+def SqliteRowDigests(sqlite_conn, table, columns, keys, forms, int_key, key_range):
+    where, params = KeyFilter(int_key, key_range)
+    key_index = [columns.index(k) for k in keys]
+    digests = {}
+    for row in sqlite_conn.execute(f"SELECT {', '.join(f'`{c}`' for c in columns)} FROM `{table}`{where};",
+                                   params):
+        digests[tuple(row[i] for i in key_index)] = RowDigest(row, forms)
+    return digests
+
+
+def MysqlRowDigests(mysql_conn, table, keys, forms, int_key, key_range):
+    where, params = KeyFilter(int_key, key_range, "%s")
+    crc, md5 = DigestExpressions(forms)
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SELECT {', '.join(f'`{k}`' for k in keys)}, {crc}, {md5} FROM `{table}`{where};", params)
+    digests = {tuple(row[:len(keys)]): (int(row[-2]), int(row[-1])) for row in mysql_cur.fetchall()}
+    mysql_cur.close()
+    return digests
+
+
+# -- worker ----------------------------------------------------------------
+
+def InitWorker(sqlite_path, mysql_config, settings, connect=None):
+    if connect is None:
+        import mysql.connector
+        connect = mysql.connector.connect
+    WORKER["sqlite"] = sqlite3.connect(sqlite_path)
+    WORKER["mysql"] = connect(**mysql_config)
+    WORKER["settings"] = settings
+    WORKER["forms"] = {}
+
+
+def TableForms(table, columns):
+    if table not in WORKER["forms"]:
+        WORKER["forms"][table] = CanonicalColumns(columns, TargetColumnTypes(WORKER["mysql"], table))
+    return WORKER["forms"][table]
+
+
+def CompareRows(chunk, forms, key_range, result):
+    source = SqliteRowDigests(WORKER["sqlite"], chunk["table"], chunk["columns"], chunk["keys"], forms,
+                              chunk["int_key"], key_range)
+    target = MysqlRowDigests(WORKER["mysql"], chunk["table"], chunk["keys"], forms, chunk["int_key"], key_range)
+    for key, digest in source.items():
+        if key not in target:
+            result["missing"].append(key)
+        elif target[key] != digest:
+            result["different"].append(key)
+    result["extra"] += [key for key in target if key not in source]
+
+
+def DrillDown(chunk, forms, key_range, result):
+    settings = WORKER["settings"]
+    source = SqliteChecksum(WORKER["sqlite"], chunk["table"], chunk["columns"], forms, chunk["int_key"], key_range)
+    target = MysqlChecksum(WORKER["mysql"], chunk["table"], forms, chunk["int_key"], key_range)
+    result["checked"] += 1
+    if result["checked"] == 1:
+        result["rows"], result["target_rows"] = source[0], target[0]
+    if source == target:
+        return
+    if not chunk["keys"]:
+        result["unkeyed"] = True
+        return
+    if chunk["int_key"] is None or source[0] <= settings["leaf_rows"]:
+        CompareRows(chunk, forms, key_range, result)
+        return
+    parts_of = -(-source[0] // settings["fanout"])
+    for sub_range in KeyRanges(WORKER["sqlite"], chunk["table"], chunk["int_key"], key_range, parts_of):
+        DrillDown(chunk, forms, sub_range, result)
+
+
+def VerifyChunk(chunk):
+    result = {"index": chunk["index"], "table": chunk["table"], "key_range": chunk["key_range"], "rows": 0, "target_rows": 0,
+              "checked": 0, "missing": [], "extra": [], "different": [], "unkeyed": False, "error": None}
+    try:
+        forms = TableForms(chunk["table"], chunk["columns"])
+        DrillDown(chunk, forms, chunk["key_range"], result)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+# -- driver ----------------------------------------------------------------
+
+def FormatKey(key):
+    return str(key[0]) if len(key) == 1 else "(" + ", ".join(str(k) for k in key) + ")"
+
+
+def PrintTableSummary(table, results, show):
+    results = sorted(results, key=lambda r: r["index"])
+    rows = sum(r["rows"] for r in results)
+    target_rows = sum(r["target_rows"] for r in results)
+    checked = sum(r["checked"] for r in results)
+    errors = [r["error"] for r in results if r["error"]]
+    if errors:
+        print(f"`{table}`: ERROR {errors[0]}")
+        return False
+    missing = [k for r in results for k in r["missing"]]
+    extra = [k for r in results for k in r["extra"]]
+    different = [k for r in results for k in r["different"]]
+    unkeyed = any(r["unkeyed"] for r in results)
+    if not (missing or extra or different or unkeyed):
+        print(f"`{table}`: OK ({rows} rows, {len(results)} chunk(s))")
+        return True
+    print(f"`{table}`: MISMATCH (source {rows} rows, target {target_rows} rows, {checked} ranges checked)")
+    if unkeyed:
+        print("  no primary key: checksums differ, rows cannot be pinpointed")
+    for label, keys in (("missing on target", missing), ("extra on target", extra), ("different", different)):
+        if keys:
+            shown = ", ".join(FormatKey(k) for k in keys[:show])
+            more = f" ... (+{len(keys) - show})" if len(keys) > show else ""
+            print(f"  {len(keys)} {label}: {shown}{more}")
+    return False
+
+
+def VerifyDatabase(sqlite_path, config, workers=DEFAULT_VERIFY_WORKERS, chunk_rows=DEFAULT_CHUNK_ROWS,
+                   leaf_rows=DEFAULT_LEAF_ROWS, fanout=DEFAULT_FANOUT, show=DEFAULT_SHOW_ROWS, tables=None,
+                   connect=None):
+    """`connect` (picklable, called with the config as keywords) replaces mysql.connector.connect."""
+    if not os.path.exists(sqlite_path):
+        print(f"Error: SQLite file '{sqlite_path}' not found.")
+        sys.exit(1)
+    started = time.perf_counter()
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    tables = tables or SourceTables(sqlite_conn)
+    chunks = PlanChunks(sqlite_conn, tables, chunk_rows)
+    sqlite_conn.close()
+    print(f"Verifying {len(tables)} tables in {len(chunks)} chunks across {workers} worker processes")
+
+    settings = {"leaf_rows": max(1, leaf_rows), "fanout": max(2, fanout)}
+    by_table = {table: [] for table in tables}
+    with ProcessPoolExecutor(max_workers=workers, initializer=InitWorker,
+                             initargs=(sqlite_path, config, settings, connect)) as pool:
+        for future in as_completed([pool.submit(VerifyChunk, chunk) for chunk in chunks]):
+            result = future.result()
+            by_table[result["table"]].append(result)
+
+    matched = [PrintTableSummary(table, results, show) for table, results in by_table.items()]
+    elapsed = time.perf_counter() - started
+    if all(matched):
+        print(f"Target matches source ({len(tables)} tables) in {elapsed:.2f}s")
+    else:
+        print(f"Target differs from source in {matched.count(False)} of {len(tables)} tables ({elapsed:.2f}s)")
+    return all(matched)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verify a MySQL migration against its SQLite source with chunked checksums")
+    parser.add_argument("sqlite_db", help="Path to the source SQLite .db file")
+    parser.add_argument("--config", default="mysql_config.json", help="Path to MySQL config JSON file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_VERIFY_WORKERS, help="Worker processes checking chunks")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS,
+                        help="Rows per top-level primary-key chunk")
+    parser.add_argument("--leaf-rows", type=int, default=DEFAULT_LEAF_ROWS,
+                        help="Compare row by row once a differing range holds this many rows or fewer")
+    parser.add_argument("--fanout", type=int, default=DEFAULT_FANOUT, help="Sub-ranges per drill-down step")
+    parser.add_argument("--show", type=int, default=DEFAULT_SHOW_ROWS, help="Divergent keys listed per table")
+    parser.add_argument("--tables", nargs="+", help="Only verify these tables")
+    args = parser.parse_args()
+
+    ok = VerifyDatabase(args.sqlite_db, LoadConfig(args.config), args.workers, args.chunk_rows,
+                        args.leaf_rows, args.fanout, args.show, args.tables)
+    sys.exit(0 if ok else 1)
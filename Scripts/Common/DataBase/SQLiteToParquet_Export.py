@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# File: SQLiteToParquet_Export.py
+# Path: Scripts/DataBase/SQLiteToParquet_Export.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  09:55PM
+
+"""
+SQLiteToParquet_Export.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Exports every table of a SQLite database to Parquet files for analysis,
+a columnar snapshot alongside the MySQL dump (SQLiteToMySQL_DataDump.py).
+Needs the optional 'pyarrow' package.
+
+Each table is streamed in row groups bounded by --row-group-rows and
+--row-group-mb, so memory stays flat however large the table. Column types
+come from one aggregate pass over the table's storage classes (see
+TypeInference.py): integer -> int64, real or integer/real -> float64,
+text -> string, blob -> binary; columns mixing text with other classes are
+written as strings (as binary if they hold BLOBs), and all-NULL columns
+follow their declared type. Non-BLOB columns are dictionary encoded, and
+pages are compressed with --compression (zstd by default).
+
+BLOB columns (thumbnails) dominate the catalog's size but rarely matter to
+analytics. --blobs inline keeps them in the table file, --blobs split
+writes each to <table>.<column>.parquet next to the table's key columns
+(the rowid as _rowid when the table has no primary key), and --blobs drop
+leaves them out.
+
+The output directory holds one <table>.parquet per table plus
+manifest.json (rows, row groups, column types and files per table).
+
+Author: Himalaya Project
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+
+from MigrationEngine import BatchBytes, IterBatches, SourceTables, DEFAULT_BATCH_SIZE
+from SchemaMigration import PrimaryKeyColumns
+from TypeInference import ListColumns, AggregateProfile
+
+DEFAULT_ROW_GROUP_ROWS = 128 * 1024
+DEFAULT_ROW_GROUP_BYTES = 64 * 1024 * 1024
+DEFAULT_PARQUET_COMPRESSION = "zstd"
+PARQUET_COMPRESSIONS = ["zstd", "snappy", "gzip", "none"]
+BLOB_MODES = ["inline", "split", "drop"]
+MANIFEST_NAME = "manifest.json"
+ROWID_COLUMN = "_rowid"
+
+
+def ImportPyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        print("Error: Parquet export needs the 'pyarrow' package (pip install pyarrow).")
+        sys.exit(1)
+    return pyarrow, pyarrow.parquet
+
+
+def ArrowKind(profile):
+    """'int64', 'float64', 'string' or 'binary' for a column, from its storage-class counts."""
+    classes = {c for c in ("integer", "real", "text", "blob") if profile[c]}
+    if not classes:
+        declared = profile["declared"]
+        if "INT" in declared:
+            return "int64"
+        if any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+            return "float64"
+        return "binary" if "BLOB" in declared else "string"
+    if classes == {"integer"}:
+        return "int64"
+    if classes <= {"integer", "real"}:
+        return "float64"
+    if "blob" in classes:
+        return "binary"
+    return "string"
+
+
+def ToString(value):
+    if value is None or isinstance(value, str):
+        return value
+    return bytes(value).decode("utf-8", "replace") if isinstance(value, bytes) else str(value)
+
+
+def ToBinary(value):
+    if value is None or isinstance(value, bytes):
+        return value
+    return (value if isinstance(value, str) else str(value)).encode("utf-8")
+
+
+def ToFloat(value):
+    return None if value is None else float(value)
+
+
+# Coercion applied to a column's values before they are handed to pyarrow
+CONVERTERS = {"int64": None, "float64": ToFloat, "string": ToString, "binary": ToBinary}
+
+
+def PlanTable(sqlite_conn, table, blobs):
+    """Column kinds and the layout of the table file and any split BLOB files."""
+    columns = ListColumns(sqlite_conn, table)
+    profiles = AggregateProfile(sqlite_conn, table, columns)
+    kinds = {name: ArrowKind(profiles[name]) for name, _ in columns}
+    blob_columns = [name for name, _ in columns if kinds[name] == "binary"] if blobs != "inline" else []
+    keys = PrimaryKeyColumns(sqlite_conn, table)
+    select = [name for name, _ in columns]
+    if blobs == "split" and blob_columns and not keys:
+        keys = [ROWID_COLUMN]
+        kinds[ROWID_COLUMN] = "int64"
+        select = [ROWID_COLUMN] + select
+    main = [name for name in select if name not in blob_columns]
+    split = {column: keys + [column] for column in blob_columns} if blobs == "split" else {}
+    return {"select": select, "kinds": kinds, "main": main, "split": split}
+
+
+def ArrowSchema(pa, names, kinds):
+    types = {"int64": pa.int64(), "float64": pa.float64(), "string": pa.string(), "binary": pa.binary()}
+    return pa.schema([(name, types[kinds[name]]) for name in names])
+
+
+def OpenWriter(pq, path, schema, compression, level):
+    # Dictionary-encode everything but BLOBs, whose values almost never repeat
+    dictionary = [f.name for f in schema if str(f.type) != "binary"]
+    return pq.ParquetWriter(path, schema, compression=compression, compression_level=level,
+                            use_dictionary=dictionary or False)
+
+
+def RowGroups(sqlite_cur, row_group_rows, row_group_bytes):
+    """Batches of rows gathered until either row-group bound is reached."""
+    group = []
+    group_bytes = 0
+    for rows in IterBatches(sqlite_cur, min(DEFAULT_BATCH_SIZE, row_group_rows)):
+        group.extend(rows)
+        group_bytes += BatchBytes(rows)
+        if len(group) >= row_group_rows or group_bytes >= row_group_bytes:
+            yield group
+            group = []
+            group_bytes = 0
+    if group:
+        yield group
+
+
+def ExportTable(sqlite_conn, table, output_dir, blobs, row_group_rows, row_group_bytes, compression, level):
+    pa, pq = ImportPyarrow()
+    plan = PlanTable(sqlite_conn, table, blobs)
+    select = plan["select"]
+    kinds = plan["kinds"]
+    position = {name: i for i, name in enumerate(select)}
+    quoted = ", ".join("rowid" if name == ROWID_COLUMN else f"`{name}`" for name in select)
+
+    layouts = {table: plan["main"]}
+    layouts.update({f"{table}.{column}": names for column, names in plan["split"].items()})
+    writers = {}
+    for name, names in layouts.items():
+        path = os.path.join(output_dir, f"{name}.parquet")
+        writers[name] = (OpenWriter(pq, path + ".partial", ArrowSchema(pa, names, kinds), compression, level),
+                         names, path)
+
+    sqlite_cur = sqlite_conn.cursor()
+    sqlite_cur.execute(f"SELECT {quoted} FROM `{table}`;")
+    rows = row_groups = 0
+    for group in RowGroups(sqlite_cur, row_group_rows, row_group_bytes):
+        for writer, names, _ in writers.values():
+            arrays = []
+            for name in names:
+                values = [row[position[name]] for row in group]
+                convert = CONVERTERS[kinds[name]]
+                if convert:
+                    values = [convert(v) for v in values]
+                arrays.append(values)
+            writer.write_table(pa.Table.from_arrays([pa.array(v, type=writer.schema.field(i).type)
+                                                     for i, v in enumerate(arrays)], schema=writer.schema),
+                               row_group_size=len(group))
+        rows += len(group)
+        row_groups += 1
+    sqlite_cur.close()
+
+    files = []
+    for writer, names, path in writers.values():
+        writer.close()
+        os.replace(path + ".partial", path)
+        files.append({"file": os.path.basename(path), "columns": names, "bytes": os.path.getsize(path)})
+    written = [name for name in select if any(name in f["columns"] for f in files)]
+    return {"rows": rows, "row_groups": row_groups, "types": {name: kinds[name] for name in written}, "files": files}
+
+
+def ExportParquet(sqlite_path, output_dir, blobs="inline", row_group_rows=DEFAULT_ROW_GROUP_ROWS,
+                  row_group_bytes=DEFAULT_ROW_GROUP_BYTES, compression=DEFAULT_PARQUET_COMPRESSION, level=None,
+                  tables=None):
+    if not os.path.exists(sqlite_path):
+        print(f"Error: SQLite file '{sqlite_path}' not found.")
+        sys.exit(1)
+    ImportPyarrow()
+    os.makedirs(output_dir, exist_ok=True)
+    sqlite_conn = sqlite3.connect(sqlite_path)
+    started = time.perf_counter()
+
+    manifest_tables = {}
+    for table in tables or SourceTables(sqlite_conn):
+        table_started = time.perf_counter()
+        manifest_tables[table] = ExportTable(sqlite_conn, table, output_dir, blobs, row_group_rows,
+                                             row_group_bytes, None if compression == "none" else compression,
+                                             level)
+        exported = manifest_tables[table]
+        size = sum(f["bytes"] for f in exported["files"]) / 1024 / 1024
+        print(f"Exported {exported['rows']} rows from `{table}` in {exported['row_groups']} row group(s) "
+              f"to {len(exported['files'])} file(s), {size:.1f} MB ({time.perf_counter() - table_started:.2f}s)")
+    sqlite_conn.close()
+
+    manifest = {
+        "generated": datetime.now().isoformat(timespec="seconds"),
+        "source": os.path.basename(sqlite_path),
+        "compression": compression,
+        "blobs": blobs,
+        "tables": manifest_tables,
+    }
+    with open(os.path.join(output_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Parquet export written to: {output_dir} ({time.perf_counter() - started:.2f}s, manifest: {MANIFEST_NAME})")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a SQLite database to Parquet files for analysis")
+    parser.add_argument("sqlite_db", help="Path to the SQLite .db file")
+    parser.add_argument("output_dir", help="Directory for the .parquet files and manifest.json")
+    parser.add_argument("--blobs", choices=BLOB_MODES, default="inline",
+                        help="Keep BLOB columns in the table file, split them into their own files, or drop them")
+    parser.add_argument("--row-group-rows", type=int, default=DEFAULT_ROW_GROUP_ROWS, help="Maximum rows per row group")
+    parser.add_argument("--row-group-mb", type=float, default=DEFAULT_ROW_GROUP_BYTES / 1024 / 1024,
+                        help="Approximate maximum size of a row group before encoding")
+    parser.add_argument("--compression", choices=PARQUET_COMPRESSIONS, default=DEFAULT_PARQUET_COMPRESSION,
+                        help="Parquet page compression")
+    parser.add_argument("--compression-level", type=int, help="Codec level (zstd 1-22, gzip 1-9)")
+    parser.add_argument("--tables", nargs="+", help="Only export these tables")
+    args = parser.parse_args()
+
+    if args.row_group_rows < 1 or args.row_group_mb <= 0:
+        print("Error: row-group bounds must be positive.")
+        sys.exit(1)
+    ExportParquet(args.sqlite_db, args.output_dir, args.blobs, args.row_group_rows,
+                  int(args.row_group_mb * 1024 * 1024), args.compression, args.compression_level, args.tables)
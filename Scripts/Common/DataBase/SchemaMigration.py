@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+# File: SchemaMigration.py
+# Path: Scripts/DataBase/SchemaMigration.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  06:10PM
+
+"""
+SchemaMigration.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Secondary index, unique and foreign-key translation, plus bulk-load session
+handling, for the SQLite to MySQL migrators.
+
+Tables are created with only their primary key so rows arrive in clustered
+order without maintaining any other B-tree. IndexStatements() reads each
+SQLite index (explicit CREATE INDEX and UNIQUE constraints, via PRAGMA
+index_list / index_xinfo) and returns one ALTER TABLE per table that adds
+them all, so InnoDB scans the loaded table once. Indexes that already exist
+on the target are skipped, which keeps a resumed run safe. The per-table
+ALTERs run concurrently on separate connections (InnoDB builds indexes on
+different tables independently); same-table indexes stay in one statement.
+BLOB/TEXT columns, and VARCHARs too wide for InnoDB's 3072-byte key limit,
+are indexed on a prefix.
+
+Foreign keys come from PRAGMA foreign_key_list and are added once every
+index exists, one table at a time, since each ALTER also locks the parent
+table. On a bulk-load session FOREIGN_KEY_CHECKS=0 lets MySQL add them
+without re-validating every row.
+
+With mysql_conn=None the statements are generated from SQLite alone (no
+existence checks against a target), which is how the split dump writes
+them to files.
+
+BulkLoadSession() turns off FOREIGN_KEY_CHECKS, UNIQUE_CHECKS and autocommit
+for the duration of a load and restores the previous session values
+afterwards, including when the load fails. Connections that are closed after
+the load (pipeline writers, worker processes) only need ApplyBulkSession().
+
+Author: Himalaya Project
+"""
+
+import contextlib
+import re
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+BULK_SESSION_SETTINGS = {"FOREIGN_KEY_CHECKS": 0, "UNIQUE_CHECKS": 0}
+MAX_IDENTIFIER_LENGTH = 64
+BLOB_INDEX_PREFIX = 255
+MAX_KEY_BYTES = 3072  # InnoDB index key limit (DYNAMIC/COMPRESSED rows)
+DEFAULT_INDEX_WORKERS = 4
+
+# InnoDB rejects SET DEFAULT; the closest behaviour that keeps the row is RESTRICT
+FOREIGN_KEY_ACTIONS = {"CASCADE": "CASCADE", "SET NULL": "SET NULL", "RESTRICT": "RESTRICT",
+                       "NO ACTION": "NO ACTION", "SET DEFAULT": "RESTRICT"}
+
+
+# -- session profile -----------------------------------------------------
+
+def ReadSessionSettings(mysql_conn):
+    mysql_cur = mysql_conn.cursor()
+    saved = {}
+    for name in BULK_SESSION_SETTINGS:
+        mysql_cur.execute(f"SELECT @@SESSION.{name};")
+        saved[name] = mysql_cur.fetchone()[0]
+    mysql_cur.close()
+    return saved
+
+
+def ApplySessionSettings(mysql_conn, settings):
+    mysql_cur = mysql_conn.cursor()
+    for name, value in settings.items():
+        mysql_cur.execute(f"SET SESSION {name} = {int(value)};")
+    mysql_cur.close()
+
+
+def ApplyBulkSession(mysql_conn):
+    mysql_conn.autocommit = False
+    ApplySessionSettings(mysql_conn, BULK_SESSION_SETTINGS)
+    return mysql_conn
+
+
+@contextlib.contextmanager
+def BulkLoadSession(mysql_conn, enabled=True):
+    if not enabled:
+        yield mysql_conn
+        return
+    saved = ReadSessionSettings(mysql_conn)
+    saved_autocommit = mysql_conn.autocommit
+    try:
+        ApplyBulkSession(mysql_conn)
+        yield mysql_conn
+    except BaseException:
+        # Drop whatever the failed load left uncommitted before restoring checks
+        mysql_conn.rollback()
+        raise
+    finally:
+        try:
+            ApplySessionSettings(mysql_conn, saved)
+            mysql_conn.autocommit = saved_autocommit
+        except Exception as e:
+            # Session variables die with the connection, so a broken one needs no restore
+            print(f"Warning: could not restore MySQL session settings: {e}")
+
+
+# -- secondary indexes ---------------------------------------------------
+
+def ExistingIndexes(mysql_conn, table):
+    if mysql_conn is None:
+        return set()
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SHOW INDEX FROM `{table}`;")
+    names = {row[2] for row in mysql_cur.fetchall()}
+    mysql_cur.close()
+    return names
+
+
+def TargetColumnTypes(mysql_conn, table):
+    if mysql_conn is None:
+        return {}
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(f"SHOW COLUMNS FROM `{table}`;")
+    types = {row[0]: str(row[1]).upper() for row in mysql_cur.fetchall()}
+    mysql_cur.close()
+    return types
+
+
+def VarcharChars(column_type):
+    match = re.match(r"VARCHAR\((\d+)\)", column_type)
+    return int(match.group(1)) if match else 0
+
+
+def PrefixColumns(sqlite_conn, mysql_conn, table, target_table=None):
+    """Columns that MySQL can only index by prefix (BLOB/TEXT, or VARCHARs wider than the key limit)."""
+    declared = {row[1]: (row[2] or "").upper() for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")}
+    target = TargetColumnTypes(mysql_conn, target_table or table)
+    prefixed = set()
+    for name, declared_type in declared.items():
+        target_type = target.get(name)
+        if target_type is not None and ("BLOB" in target_type or "TEXT" in target_type):
+            prefixed.add(name)
+        elif target_type is not None and VarcharChars(target_type) * 4 > MAX_KEY_BYTES:
+            # Inferred widths can pass 768 utf8mb4 characters, which InnoDB cannot index whole
+            prefixed.add(name)
+        elif target_type is None and "BLOB" in declared_type:
+            prefixed.add(name)
+    return prefixed
+
+
+def IndexColumns(sqlite_conn, index, prefixed):
+    parts = []
+    for row in sqlite_conn.execute(f"PRAGMA index_xinfo(`{index}`);"):
+        seqno, cid, name, desc, collation, key = row[:6]
+        if not key:
+            continue
+        if cid < 0:
+            # Expression (-2) or bare rowid (-1) columns have no MySQL equivalent
+            return None
+        part = f"`{name}`"
+        if name in prefixed:
+            part += f"({BLOB_INDEX_PREFIX})"
+        if desc:
+            part += " DESC"
+        parts.append(part)
+    return parts
+
+
+def IndexStatements(sqlite_conn, mysql_conn, table, target_table=None):
+    """ALTER TABLE adding every secondary index of `table` missing on the target (or on
+    `target_table`, a differently named copy of it), or None."""
+    target_table = target_table or table
+    prefixed = PrefixColumns(sqlite_conn, mysql_conn, table, target_table)
+    existing = ExistingIndexes(mysql_conn, target_table)
+    clauses = []
+    for row in sqlite_conn.execute(f"PRAGMA index_list(`{table}`);").fetchall():
+        name, unique, origin, partial = row[1], row[2], row[3], row[4]
+        if origin == "pk":
+            continue
+        columns = IndexColumns(sqlite_conn, name, prefixed)
+        if columns is None or partial:
+            print(f"Warning: skipping index `{name}` on `{table}` (expression or partial index)")
+            continue
+        if origin == "u":
+            # sqlite_autoindex_* names are meaningless on the target
+            plain = [c.split("`")[1] for c in columns]
+            name = f"UQ_{table}_{'_'.join(plain)}"
+        name = name[:MAX_IDENTIFIER_LENGTH]
+        if name in existing:
+            continue
+        clauses.append(f"ADD {'UNIQUE ' if unique else ''}INDEX `{name}` ({', '.join(columns)})")
+    if not clauses:
+        return None
+    return f"ALTER TABLE `{target_table}` {', '.join(clauses)};"
+
+
+# -- foreign keys --------------------------------------------------------
+
+def ExistingForeignKeys(mysql_conn, table):
+    if mysql_conn is None:
+        return set()
+    mysql_cur = mysql_conn.cursor()
+    mysql_cur.execute(
+        "SELECT CONSTRAINT_NAME FROM information_schema.TABLE_CONSTRAINTS "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND CONSTRAINT_TYPE = 'FOREIGN KEY';", (table,))
+    names = {row[0] for row in mysql_cur.fetchall()}
+    mysql_cur.close()
+    return names
+
+
+def PrimaryKeyColumns(sqlite_conn, table):
+    info = sqlite_conn.execute(f"PRAGMA table_info(`{table}`);").fetchall()
+    return [row[1] for row in sorted((r for r in info if r[5]), key=lambda r: r[5])]
+
+
+def ForeignKeyStatement(sqlite_conn, mysql_conn, table, tables):
+    """ALTER TABLE adding the foreign keys of `table` missing on the target, or None."""
+    keys = {}
+    for row in sqlite_conn.execute(f"PRAGMA foreign_key_list(`{table}`);").fetchall():
+        key_id, seq, parent, child_column, parent_column, on_update, on_delete = row[:7]
+        key = keys.setdefault(key_id, {"parent": parent, "from": [], "to": [],
+                                       "on_update": on_update, "on_delete": on_delete})
+        key["from"].append(child_column)
+        key["to"].append(parent_column)
+
+    existing = ExistingForeignKeys(mysql_conn, table)
+    clauses = []
+    for key in keys.values():
+        if key["parent"] not in tables:
+            print(f"Warning: skipping foreign key `{table}` -> `{key['parent']}` (parent table not migrated)")
+            continue
+        if None in key["to"]:
+            # REFERENCES parent without a column list means the parent's primary key
+            key["to"] = PrimaryKeyColumns(sqlite_conn, key["parent"])
+        name = f"FK_{table}_{'_'.join(key['from'])}"[:MAX_IDENTIFIER_LENGTH]
+        if name in existing:
+            continue
+        clauses.append(
+            f"ADD CONSTRAINT `{name}` FOREIGN KEY ({', '.join(f'`{c}`' for c in key['from'])}) "
+            f"REFERENCES `{key['parent']}` ({', '.join(f'`{c}`' for c in key['to'])}) "
+            f"ON DELETE {FOREIGN_KEY_ACTIONS.get(key['on_delete'], 'NO ACTION')} "
+            f"ON UPDATE {FOREIGN_KEY_ACTIONS.get(key['on_update'], 'NO ACTION')}")
+    if not clauses:
+        return None
+    return f"ALTER TABLE `{table}` {', '.join(clauses)};"
+
+
+# -- building ------------------------------------------------------------
+
+def RunDDL(connect_mysql, statement):
+    mysql_conn = connect_mysql()
+    try:
+        started = time.perf_counter()
+        mysql_cur = mysql_conn.cursor()
+        mysql_cur.execute(statement)
+        mysql_conn.commit()
+        mysql_cur.close()
+        return time.perf_counter() - started
+    finally:
+        mysql_conn.close()
+
+
+def BuildIndexes(connect_mysql, statements, workers=DEFAULT_INDEX_WORKERS):
+    if not statements:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {table: pool.submit(RunDDL, connect_mysql, statement) for table, statement in statements.items()}
+        for table, future in futures.items():
+            try:
+                elapsed = future.result()
+            except Exception as e:
+                print(f"Error: building indexes on `{table}` failed: {e}")
+                sys.exit(1)
+            print(f"Built {statements[table].count('ADD ')} index(es) on `{table}` in {elapsed:.2f}s")
+
+
+def BuildForeignKeys(connect_mysql, statements):
+    for table, statement in statements.items():
+        try:
+            elapsed = RunDDL(connect_mysql, statement)
+        except Exception as e:
+            print(f"Error: adding foreign keys on `{table}` failed: {e}")
+            sys.exit(1)
+        print(f"Added {statement.count('ADD CONSTRAINT')} foreign key(s) on `{table}` in {elapsed:.2f}s")
+
+
+def MigrateIndexesAndKeys(sqlite_conn, mysql_conn, connect_mysql, tables, workers=DEFAULT_INDEX_WORKERS):
+    """Add secondary indexes, then foreign keys, for tables whose data is already loaded."""
+    indexes = {}
+    for table in tables:
+        statement = IndexStatements(sqlite_conn, mysql_conn, table)
+        if statement:
+            indexes[table] = statement
+    BuildIndexes(connect_mysql, indexes, workers)
+
+    foreign_keys = {}
+    for table in tables:
+        statement = ForeignKeyStatement(sqlite_conn, mysql_conn, table, tables)
+        if statement:
+            foreign_keys[table] = statement
+    BuildForeignKeys(connect_mysql, foreign_keys)
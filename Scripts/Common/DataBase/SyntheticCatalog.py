@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# File: SyntheticCatalog.py
+# Path: Scripts/DataBase/SyntheticCatalog.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:55PM
+
+"""
+SyntheticCatalog.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Generates OurLibrary.db-shaped SQLite databases (Categories, Subjects and
+Books with thumbnail BLOBs, the same tables, indexes and foreign keys) at a
+configurable scale factor for benchmarking the DataBase tools. Scale 1.0 is
+10,000 books; thumbnails are random bytes behind a PNG header with sizes
+spread around --thumbnail-kb. A small share of rows carries the values that
+stress migrators and dump writers: missing thumbnails and authors, quotes,
+backslashes, tabs, newlines and non-ASCII titles. Output is deterministic
+for a given --seed. Scripts/LoadTestServer.py builds its catalogs here too.
+
+Author: Himalaya Project
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+
+BOOKS_PER_SCALE = 10000
+DEFAULT_CATEGORIES = 26
+DEFAULT_SUBJECTS_PER_CATEGORY = 8
+DEFAULT_THUMBNAIL_BYTES = 12000
+AWKWARD_SHARE = 0.02
+MISSING_THUMBNAIL_SHARE = 0.05
+
+CATALOG_SCHEMA = """
+    CREATE TABLE Categories ( ID INTEGER PRIMARY KEY, Category TEXT NOT NULL UNIQUE );
+    CREATE TABLE Subjects ( ID INTEGER PRIMARY KEY, Category_ID INTEGER, Subject TEXT NOT NULL,
+        UNIQUE(Category_ID, Subject), FOREIGN KEY(Category_ID) REFERENCES Categories(ID) );
+    CREATE TABLE Books ( ID INTEGER PRIMARY KEY, Title TEXT NOT NULL, Category_ID INTEGER,
+        Subject_ID INTEGER, Author TEXT, Filename TEXT, Thumbnail BLOB, Rating INTEGER DEFAULT 0,
+        FileSize INTEGER, PageCount INTEGER, DateAdded TEXT, GoogleDriveID TEXT,
+        FOREIGN KEY(Category_ID) REFERENCES Categories(ID), FOREIGN KEY(Subject_ID) REFERENCES Subjects(ID) );
+    CREATE INDEX IDX_Books_Category_Subject_Title ON Books (Category_ID, Subject_ID, Title);
+    CREATE INDEX IDX_Books_Category_Title ON Books (Category_ID, Title);
+    CREATE INDEX IDX_Books_Title ON Books (Title);
+    CREATE INDEX IDX_Categories_Category ON Categories (Category);
+    CREATE INDEX IDX_Subjects_Category_Subject ON Subjects (Category_ID, Subject);
+"""
+
+TITLE_WORDS = ["History", "Mathematics", "Science", "Guide", "Introduction", "Art", "World", "Physics",
+               "Chemistry", "Principles", "Advanced", "Modern", "Applied", "Theory", "Practice", "Handbook"]
+AWKWARD_TITLES = ["O'Brien's \"Quoted\" Notes", "Back\\slash\\Path", "Tab\tSeparated", "Line one\nLine two",
+                  "Café Señor Ünïcödé", "数学入门", "Ελληνικά", "Emoji 📚"]
+PNG_HEADER = b"\x89PNG\r\n\x1a\n"
+
+
+def BookRows(rng, books, subjects, thumbnail_bytes, awkward_share=AWKWARD_SHARE,
+             missing_thumbnail_share=MISSING_THUMBNAIL_SHARE):
+    for book_id in range(1, books + 1):
+        subject_id, category_id = rng.choice(subjects)
+        awkward = rng.random() < awkward_share
+        title = " ".join(rng.choice(TITLE_WORDS) for _ in range(rng.randint(2, 5))) + f" {book_id}"
+        if awkward:
+            title = f"{rng.choice(AWKWARD_TITLES)} {book_id}"
+        thumbnail = None
+        if rng.random() >= missing_thumbnail_share:
+            size = max(64, int(rng.gauss(thumbnail_bytes, thumbnail_bytes / 4)))
+            thumbnail = PNG_HEADER + rng.randbytes(size)
+        author = None if awkward and rng.random() < 0.5 else f"Author {rng.randint(1, books // 5 + 1)}"
+        added = f"20{rng.randint(15, 25)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        drive_id = "".join(rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_")
+                           for _ in range(33)) if rng.random() < 0.8 else None
+        yield (book_id, title, category_id, subject_id, author, f"book_{book_id}.pdf", thumbnail,
+               rng.randint(0, 5), rng.randint(10 ** 5, 10 ** 8), rng.randint(20, 900), added, drive_id)
+
+
+def GenerateCatalog(path, scale=1.0, categories=DEFAULT_CATEGORIES,
+                    subjects_per_category=DEFAULT_SUBJECTS_PER_CATEGORY,
+                    thumbnail_bytes=DEFAULT_THUMBNAIL_BYTES, seed=1, awkward_share=AWKWARD_SHARE,
+                    missing_thumbnail_share=MISSING_THUMBNAIL_SHARE):
+    """Write a synthetic catalog to `path` (replacing it); returns the number of books."""
+    if os.path.exists(path):
+        os.remove(path)
+    rng = random.Random(seed)
+    books = max(1, round(BOOKS_PER_SCALE * scale))
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF;")
+    conn.execute("PRAGMA synchronous = OFF;")
+    conn.executescript(CATALOG_SCHEMA)
+    conn.executemany("INSERT INTO Categories VALUES (?, ?)",
+                     [(c, f"Category {c:02d}") for c in range(1, categories + 1)])
+    subject_rows = [((c - 1) * subjects_per_category + s, c, f"Subject {c:02d}.{s}")
+                    for c in range(1, categories + 1) for s in range(1, subjects_per_category + 1)]
+    conn.executemany("INSERT INTO Subjects VALUES (?, ?, ?)", subject_rows)
+    subjects = [(row[0], row[1]) for row in subject_rows]
+    conn.executemany("INSERT INTO Books VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                     BookRows(rng, books, subjects, thumbnail_bytes, awkward_share, missing_thumbnail_share))
+    conn.commit()
+    conn.execute("ANALYZE;")
+    conn.close()
+    return books
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic OurLibrary-shaped SQLite catalog")
+    parser.add_argument("output_db", help="Path of the SQLite file to create (replaced if it exists)")
+    parser.add_argument("--scale", type=float, default=1.0, help=f"Scale factor ({BOOKS_PER_SCALE:,} books per 1.0)")
+    parser.add_argument("--categories", type=int, default=DEFAULT_CATEGORIES, help="Number of categories")
+    parser.add_argument("--subjects-per-category", type=int, default=DEFAULT_SUBJECTS_PER_CATEGORY,
+                        help="Subjects in each category")
+    parser.add_argument("--thumbnail-kb", type=float, default=DEFAULT_THUMBNAIL_BYTES / 1000,
+                        help="Mean thumbnail size in KB")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed")
+    args = parser.parse_args()
+
+    if args.scale <= 0:
+        print("Error: --scale must be positive.")
+        sys.exit(1)
+    started = time.perf_counter()
+    books = GenerateCatalog(args.output_db, args.scale, args.categories, args.subjects_per_category,
+                            int(args.thumbnail_kb * 1000), args.seed)
+    print(f"Wrote {books:,} books to {args.output_db} ({os.path.getsize(args.output_db) / 1024 / 1024:.1f} MB) "
+          f"in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# File: TypeInference.py
+# Path: Scripts/DataBase/TypeInference.py
+# Standard: AIDEV-PascalCase-2.1
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  05:10PM
+
+"""
+TypeInference.py
+Standard: AIDEV-PascalCase-2.1
+
+Purpose:
+Data-driven MySQL column types for the SQLite to MySQL migrators. SQLite
+columns carry whatever values were stored in them, so the declared type is a
+poor guide: a TEXT column may hold 20-character codes or 2 MB of text, and a
+NUMERIC column may hold money amounts that FLOAT would round.
+
+Each table is profiled in two passes:
+- one aggregate query computes, exactly, the storage classes present, NULL
+  counts, integer ranges and maximum text/BLOB lengths for every column;
+- one row scan (every row, or a reservoir sample of --sample-rows rows)
+  checks the value patterns that need Python: ISO dates/datetimes and the
+  decimal scale of real numbers.
+
+The narrowest type that holds every observed value is chosen: INT/BIGINT,
+DECIMAL(p,s) or DOUBLE, DATE/DATETIME, VARCHAR(n) (with headroom),
+TEXT/MEDIUMTEXT/LONGTEXT and BLOB/MEDIUMBLOB/LONGBLOB. If a table's VARCHAR
+columns would exceed MySQL's 65,535-byte row limit, the widest are moved to
+TEXT. Integer columns joined by a foreign key are then widened to the wider
+of the pair, since MySQL only accepts a foreign key between columns of the
+same size and sign. The resulting plan is printed and saved as JSON so it can be reviewed
+(and edited) before the migration uses it.
+
+Author: Himalaya Project
+"""
+
+import json
+import os
+import random
+import re
+from datetime import date, datetime
+
+DEFAULT_SAMPLE_ROWS = 0  # 0 = check every row
+VARCHAR_HEADROOM = 16
+MAX_VARCHAR_CHARS = 16383  # 65,535 bytes at 4 bytes per utf8mb4 character
+MAX_ROW_BYTES = 65535
+TEXT_LIMITS = [(65535, "TEXT"), (16777215, "MEDIUMTEXT")]
+BLOB_LIMITS = [(65535, "BLOB"), (16777215, "MEDIUMBLOB")]
+INT_RANGE = (-2 ** 31, 2 ** 31 - 1)
+INTEGER_WIDTHS = ["INT", "BIGINT"]  # narrowest first
+MAX_DECIMAL_PRECISION = 65
+MAX_DECIMAL_SCALE = 30
+
+# Declared SQLite type -> MySQL type, used when a column has no values to profile
+TYPE_MAP = {
+    "INTEGER": "INT",
+    "TEXT": "VARCHAR(255)",
+    "REAL": "FLOAT",
+    "BLOB": "LONGBLOB",
+    "NUMERIC": "FLOAT"
+}
+
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+DATETIME_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}(:\d{2}(\.\d{1,6})?)?$")
+
+
+def ListColumns(sqlite_conn, table):
+    return [(row[1], (row[2] or "").upper()) for row in sqlite_conn.execute(f"PRAGMA table_info(`{table}`);")]
+
+
+def AggregateProfile(sqlite_conn, table, columns):
+    """Exact per-column statistics from one aggregate query."""
+    parts = []
+    for name, _ in columns:
+        c = f"`{name}`"
+        parts += [f"SUM(typeof({c}) = 'integer')", f"SUM(typeof({c}) = 'real')",
+                  f"SUM(typeof({c}) = 'text')", f"SUM(typeof({c}) = 'blob')", f"SUM({c} IS NULL)",
+                  f"MIN(CASE WHEN typeof({c}) = 'integer' THEN {c} END)",
+                  f"MAX(CASE WHEN typeof({c}) = 'integer' THEN {c} END)",
+                  f"MAX(CASE WHEN typeof({c}) = 'text' THEN LENGTH({c}) END)",
+                  f"MAX(CASE WHEN typeof({c}) = 'blob' THEN LENGTH({c}) END)"]
+    row = sqlite_conn.execute(f"SELECT COUNT(*), {', '.join(parts)} FROM `{table}`;").fetchone()
+    total = row[0]
+    profiles = {}
+    for n, (name, declared) in enumerate(columns):
+        v = row[1 + n * 9:1 + (n + 1) * 9]
+        profiles[name] = {
+            "declared": declared, "rows": total,
+            "integer": v[0] or 0, "real": v[1] or 0, "text": v[2] or 0, "blob": v[3] or 0, "null": v[4] or 0,
+            "min_int": v[5], "max_int": v[6], "max_text_chars": v[7] or 0, "max_blob_bytes": v[8] or 0,
+            "sampled": 0, "dates": 0, "datetimes": 0, "fraction_seconds": 0,
+            "max_int_digits": 0, "max_scale": 0, "inexact_reals": 0,
+        }
+    return profiles
+
+
+def SampleRows(cursor, sample_rows, rng):
+    """Every row when sample_rows is 0, otherwise a uniform reservoir sample (Algorithm R)."""
+    if not sample_rows:
+        yield from cursor
+        return
+    reservoir = []
+    for seen, row in enumerate(cursor):
+        if seen < sample_rows:
+            reservoir.append(row)
+        else:
+            slot = rng.randint(0, seen)
+            if slot < sample_rows:
+                reservoir[slot] = row
+    yield from reservoir
+
+
+def IsIsoDate(value):
+    try:
+        date.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def IsIsoDatetime(value):
+    try:
+        datetime.fromisoformat(value)
+        return True
+    except ValueError:
+        return False
+
+
+def DecimalShape(value):
+    """(integer digits, scale) of a number, or None if its repr is not plain decimal."""
+    text = repr(value) if isinstance(value, float) else str(value)
+    if "e" in text or "E" in text or "inf" in text or "nan" in text:
+        return None
+    text = text.lstrip("-")
+    whole, _, fraction = text.partition(".")
+    fraction = fraction.rstrip("0")
+    return len(whole.lstrip("0")) or 1, len(fraction)
+
+
+def PatternProfile(sqlite_conn, table, profiles, sample_rows, rng):
+    """Scan rows (or a sample) for date/datetime text and decimal scale."""
+    checked = [name for name, p in profiles.items() if p["text"] or p["real"] or "NUMERIC" in p["declared"]
+               or "DEC" in p["declared"]]
+    if not checked:
+        return
+    cursor = sqlite_conn.execute(f"SELECT {', '.join(f'`{c}`' for c in checked)} FROM `{table}`;")
+    for row in SampleRows(cursor, sample_rows, rng):
+        for name, value in zip(checked, row):
+            p = profiles[name]
+            if value is None:
+                continue
+            p["sampled"] += 1
+            if isinstance(value, str):
+                if DATE_PATTERN.match(value) and IsIsoDate(value):
+                    p["dates"] += 1
+                elif DATETIME_PATTERN.match(value) and IsIsoDatetime(value):
+                    p["datetimes"] += 1
+                    if "." in value:
+                        p["fraction_seconds"] += 1
+            elif isinstance(value, (int, float)):
+                shape = DecimalShape(value)
+                if shape is None:
+                    p["inexact_reals"] += 1
+                else:
+                    p["max_int_digits"] = max(p["max_int_digits"], shape[0])
+                    p["max_scale"] = max(p["max_scale"], shape[1])
+
+
+def SizedType(length, limits, largest):
+    for limit, name in limits:
+        if length <= limit:
+            return name
+    return largest
+
+
+def InferType(profile):
+    """(MySQL type, reason) for one column profile."""
+    p = profile
+    non_null = p["rows"] - p["null"]
+    if non_null == 0:
+        # Nothing to infer from (all NULL or an empty table): keep the declared type, so
+        # key and foreign-key columns still match the columns they pair with
+        return TYPE_MAP.get(p["declared"], "VARCHAR(255)"), "no values; declared type"
+    if p["blob"]:
+        return SizedType(p["max_blob_bytes"], BLOB_LIMITS, "LONGBLOB"), f"BLOB values up to {p['max_blob_bytes']} bytes"
+    if p["text"] and (p["integer"] or p["real"]):
+        chars = max(p["max_text_chars"], 24)
+        return VarcharOrText(chars), "mixed text and numbers"
+    if p["text"]:
+        sampled_text = p["sampled"]
+        if sampled_text and p["dates"] == sampled_text:
+            return "DATE", "ISO dates"
+        if sampled_text and p["dates"] + p["datetimes"] == sampled_text:
+            return ("DATETIME(6)" if p["fraction_seconds"] else "DATETIME"), "ISO datetimes"
+        return VarcharOrText(p["max_text_chars"]), f"text up to {p['max_text_chars']} chars"
+    if p["real"] == 0:
+        low, high = p["min_int"], p["max_int"]
+        if INT_RANGE[0] <= low and high <= INT_RANGE[1]:
+            return "INT", f"integers {low}..{high}"
+        return "BIGINT", f"integers {low}..{high}"
+    exact_declared = "NUMERIC" in p["declared"] or "DEC" in p["declared"]
+    if exact_declared and not p["inexact_reals"]:
+        scale = min(p["max_scale"], MAX_DECIMAL_SCALE)
+        precision = p["max_int_digits"] + scale
+        if precision <= MAX_DECIMAL_PRECISION:
+            return f"DECIMAL({max(precision, 1)},{scale})", f"exact numbers, scale {scale}"
+    return "DOUBLE", "floating point values"
+
+
+def VarcharOrText(chars):
+    if chars <= MAX_VARCHAR_CHARS - VARCHAR_HEADROOM:
+        size = max(VARCHAR_HEADROOM, -(-chars // VARCHAR_HEADROOM) * VARCHAR_HEADROOM)
+        return f"VARCHAR({size})"
+    return SizedType(chars * 4, TEXT_LIMITS, "LONGTEXT")
+
+
+def VarcharBytes(mysql_type):
+    match = re.match(r"VARCHAR\((\d+)\)", mysql_type)
+    return int(match.group(1)) * 4 + 2 if match else 0
+
+
+def FitRowSize(columns):
+    """Move the widest VARCHARs to TEXT until the table fits MySQL's row size limit."""
+    while sum(VarcharBytes(c["type"]) for c in columns.values()) > MAX_ROW_BYTES:
+        name = max(columns, key=lambda n: VarcharBytes(columns[n]["type"]))
+        columns[name]["type"] = "TEXT"
+        columns[name]["reason"] += "; moved to TEXT to fit the row size limit"
+
+
+def ForeignKeyPairs(sqlite_conn, table):
+    """(child column, parent table, parent column) for every foreign key column of `table`."""
+    pairs = []
+    rows = sqlite_conn.execute(f"PRAGMA foreign_key_list(`{table}`);").fetchall()
+    for key_id in sorted({row[0] for row in rows}):
+        key = [row for row in rows if row[0] == key_id]
+        parent = key[0][2]
+        parent_columns = [row[4] for row in key]
+        if None in parent_columns:
+            # REFERENCES parent without a column list means the parent's primary key
+            info = sqlite_conn.execute(f"PRAGMA table_info(`{parent}`);").fetchall()
+            parent_columns = [r[1] for r in sorted((r for r in info if r[5]), key=lambda r: r[5])]
+        pairs += [(row[3], parent, column) for row, column in zip(key, parent_columns)]
+    return pairs
+
+
+def MatchForeignKeyTypes(sqlite_conn, plan):
+    """Give both ends of each integer foreign key the wider type of the two."""
+    pairs = []
+    for table in plan:
+        for child, parent, parent_column in ForeignKeyPairs(sqlite_conn, table):
+            if child in plan[table] and parent_column in plan.get(parent, {}):
+                pairs.append(((table, child), (parent, parent_column)))
+    changed = True
+    while changed:  # until stable, for columns that are both a parent and a child
+        changed = False
+        for ends in pairs:
+            entries = [plan[t][c] for t, c in ends]
+            if not all(e["type"] in INTEGER_WIDTHS for e in entries):
+                continue
+            wider = max((e["type"] for e in entries), key=INTEGER_WIDTHS.index)
+            for (t, c), entry in zip(ends, entries):
+                if entry["type"] != wider:
+                    other_table, other_column = ends[1] if (t, c) == ends[0] else ends[0]
+                    entry["type"] = wider
+                    entry["reason"] += f"; widened to match foreign key `{other_table}`.`{other_column}`"
+                    changed = True
+
+
+def BuildTypePlan(sqlite_conn, tables, sample_rows=DEFAULT_SAMPLE_ROWS, seed=0):
+    rng = random.Random(seed)
+    plan = {}
+    for table in tables:
+        columns = ListColumns(sqlite_conn, table)
+        if not columns:
+            continue
+        profiles = AggregateProfile(sqlite_conn, table, columns)
+        PatternProfile(sqlite_conn, table, profiles, sample_rows, rng)
+        plan[table] = {}
+        for name, profile in profiles.items():
+            mysql_type, reason = InferType(profile)
+            plan[table][name] = {"declared": profile["declared"], "type": mysql_type, "reason": reason,
+                                 "nulls": profile["null"], "checked": profile["sampled"]}
+        FitRowSize(plan[table])
+    MatchForeignKeyTypes(sqlite_conn, plan)
+    return plan
+
+
+def PrintTypePlan(plan):
+    print(f"{'table.column':<40} {'SQLite':<10} {'MySQL':<16} reason")
+    for table, columns in plan.items():
+        for name, c in columns.items():
+            print(f"{table + '.' + name:<40} {c['declared'] or '-':<10} {c['type']:<16} {c['reason']}")
+
+
+def SaveTypePlan(plan, path):
+    with open(path, "w") as f:
+        json.dump(plan, f, indent=2)
+
+
+def LoadTypePlan(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        return json.load(f)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# File: LoadTestServer.py
+# Path: Scripts/LoadTestServer.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:55PM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: asyncio HTTP load generator for launch_server.py.
+
+By default it builds a synthetic OurLibrary.db in a scratch directory,
+starts launch_server.py against it on a free port, and drives these
+scenarios with concurrent virtual users:
+
+    landing      landing page, web-shim.js and the full database download
+    search       bursts of title/author searches
+    scrolling    category list, then paging through a category's books
+    thumbnails   a page of books followed by all of its thumbnails
+
+Each scenario reports throughput, latency percentiles and error rate. The
+results are written as JSON (default Data/Benchmarks/) so runs for different
+releases can be compared with --compare.
+
+Use --url to target an already running server instead of a synthetic one.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (expects launch_server.py and the pages in the current directory)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+from datetime import datetime
+
+# The synthetic catalog generator is shared with the DataBase tools benchmarks
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), "Common", "DataBase"))
+from SyntheticCatalog import GenerateCatalog, BOOKS_PER_SCALE  # noqa: E402
+
+SERVED_FILES = ["index.html", "new-desktop-library.html", "setup-consent.html", "web-shim.js", "ProjectHimalayaBanner.png"]
+BROWSER_CONNECTIONS_PER_HOST = 6
+SEARCH_WORDS = ["history", "math", "science", "guide", "introduction", "art", "world", "physics", "a", "the"]
+
+
+def FreePort():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def StartSyntheticServer(work_dir, books, mode):
+    os.makedirs(os.path.join(work_dir, "Config"))
+    os.makedirs(os.path.join(work_dir, "Data", "Databases"))
+    for name in SERVED_FILES:
+        if os.path.exists(name):
+            shutil.copy(name, work_dir)
+    shutil.copy("Config/ourlibrary_google_config.json", os.path.join(work_dir, "Config"))
+
+    with open("Config/ourlibrary_config.json", "r") as f:
+        config = json.load(f)
+    config["database_serving_mode"] = mode
+    with open(os.path.join(work_dir, "Config", "ourlibrary_config.json"), "w") as f:
+        json.dump(config, f, indent=2)
+
+    db_path = os.path.join(work_dir, config.get("local_database_path", "Data/Databases/OurLibrary.db"))
+    print(f"Generating synthetic catalog with {books} books...")
+    # Every book gets a thumbnail so the image grid's 404s never count as server errors
+    GenerateCatalog(db_path, books / BOOKS_PER_SCALE, missing_thumbnail_share=0.0)
+
+    port = FreePort()
+    process = subprocess.Popen(
+        [sys.executable, os.path.abspath("launch_server.py"), "--port", str(port), "--no-browser"],
+        cwd=work_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(base_url + "/api/status", timeout=1).read()
+            return process, base_url, os.path.getsize(db_path)
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("launch_server.py did not become ready")
+
+
+# -- HTTP client ----------------------------------------------------------
+
+class Recorder:
+    def __init__(self, timeout):
+        self.timeout = timeout
+        self.latencies = []
+        self.errors = 0
+        self.timeouts = 0
+        self.bytes = 0
+
+    async def Fetch(self, host, port, path):
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("ascii"))
+            await writer.drain()
+            status_line = await reader.readline()
+            size = 0
+            while True:
+                chunk = await reader.read(65536)
+                if not chunk:
+                    break
+                size += len(chunk)
+        finally:
+            writer.close()
+        return int(status_line.split()[1]), size
+
+    async def Get(self, host, port, path):
+        start = time.perf_counter()
+        try:
+            status, size = await asyncio.wait_for(self.Fetch(host, port, path), self.timeout)
+        except asyncio.TimeoutError:
+            self.errors += 1
+            self.timeouts += 1
+            return None
+        except (OSError, ValueError, IndexError):
+            self.errors += 1
+            return None
+        self.latencies.append(time.perf_counter() - start)
+        self.bytes += size
+        if status >= 400:
+            self.errors += 1
+        return status
+
+
+class Client:
+    def __init__(self, base_url, recorder):
+        parsed = urllib.parse.urlsplit(base_url)
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.recorder = recorder
+
+    async def Get(self, path, **query):
+        if query:
+            path += "?" + urllib.parse.urlencode(query)
+        return await self.recorder.Get(self.host, self.port, path)
+
+
+# -- scenarios ------------------------------------------------------------
+
+async def LandingScenario(client, catalog, rng):
+    await client.Get("/new-desktop-library.html")
+    await client.Get("/web-shim.js")
+    await client.Get("/Config/ourlibrary_google_config.json")
+    await client.Get("/Data/Databases/OurLibrary.db")
+
+
+async def SearchScenario(client, catalog, rng):
+    for _ in range(rng.randint(3, 8)):
+        field = rng.choice(["title", "author", "any"])
+        term = rng.choice(SEARCH_WORDS) if field != "author" else f"Author {rng.randint(1, 50)}"
+        await client.Get("/api/search", q=term, field=field)
+
+
+async def ScrollingScenario(client, catalog, rng):
+    await client.Get("/api/categories")
+    category_id = rng.choice(catalog["categories"])
+    await client.Get("/api/subjects", category_id=category_id)
+    for page in range(rng.randint(2, 6)):
+        await client.Get("/api/books", category_id=category_id, limit=100, offset=page * 100)
+
+
+async def ThumbnailScenario(client, catalog, rng):
+    category_id = rng.choice(catalog["categories"])
+    await client.Get("/api/books", category_id=category_id, limit=50)
+    ids = rng.sample(catalog["books"], min(50, len(catalog["books"])))
+    # Browsers fetch a grid of images over a handful of parallel connections
+    slots = asyncio.Semaphore(BROWSER_CONNECTIONS_PER_HOST)
+
+    async def Fetch(book_id):
+        async with slots:
+            await client.Get("/api/thumbnail", id=book_id)
+
+    await asyncio.gather(*(Fetch(book_id) for book_id in ids))
+
+
+SCENARIOS = {
+    "landing": LandingScenario,
+    "search": SearchScenario,
+    "scrolling": ScrollingScenario,
+    "thumbnails": ThumbnailScenario,
+}
+
+
+def Percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def RunScenario(name, base_url, catalog, users, duration, seed, timeout):
+    recorder = Recorder(timeout)
+    scenario = SCENARIOS[name]
+    deadline = time.perf_counter() + duration
+
+    async def VirtualUser(user):
+        rng = random.Random(seed + user)
+        client = Client(base_url, recorder)
+        while time.perf_counter() < deadline:
+            await scenario(client, catalog, rng)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(VirtualUser(u) for u in range(users)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(recorder.latencies)
+    requests = len(latencies) + recorder.errors
+    return {
+        "users": users,
+        "duration_s": round(elapsed, 3),
+        "requests": requests,
+        "errors": recorder.errors,
+        "timeouts": recorder.timeouts,
+        "error_rate": round(recorder.errors / requests, 4) if requests else 0.0,
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "throughput_mb_s": round(recorder.bytes / elapsed / 1024 / 1024, 2) if elapsed else 0.0,
+        "latency_ms": {
+            "p50": round(Percentile(latencies, 0.50) * 1000, 2),
+            "p90": round(Percentile(latencies, 0.90) * 1000, 2),
+            "p95": round(Percentile(latencies, 0.95) * 1000, 2),
+            "p99": round(Percentile(latencies, 0.99) * 1000, 2),
+            "max": round((latencies[-1] if latencies else 0.0) * 1000, 2),
+        },
+    }
+
+
+def LoadCatalogIds(base_url):
+    def Fetch(path):
+        with urllib.request.urlopen(base_url + path, timeout=10) as response:
+            return json.load(response)
+    categories = [c["ID"] for c in Fetch("/api/categories")] or [1]
+    books = []
+    for category_id in categories[:10]:
+        books += [b["ID"] for b in Fetch(f"/api/books?category_id={category_id}&limit=100")]
+    return {"categories": categories, "books": books or [1]}
+
+
+def PrintResults(results, baseline=None):
+    print(f"\n{'scenario':<12} {'req/s':>9} {'MB/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'errors':>8}")
+    for name, r in results["scenarios"].items():
+        line = (f"{name:<12} {r['throughput_rps']:>9.1f} {r['throughput_mb_s']:>8.2f} "
+                f"{r['latency_ms']['p50']:>8.2f} {r['latency_ms']['p95']:>8.2f} {r['latency_ms']['p99']:>8.2f} "
+                f"{r['error_rate']:>8.2%}")
+        prior = (baseline or {}).get("scenarios", {}).get(name)
+        if prior and prior["throughput_rps"]:
+            change = (r["throughput_rps"] - prior["throughput_rps"]) / prior["throughput_rps"]
+            line += f"   ({change:+.1%} req/s vs baseline)"
+        print(line)
+
+
+async def Main(args):
+    process = None
+    work_dir = None
+    results = {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "label": args.label,
+        "settings": {"users": args.users, "duration_s": args.duration, "seed": args.seed, "timeout_s": args.timeout},
+        "scenarios": {},
+    }
+    try:
+        if args.url:
+            base_url = args.url.rstrip("/")
+            results["target"] = {"url": base_url}
+        else:
+            work_dir = tempfile.mkdtemp(prefix="ourlibrary-loadtest-")
+            process, base_url, db_size = StartSyntheticServer(work_dir, args.books, args.mode)
+            results["target"] = {"synthetic_books": args.books, "database_bytes": db_size, "mode": args.mode}
+
+        catalog = LoadCatalogIds(base_url)
+        for name in args.scenarios:
+            print(f"Running scenario '{name}' with {args.users} users for {args.duration}s...")
+            results["scenarios"][name] = await RunScenario(
+                name, base_url, catalog, args.users, args.duration, args.seed, args.timeout)
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+        if work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as f:
+            baseline = json.load(f)
+    PrintResults(results, baseline)
+
+    output = args.output or os.path.join(
+        "Data", "Benchmarks", f"LoadTest-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test launch_server.py with concurrent virtual users")
+    parser.add_argument("--url", help="Target an already running server instead of a synthetic one")
+    parser.add_argument("--books", type=int, default=5000, help="Books in the synthetic catalog")
+    parser.add_argument("--mode", choices=["file", "memory"], default="file", help="database_serving_mode for the synthetic server")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent virtual users per scenario")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run each scenario")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout in seconds (counted as an error)")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for reproducible request mixes")
+    parser.add_argument("--label", default="", help="Free-form label stored in the results (e.g. a release tag)")
+    parser.add_argument("--output", help="Results JSON path (default Data/Benchmarks/LoadTest-<timestamp>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to compare throughput against")
+    args = parser.parse_args()
+
+    if not args.url and not os.path.exists("launch_server.py"):
+        print("Error: launch_server.py not found. Run from the OurLibrary project root or pass --url.")
+        sys.exit(1)
+
+    asyncio.run(Main(args))
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# File: OptimizeCatalogDatabase.py
+# Path: Scripts/OptimizeCatalogDatabase.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:10PM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: Maintenance tool for the catalog database (OurLibrary.db).
+
+Without --output it only reports:
+
+    layout       page size, page count, free pages, whether ANALYZE has run
+    page usage   pages, bytes, overflow pages, fill and fragmentation (share
+                 of leaf pages stored before their predecessor on disk) per
+                 table and index, from the dbstat virtual table
+    indexes      indexes the app's queries need but the file lacks, and
+                 indexes made redundant by another index
+    latency      median/p95 of every query new-desktop-library.html and
+                 main.js issue, with its query plan
+
+With --output it writes an optimized copy: VACUUM INTO with --page-size
+(defragmented, no free pages), the recommended indexes created, redundant
+ones dropped (unless --keep-redundant), ANALYZE, and a quick_check. The
+copy is built as <output>.partial and renamed when complete; the source is
+never modified. The workload is then measured again and before/after
+latencies are printed side by side.
+
+The recommended indexes carry the columns the queries filter and sort on,
+so a LIKE search is evaluated on index entries in result order and only
+the matching rows (with their Thumbnail) are read from the table.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (paths are relative to the OurLibrary project root)
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import time
+from datetime import datetime
+
+DEFAULT_DB = "Data/Databases/OurLibrary.db"
+DEFAULT_PAGE_SIZE = 8192
+DEFAULT_ITERATIONS = 30
+SEARCH_WORDS = ["history", "math", "science", "guide", "introduction", "art", "world", "physics", "a", "the"]
+BOOK_CARD_COLUMNS = "ID, Title, Author, Category_ID, Filename, Thumbnail"
+
+# Every query the desktop app issues (main.js and new-desktop-library.html)
+WORKLOAD = {
+    "book_count": ("SELECT COUNT(*) AS n FROM Books",
+                   lambda ids, rng: ()),
+    "search_title_or_author": (f"SELECT {BOOK_CARD_COLUMNS} FROM Books WHERE Title LIKE ? OR Author LIKE ? "
+                               "ORDER BY Title LIMIT 200",
+                               lambda ids, rng: (f"%{rng.choice(SEARCH_WORDS)}%",) * 2),
+    "search_title": (f"SELECT {BOOK_CARD_COLUMNS} FROM Books WHERE Title LIKE ? ORDER BY Title LIMIT 200",
+                     lambda ids, rng: (f"%{rng.choice(SEARCH_WORDS)}%",)),
+    "search_author": (f"SELECT {BOOK_CARD_COLUMNS} FROM Books WHERE Author LIKE ? ORDER BY Author, Title LIMIT 200",
+                      lambda ids, rng: (f"%{rng.choice(SEARCH_WORDS)}%",)),
+    "book_detail": ("SELECT * FROM Books WHERE ID = ?",
+                    lambda ids, rng: (rng.choice(ids["books"]),)),
+    "categories": ("SELECT ID, Category FROM Categories ORDER BY Category",
+                   lambda ids, rng: ()),
+    "subjects": ("SELECT ID, Subject FROM Subjects WHERE Category_ID = ? ORDER BY Subject",
+                 lambda ids, rng: (rng.choice(ids["categories"]),)),
+    "all_books": ("SELECT * FROM Books ORDER BY Title LIMIT 100",
+                  lambda ids, rng: ()),
+    "category_books": ("SELECT * FROM Books WHERE Category_ID = ? ORDER BY Title LIMIT 100",
+                       lambda ids, rng: (rng.choice(ids["categories"]),)),
+    "subject_books": ("SELECT * FROM Books WHERE Category_ID = ? AND Subject_ID = ? ORDER BY Title LIMIT 100",
+                      lambda ids, rng: rng.choice(ids["subjects"])),
+}
+
+# (name, table, columns, queries served)
+RECOMMENDED_INDEXES = [
+    ("IDX_Books_Title_Author", "Books", ["Title", "Author"], "search_title, search_title_or_author, all_books"),
+    ("IDX_Books_Author_Title", "Books", ["Author", "Title"], "search_author"),
+    ("IDX_Books_Category_Title", "Books", ["Category_ID", "Title"], "category_books"),
+    ("IDX_Books_Category_Subject_Title", "Books", ["Category_ID", "Subject_ID", "Title"], "subject_books"),
+    ("IDX_Subjects_Category_Subject", "Subjects", ["Category_ID", "Subject"], "subjects"),
+    ("IDX_Categories_Category", "Categories", ["Category"], "categories"),
+]
+
+
+def OpenReadOnly(path):
+    return sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+
+
+def DatabaseLayout(conn):
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1';").fetchone() is not None
+    return {
+        "page_size": conn.execute("PRAGMA page_size;").fetchone()[0],
+        "page_count": conn.execute("PRAGMA page_count;").fetchone()[0],
+        "freelist_count": conn.execute("PRAGMA freelist_count;").fetchone()[0],
+        "analyzed": has_stats,
+    }
+
+
+def PageUsage(conn):
+    """Per table/index page statistics from dbstat, or None if SQLite was built without it."""
+    try:
+        rows = conn.execute("SELECT name, pageno, pagetype, pgsize, payload, unused FROM dbstat;").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    usage = {}
+    for name, pageno, pagetype, pgsize, payload, unused in rows:
+        entry = usage.setdefault(name, {"pages": 0, "bytes": 0, "payload": 0, "unused": 0, "overflow": 0,
+                                        "leaves": 0, "jumps": 0, "last_leaf": None})
+        entry["pages"] += 1
+        entry["bytes"] += pgsize
+        entry["payload"] += payload
+        entry["unused"] += unused
+        if pagetype == "overflow":
+            entry["overflow"] += 1
+        if pagetype == "leaf":
+            # dbstat lists pages in b-tree order; a leaf before its predecessor means a scan seeks backwards
+            if entry["last_leaf"] is not None and pageno < entry["last_leaf"]:
+                entry["jumps"] += 1
+            entry["leaves"] += 1
+            entry["last_leaf"] = pageno
+    for entry in usage.values():
+        entry["fill"] = entry["payload"] / entry["bytes"] if entry["bytes"] else 0.0
+        entry["fragmentation"] = entry["jumps"] / entry["leaves"] if entry["leaves"] > 1 else 0.0
+        del entry["last_leaf"]
+    return usage
+
+
+def ExistingIndexes(conn):
+    """{name: (table, columns, unique)} for every index, including automatic ones."""
+    indexes = {}
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")]
+    for table in tables:
+        for row in conn.execute(f"PRAGMA index_list(`{table}`);").fetchall():
+            name, unique = row[1], row[2]
+            columns = [col[2] for col in conn.execute(f"PRAGMA index_info(`{name}`);")]
+            indexes[name] = (table, columns, bool(unique))
+    return indexes
+
+
+def MissingIndexes(conn, indexes):
+    """Recommended indexes whose columns no existing index leads with."""
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table';")}
+    missing = []
+    for name, table, columns, serves in RECOMMENDED_INDEXES:
+        if table not in tables:
+            continue
+        if not any(t == table and cols[:len(columns)] == columns for t, cols, _ in indexes.values()):
+            missing.append((name, table, columns, serves))
+    return missing
+
+
+def RedundantIndexes(indexes):
+    """Non-unique, explicitly created indexes whose columns lead another index on the same table."""
+    redundant = []
+    for name, (table, columns, unique) in indexes.items():
+        if unique or name.startswith("sqlite_autoindex_"):
+            continue
+        for other, (other_table, other_columns, _) in indexes.items():
+            if other != name and other_table == table and other_columns[:len(columns)] == columns \
+                    and (len(other_columns) > len(columns) or other.startswith("sqlite_autoindex_") or other < name):
+                redundant.append((name, other))
+                break
+    return redundant
+
+
+def SampleIds(conn):
+    return {
+        "books": [r[0] for r in conn.execute("SELECT ID FROM Books;")] or [0],
+        "categories": [r[0] for r in conn.execute("SELECT ID FROM Categories;")] or [0],
+        "subjects": [(r[0], r[1]) for r in conn.execute("SELECT Category_ID, ID FROM Subjects;")] or [(0, 0)],
+    }
+
+
+def MeasureWorkload(path, iterations, seed=1):
+    """Median and p95 milliseconds plus the query plan for every workload query, on a cold connection."""
+    conn = OpenReadOnly(path)
+    ids = SampleIds(conn)
+    results = {}
+    for name, (sql, make_params) in WORKLOAD.items():
+        rng = random.Random(seed)
+        params = make_params(ids, rng)
+        plan = [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+        timings = []
+        for _ in range(iterations):
+            params = make_params(ids, rng)
+            started = time.perf_counter()
+            conn.execute(sql, params).fetchall()
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results[name] = {"median_ms": round(statistics.median(timings), 3),
+                         "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3),
+                         "plan": plan}
+    conn.close()
+    return results
+
+
+def BuildOptimized(source, output, page_size, missing, drop_redundant):
+    partial = output + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+    started = time.perf_counter()
+    source_conn = OpenReadOnly(source)
+    source_conn.execute(f"PRAGMA page_size = {int(page_size)};")
+    source_conn.execute("VACUUM INTO ?;", (partial,))
+    source_conn.close()
+    print(f"VACUUM INTO with page_size {page_size}: {time.perf_counter() - started:.2f}s")
+
+    conn = sqlite3.connect(partial)
+    for name, table, columns, _ in missing:
+        started = time.perf_counter()
+        conn.execute(f"CREATE INDEX `{name}` ON `{table}` ({', '.join(f'`{c}`' for c in columns)});")
+        print(f"Created {name} ON {table}({', '.join(columns)}): {time.perf_counter() - started:.2f}s")
+    dropped = []
+    if drop_redundant:
+        for name, covered_by in RedundantIndexes(ExistingIndexes(conn)):
+            conn.execute(f"DROP INDEX `{name}`;")
+            dropped.append(name)
+            print(f"Dropped {name} (covered by {covered_by})")
+    conn.commit()
+    conn.execute("ANALYZE;")
+    if dropped:
+        # Reclaim the dropped indexes' pages so the shipped file stays compact
+        conn.execute("VACUUM;")
+    check = conn.execute("PRAGMA quick_check;").fetchone()[0]
+    conn.close()
+    if check != "ok":
+        print(f"Error: quick_check failed on the optimized copy: {check} (left at {partial})")
+        sys.exit(1)
+    os.replace(partial, output)
+    return dropped
+
+
+def PrintLayout(label, path, layout):
+    size_mb = os.path.getsize(path) / 1024 / 1024
+    free = layout["freelist_count"] / layout["page_count"] if layout["page_count"] else 0.0
+    print(f"{label}: {path} ({size_mb:.1f} MB)")
+    print(f"  page_size {layout['page_size']}, {layout['page_count']:,} pages, "
+          f"{layout['freelist_count']:,} free ({free:.1%}), ANALYZE {'done' if layout['analyzed'] else 'never run'}")
+
+
+def PrintPageUsage(usage):
+    if usage is None:
+        print("Page usage: unavailable (this SQLite build has no dbstat virtual table)")
+        return
+    print(f"\n{'table / index':<36} {'pages':>9} {'MB':>8} {'overflow':>9} {'fill':>6} {'frag':>6}")
+    for name, entry in sorted(usage.items(), key=lambda item: -item[1]["bytes"]):
+        print(f"{name:<36} {entry['pages']:>9,} {entry['bytes'] / 1024 / 1024:>8.1f} {entry['overflow']:>9,} "
+              f"{entry['fill']:>6.0%} {entry['fragmentation']:>6.0%}")
+
+
+def PrintIndexAdvice(missing, redundant):
+    print()
+    if not missing and not redundant:
+        print("Indexes: nothing to change")
+    for name, table, columns, serves in missing:
+        print(f"Recommend: CREATE INDEX {name} ON {table}({', '.join(columns)})  -- {serves}")
+    for name, covered_by in redundant:
+        print(f"Redundant: {name} (its columns lead {covered_by})")
+
+
+def PrintLatencies(before, after=None):
+    header = f"\n{'query':<24} {'median ms':>10} {'p95 ms':>9}"
+    print(header + (f" {'after med':>10} {'after p95':>10} {'speedup':>8}" if after else "") + "  plan")
+    for name, data in before.items():
+        line = f"{name:<24} {data['median_ms']:>10.2f} {data['p95_ms']:>9.2f}"
+        plan = data["plan"]
+        if after:
+            new = after[name]
+            speedup = data["median_ms"] / new["median_ms"] if new["median_ms"] else 0.0
+            line += f" {new['median_ms']:>10.2f} {new['p95_ms']:>10.2f} {speedup:>7.1f}x"
+            plan = new["plan"]
+        print(f"{line}  {'; '.join(plan)}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Report on and optimize the catalog database layout")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Path to the catalog database")
+    parser.add_argument("--output", help="Write an optimized copy here (the source is never modified)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE,
+                        choices=[1024, 2048, 4096, 8192, 16384, 32768, 65536], help="Page size of the optimized copy")
+    parser.add_argument("--keep-redundant", action="store_true", help="Do not drop redundant indexes in the copy")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Timed runs per workload query")
+    parser.add_argument("--report", help="Also write the report as JSON to this path")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: database '{args.db}' not found.")
+        sys.exit(1)
+    if args.output and os.path.abspath(args.output) == os.path.abspath(args.db):
+        print("Error: --output must differ from --db; replace the file yourself once the copy is checked.")
+        sys.exit(1)
+
+    conn = OpenReadOnly(args.db)
+    layout = DatabaseLayout(conn)
+    usage = PageUsage(conn)
+    indexes = ExistingIndexes(conn)
+    missing = MissingIndexes(conn, indexes)
+    redundant = RedundantIndexes(indexes)
+    conn.close()
+
+    PrintLayout("Source", args.db, layout)
+    PrintPageUsage(usage)
+    PrintIndexAdvice(missing, redundant)
+    before = MeasureWorkload(args.db, args.iterations)
+    report = {"generated": datetime.now().isoformat(timespec="seconds"), "source": args.db, "layout": layout,
+              "page_usage": usage, "missing_indexes": [m[0] for m in missing],
+              "redundant_indexes": [r[0] for r in redundant], "latency_before": before}
+
+    if not args.output:
+        PrintLatencies(before)
+    else:
+        print()
+        dropped = BuildOptimized(args.db, args.output, args.page_size, missing, not args.keep_redundant)
+        after = MeasureWorkload(args.output, args.iterations)
+        output_conn = OpenReadOnly(args.output)
+        output_layout = DatabaseLayout(output_conn)
+        output_conn.close()
+        print()
+        PrintLayout("Optimized", args.output, output_layout)
+        PrintLatencies(before, after)
+        report.update({"output": args.output, "output_layout": output_layout, "dropped_indexes": dropped,
+                       "latency_after": after})
+
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.report}")
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+# File: SplitCatalogThumbnails.py
+# Path: Scripts/SplitCatalogThumbnails.py
+# Standard: AIDEV-PascalCase-2.3
+# Created: 2026-10-19
+# Last Modified: 2026-10-19  11:40PM
+# Symlink Pattern: PROJECT_TOOL
+
+"""
+Description: Moves the thumbnail BLOBs out of the catalog's Books table so
+list and search queries stop walking image overflow pages.
+
+The output copy holds:
+    BookRecords   the Books rows without images, plus ThumbnailHash (sha256
+                  of the image, NULL when the book has none) for cache keys;
+                  the original Books indexes move with it
+    Thumbnails    Book_ID (primary key), Hash, Bytes, Image
+    Books         compatibility view with the original columns in their
+                  original order, so the existing queries run unchanged
+
+The view reads each image through a scalar subquery that SQLite evaluates
+only when a query selects Thumbnail, so text-only queries (and COUNT(*))
+touch BookRecords pages alone, and the ones that do select it fetch images
+only for the rows they return.
+
+With --thumbs-db the Thumbnails table goes to a companion database instead
+and the Books view returns NULL thumbnails, so the downloadable catalog
+carries no images. A client that has the companion file restores them by
+attaching it and running the statement stored under 'attach_view_sql' in
+ThumbnailStore, which creates a TEMP Books view that shadows the main one.
+
+The source file is never modified. Everything is built as .partial files
+and renamed once the image counts and bytes match the source.
+
+Symlink Behavior:
+- Pattern: PROJECT_TOOL (paths are relative to the OurLibrary project root)
+"""
+
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+DEFAULT_DB = "Data/Databases/OurLibrary.db"
+RECORDS_TABLE = "BookRecords"
+THUMBNAILS_TABLE = "Thumbnails"
+STORE_TABLE = "ThumbnailStore"
+COMPANION_SCHEMA = "thumbs"
+
+
+def BooksColumns(conn):
+    if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'Books';").fetchone() is None:
+        return []
+    return [row[1] for row in conn.execute("PRAGMA table_info(Books);")]
+
+
+def BooksViewSql(columns, images_from, temp=False):
+    """Books view over BookRecords; `images_from` is the Thumbnails table to read, or None for NULL images."""
+    # A scalar subquery rather than a join: SQLite only evaluates it when the query reads Thumbnail
+    image = f"(SELECT Image FROM {images_from} t WHERE t.Book_ID = b.ID)" if images_from else "NULL"
+    select = ", ".join(f"{image} AS Thumbnail" if c == "Thumbnail" else f"b.`{c}`" for c in columns)
+    return f"CREATE {'TEMP ' if temp else ''}VIEW Books AS SELECT {select} FROM {RECORDS_TABLE} b;"
+
+
+def ThumbnailRows(source_conn):
+    for book_id, image in source_conn.execute("SELECT ID, Thumbnail FROM Books WHERE Thumbnail IS NOT NULL;"):
+        image = bytes(image) if not isinstance(image, bytes) else image
+        yield book_id, hashlib.sha256(image).hexdigest(), len(image), image
+
+
+def ImageTotals(conn, table, column):
+    return conn.execute(f"SELECT COUNT(*), COALESCE(SUM(LENGTH({column})), 0) FROM {table} "
+                        f"WHERE {column} IS NOT NULL;").fetchone()
+
+
+def TablePages(conn, name):
+    try:
+        return conn.execute("SELECT COUNT(*) FROM dbstat WHERE name = ?;", (name,)).fetchone()[0]
+    except sqlite3.OperationalError:
+        return None
+
+
+def SplitThumbnails(source, output, thumbs_db=None):
+    source_conn = sqlite3.connect(f"file:{os.path.abspath(source)}?mode=ro", uri=True)
+    columns = BooksColumns(source_conn)
+    if not columns or "Thumbnail" not in columns:
+        print(f"Error: '{source}' has no Books table with a Thumbnail column (already split?).")
+        sys.exit(1)
+    books_pages = TablePages(source_conn, "Books")
+    expected = ImageTotals(source_conn, "Books", "Thumbnail")
+
+    partial = output + ".partial"
+    thumbs_partial = thumbs_db + ".partial" if thumbs_db else None
+    for path in filter(None, (partial, thumbs_partial)):
+        if os.path.exists(path):
+            os.remove(path)
+    started = time.perf_counter()
+    source_conn.execute("VACUUM INTO ?;", (partial,))
+
+    conn = sqlite3.connect(partial)
+    conn.execute("PRAGMA foreign_keys = OFF;")
+    if thumbs_db:
+        conn.execute(f"ATTACH DATABASE ? AS {COMPANION_SCHEMA};", (thumbs_partial,))
+        thumbnails = f"{COMPANION_SCHEMA}.{THUMBNAILS_TABLE}"
+    else:
+        thumbnails = THUMBNAILS_TABLE
+    conn.execute(f"CREATE TABLE {thumbnails} ( Book_ID INTEGER PRIMARY KEY, Hash TEXT NOT NULL, "
+                 "Bytes INTEGER NOT NULL, Image BLOB NOT NULL );")
+    conn.executemany(f"INSERT INTO {thumbnails} VALUES (?, ?, ?, ?);", ThumbnailRows(source_conn))
+    source_conn.close()
+    print(f"Copied {expected[0]:,} thumbnails ({expected[1] / 1024 / 1024:.1f} MB) "
+          f"in {time.perf_counter() - started:.2f}s")
+
+    conn.execute("ALTER TABLE Books ADD COLUMN ThumbnailHash TEXT;")
+    conn.execute(f"UPDATE Books SET ThumbnailHash = (SELECT Hash FROM {thumbnails} t WHERE t.Book_ID = Books.ID);")
+    conn.execute("ALTER TABLE Books DROP COLUMN Thumbnail;")
+    conn.execute(f"ALTER TABLE Books RENAME TO {RECORDS_TABLE};")
+    conn.execute(BooksViewSql(columns, None if thumbs_db else THUMBNAILS_TABLE))
+    conn.execute(f"CREATE TABLE {STORE_TABLE} ( Key TEXT PRIMARY KEY, Value TEXT );")
+    store = [("layout", "companion" if thumbs_db else "table")]
+    if thumbs_db:
+        store += [("companion_file", os.path.basename(thumbs_db)),
+                  ("attach_view_sql", BooksViewSql(columns, f"{COMPANION_SCHEMA}.{THUMBNAILS_TABLE}", temp=True))]
+    conn.executemany(f"INSERT INTO {STORE_TABLE} VALUES (?, ?);", store)
+    conn.commit()
+
+    copied = ImageTotals(conn, thumbnails, "Image")
+    if tuple(copied) != tuple(expected):
+        print(f"Error: thumbnails copied {copied[0]} ({copied[1]} bytes) but the source has "
+              f"{expected[0]} ({expected[1]} bytes); partial files left in place.")
+        sys.exit(1)
+    if thumbs_db:
+        conn.execute(f"DETACH DATABASE {COMPANION_SCHEMA};")
+    # Rewrite the file so BookRecords pages are contiguous and the dropped column's space is reclaimed
+    conn.execute("VACUUM;")
+    conn.execute("ANALYZE;")
+    check = conn.execute("PRAGMA quick_check;").fetchone()[0]
+    records_pages = TablePages(conn, RECORDS_TABLE)
+    conn.close()
+    if check != "ok":
+        print(f"Error: quick_check failed on the split copy: {check} (left at {partial})")
+        sys.exit(1)
+
+    if thumbs_db:
+        os.replace(thumbs_partial, thumbs_db)
+    os.replace(partial, output)
+    if books_pages is not None and records_pages is not None:
+        print(f"Book rows now span {records_pages:,} pages instead of {books_pages:,}")
+    print(f"Split catalog written to {output} ({os.path.getsize(output) / 1024 / 1024:.1f} MB)"
+          + (f", thumbnails to {thumbs_db} ({os.path.getsize(thumbs_db) / 1024 / 1024:.1f} MB)" if thumbs_db else "")
+          + f" in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move catalog thumbnails out of the Books table")
+    parser.add_argument("--db", default=DEFAULT_DB, help="Path to the catalog database")
+    parser.add_argument("--output", required=True, help="Path of the split catalog to write")
+    parser.add_argument("--thumbs-db", help="Write the thumbnails to this companion database instead")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.db):
+        print(f"Error: database '{args.db}' not found.")
+        sys.exit(1)
+    paths = [os.path.abspath(p) for p in filter(None, (args.db, args.output, args.thumbs_db))]
+    if len(set(paths)) != len(paths):
+        print("Error: --db, --output and --thumbs-db must be different files.")
+        sys.exit(1)
+    SplitThumbnails(args.db, args.output, args.thumbs_db)
@@ -1,24 +1,632 @@
-
 import http.server
+import itertools
 import socketserver
+import argparse
 import json
 import webbrowser
 import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+import urllib.parse
+import urllib.request
+from contextlib import contextmanager
+from datetime import datetime
+
+BOOK_LIST_COLUMNS = "ID, Title, Author, Category_ID, Subject_ID, Filename"
+BOOK_DETAIL_COLUMNS = BOOK_LIST_COLUMNS + ", Rating, FileSize, PageCount, DateAdded, GoogleDriveID"
+HASHED_FILE_PATTERN = re.compile(r'\.[0-9a-f]{12}\.[A-Za-z0-9]+$')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+API_MAX_LIMIT = 500
+
 
-def find_and_start_server():
+def load_config():
     with open('Config/ourlibrary_config.json', 'r') as f:
-        config = json.load(f)
+        return json.load(f)
+
+
+class DatabaseVersion:
+    """One published, read-only copy of the catalog and its connection pool.
+
+    Connections are leased per request. Once a version is retired, idle
+    connections are closed right away and leased ones are closed as they
+    come back, so in-flight queries finish against the file they started on.
+    """
+
+    mode = 'file'
+
+    def __init__(self, path, pool_size, mmap_size=0):
+        self.path = path
+        self.name = os.path.basename(path)
+        self.pool_size = pool_size
+        self.mmap_size = mmap_size
+        self._idle = []
+        self._leases = 0
+        self._retired = False
+        self._lock = threading.Lock()
+
+    def _open(self):
+        uri = 'file:' + urllib.request.pathname2url(os.path.abspath(self.path)) + '?mode=ro'
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        if self.mmap_size:
+            conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        return conn
+
+    def acquire(self):
+        with self._lock:
+            self._leases += 1
+            if self._idle:
+                return self._idle.pop()
+        try:
+            return self._open()
+        except sqlite3.Error:
+            with self._lock:
+                self._leases -= 1
+            raise
+
+    def release(self, conn):
+        with self._lock:
+            self._leases -= 1
+            if not self._retired and len(self._idle) < self.pool_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def retire(self):
+        with self._lock:
+            self._retired = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    @property
+    def drained(self):
+        with self._lock:
+            return self._retired and self._leases == 0
+
+
+class MemoryDatabaseVersion(DatabaseVersion):
+    """A version served entirely from RAM.
+
+    The file is copied once, when the version is activated, into a named
+    in-memory database (SQLite's memdb VFS). Every pooled connection opens
+    that same database read-only, so worker threads never touch the disk and
+    the catalog is held in memory once however many connections are open.
+    The holder connection keeps it alive; SQLite frees it when the last
+    connection to it closes after the version is retired.
+    """
+
+    mode = 'memory'
+    _serial = itertools.count(1)
+
+    def __init__(self, path, pool_size, mmap_size=0):
+        super().__init__(path, pool_size, mmap_size)
+        # Unique per instance: a rolled-back-to version may still be draining under the same name
+        self._uri = f'file:/{self.name}-{next(self._serial)}?vfs=memdb'
+        self._holder = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        source_uri = 'file:' + urllib.request.pathname2url(os.path.abspath(path)) + '?mode=ro'
+        source = sqlite3.connect(source_uri, uri=True)
+        try:
+            source.backup(self._holder)
+        finally:
+            source.close()
+
+    def _open(self):
+        conn = sqlite3.connect(self._uri, uri=True, check_same_thread=False)
+        conn.execute('PRAGMA query_only=ON')
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def retire(self):
+        super().retire()
+        # Leased connections still hold the database open until they come back
+        self._holder.close()
+
+
+class CatalogDatabase:
+    """Versioned, hot-swappable store for OurLibrary.db.
+
+    A file dropped at ``local_database_path`` is never served directly. It is
+    snapshotted with the SQLite backup API (which also folds in any pending
+    WAL frames), checked, and published as an immutable file in the versions
+    directory. The ``CURRENT`` pointer file is then replaced with a single
+    atomic rename, so readers see either the old version or the new one.
+
+    The drop-in's size and mtime at the last publish or rollback are kept in
+    ``SOURCE`` next to the pointer, so a restart only republishes the drop-in
+    when it has actually changed since then.
+    """
+
+    POINTER_NAME = 'CURRENT'
+    SOURCE_SIGNATURE_NAME = 'SOURCE'
+
+    def __init__(self, config):
+        self.source_path = config.get('local_database_path', 'Data/Databases/OurLibrary.db')
+        self.versions_path = config.get('database_versions_path', 'Data/Databases/Versions')
+        self.backup_path = config.get('backup_database_path', 'Data/Local/backup_library.db')
+        self.max_versions = max(1, config.get('max_backup_versions', 5))
+        self.pool_size = config.get('database_pool_size', 4)
+        self.watch_interval = config.get('database_watch_interval_seconds', 2)
+        self.serving_mode = config.get('database_serving_mode', 'file')
+        self.memory_max_bytes = config.get('database_memory_max_mb', 256) * 1024 * 1024
+        self.mmap_size = config.get('database_mmap_size_mb', 256) * 1024 * 1024
+        self.pointer_path = os.path.join(self.versions_path, self.POINTER_NAME)
+        self.source_signature_path = os.path.join(self.versions_path, self.SOURCE_SIGNATURE_NAME)
+        self.stem = os.path.splitext(os.path.basename(self.source_path))[0]
+        self._current = None
+        self._retired = []
+        self._lock = threading.Lock()
+        self._pending_signature = None
+        self._serving = False
+
+    # -- lifecycle -----------------------------------------------------
+
+    def load(self):
+        os.makedirs(self.versions_path, exist_ok=True)
+        name = self._read_pointer()
+        if name:
+            self._activate(name)
+
+    def start(self, watch=True):
+        self._serving = True
+        self.load()
+        if os.path.exists(self.source_path):
+            if self._current is None or self._source_signature() != self._read_source_signature():
+                self.publish()
+        if watch:
+            threading.Thread(target=self._watch, name='catalog-watcher', daemon=True).start()
+
+    @property
+    def current(self):
+        with self._lock:
+            return self._current
+
+    @contextmanager
+    def connection(self):
+        with self._lock:
+            version = self._current
+        if version is None:
+            raise FileNotFoundError(f"No published database in '{self.versions_path}'")
+        conn = version.acquire()
+        try:
+            yield conn
+        finally:
+            version.release(conn)
+
+    def open_current_file(self):
+        # The open descriptor pins the version's file, so a download that
+        # started before a swap keeps streaming the old bytes to completion.
+        with self._lock:
+            version = self._current
+        if version is None:
+            raise FileNotFoundError(f"No published database in '{self.versions_path}'")
+        return version.name, open(version.path, 'rb')
+
+    # -- publishing and rollback ---------------------------------------
+
+    def publish(self, source_path=None):
+        source_path = source_path or self.source_path
+        signature = self._source_signature()
+        timestamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        name = f"{self.stem}-{timestamp}.db"
+        staging_path = os.path.join(self.versions_path, f".staging-{name}")
+        try:
+            self._snapshot(source_path, staging_path)
+            os.replace(staging_path, os.path.join(self.versions_path, name))
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+        previous = self.current
+        if previous is not None:
+            self._backup(previous.path)
+        self._write_pointer(name)
+        self._write_source_signature(signature)
+        self._activate(name)
+        self._prune()
+        print(f"Published database version {name}")
+        return name
+
+    def rollback(self):
+        current = self.current
+        older = [n for n in self._version_names() if current is None or n < current.name]
+        if older:
+            name = older[-1]
+        elif os.path.exists(self.backup_path):
+            print(f"No older version on disk, restoring from {self.backup_path}")
+            return self.publish(self.backup_path)
+        else:
+            raise FileNotFoundError("No older database version available for rollback")
+        self._write_pointer(name)
+        # The drop-in counts as handled, so a restart does not republish it over the rollback
+        self._write_source_signature(self._source_signature())
+        self._activate(name)
+        print(f"Rolled back to database version {name}")
+        return name
+
+    def _snapshot(self, source_path, target_path):
+        source_uri = 'file:' + urllib.request.pathname2url(os.path.abspath(source_path)) + '?mode=ro'
+        source = sqlite3.connect(source_uri, uri=True)
+        target = sqlite3.connect(target_path)
+        try:
+            source.backup(target)
+            # Published files are read-only; a rollback journal keeps readers
+            # from needing -wal/-shm side files next to them.
+            target.execute('PRAGMA journal_mode=DELETE')
+            result = target.execute('PRAGMA quick_check').fetchone()[0]
+            if result != 'ok':
+                raise sqlite3.DatabaseError(f"quick_check failed for '{source_path}': {result}")
+        finally:
+            target.close()
+            source.close()
+        with open(target_path, 'rb') as f:
+            os.fsync(f.fileno())
+
+    def _backup(self, version_path):
+        os.makedirs(os.path.dirname(self.backup_path) or '.', exist_ok=True)
+        staging_path = self.backup_path + '.tmp'
+        shutil.copyfile(version_path, staging_path)
+        os.replace(staging_path, self.backup_path)
+
+    def _write_pointer(self, name):
+        self._write_atomically(self.pointer_path, name)
+
+    def _write_source_signature(self, signature):
+        if signature is not None:
+            self._write_atomically(self.source_signature_path, ' '.join(map(str, signature)))
+
+    def _write_atomically(self, path, text):
+        staging_path = path + '.tmp'
+        with open(staging_path, 'w') as f:
+            f.write(text + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(staging_path, path)
+
+    def _read_pointer(self):
+        try:
+            with open(self.pointer_path, 'r') as f:
+                name = f.read().strip()
+        except FileNotFoundError:
+            return None
+        if name and os.path.exists(os.path.join(self.versions_path, name)):
+            return name
+        return None
+
+    def _read_source_signature(self):
+        try:
+            with open(self.source_signature_path, 'r') as f:
+                return tuple(int(part) for part in f.read().split())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _version_class(self, path):
+        if self.serving_mode != 'memory':
+            return DatabaseVersion
+        if sqlite3.sqlite_version_info < (3, 36, 0):
+            print(f"SQLite {sqlite3.sqlite_version} has no shared memdb, serving from file")
+            return DatabaseVersion
+        if os.path.getsize(path) > self.memory_max_bytes:
+            print(f"{os.path.basename(path)} exceeds database_memory_max_mb, serving from file")
+            return DatabaseVersion
+        return MemoryDatabaseVersion
+
+    def _activate(self, name):
+        path = os.path.join(self.versions_path, name)
+        # Build (and, in memory mode, load) the new version before taking the
+        # lock so requests keep flowing to the old version meanwhile.
+        version = self._version_class(path)(path, self.pool_size, self.mmap_size)
+        with self._lock:
+            previous, self._current = self._current, version
+            if previous is not None:
+                self._retired.append(previous)
+        if previous is not None:
+            previous.retire()
+        self._reap()
+
+    def _reap(self):
+        with self._lock:
+            self._retired = [v for v in self._retired if not v.drained]
+
+    def _version_names(self):
+        return sorted(
+            n for n in os.listdir(self.versions_path)
+            if n.startswith(self.stem + '-') and n.endswith('.db')
+        )
+
+    def _prune(self):
+        # Only the serving process knows which versions still have leased
+        # connections; a --publish/--rollback CLI run leaves pruning to it.
+        if not self._serving:
+            return
+        with self._lock:
+            in_use = {v.name for v in self._retired if not v.drained}
+            if self._current is not None:
+                in_use.add(self._current.name)
+        names = self._version_names()
+        for name in names[:-self.max_versions]:
+            if name not in in_use:
+                os.remove(os.path.join(self.versions_path, name))
+
+    # -- background watcher --------------------------------------------
+
+    def _source_signature(self):
+        try:
+            stat = os.stat(self.source_path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _watch(self):
+        while True:
+            time.sleep(self.watch_interval)
+            try:
+                self._poll()
+            except Exception as e:
+                print(f"Database watcher error: {e}")
+
+    def _poll(self):
+        # Another process (e.g. `launch_server.py --rollback`) may have moved
+        # the pointer; follow it without restarting.
+        name = self._read_pointer()
+        current = self.current
+        if name and (current is None or name != current.name):
+            self._activate(name)
+            self._prune()
+            print(f"Switched to database version {name}")
+
+        self._reap()
+        self._prune()
+
+        if not os.path.exists(self.source_path):
+            return
+        signature = self._source_signature()
+        # Read from disk: a --publish/--rollback run in another process also records it
+        if signature == self._read_source_signature():
+            self._pending_signature = None
+            return
+        # Only publish once the drop-in has stopped changing between polls.
+        if signature != self._pending_signature:
+            self._pending_signature = signature
+            return
+        self._pending_signature = None
+        self.publish()
+
+
+class AssetManifest:
+    """Maps fixed page URLs to the fingerprinted builds from Scripts/BuildAssets.py.
+
+    The manifest is re-read whenever its mtime changes, so rebuilding the
+    assets takes effect without restarting the server. Without a manifest
+    the original pages are served unchanged.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.path = os.path.join(root, 'manifest.json')
+        self._mtime = None
+        self._pages = {}
+
+    def page_path(self, url_path):
+        self._refresh()
+        name = 'index.html' if url_path == '/' else url_path.lstrip('/')
+        hashed = self._pages.get(name)
+        return os.path.join(self.root, hashed) if hashed else None
+
+    def _refresh(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            self._mtime, self._pages = None, {}
+            return
+        if mtime != self._mtime:
+            with open(self.path, 'r') as f:
+                self._pages = json.load(f).get('pages', {})
+            self._mtime = mtime
+
+
+class LibraryRequestHandler(http.server.SimpleHTTPRequestHandler):
+    catalog = None
+    assets = None
+    database_url_path = '/Data/Databases/OurLibrary.db'
+    immutable_prefixes = ()
+    _response_code = None
+
+    def send_response(self, code, message=None):
+        self._response_code = code
+        super().send_response(code, message)
+
+    def end_headers(self):
+        # Content-hashed build output never changes under the same name, so
+        # browsers may keep it forever; unhashed entry points such as
+        # manifest.json must be revalidated on every load.
+        path = urllib.parse.urlsplit(self.path).path
+        if self._response_code == 200 and path.startswith(self.immutable_prefixes):
+            if HASHED_FILE_PATTERN.search(path):
+                self.send_header('Cache-Control', IMMUTABLE_CACHE_CONTROL)
+            else:
+                self.send_header('Cache-Control', 'no-cache')
+        super().end_headers()
+
+    def do_GET(self):
+        parsed = urllib.parse.urlsplit(self.path)
+        if parsed.path == self.database_url_path:
+            return self.send_database()
+        if parsed.path.startswith('/api/'):
+            return self.send_api(parsed.path, urllib.parse.parse_qs(parsed.query))
+        page_path = self.assets.page_path(parsed.path) if self.assets else None
+        if page_path and os.path.exists(page_path):
+            return self.send_built_page(page_path)
+        return super().do_GET()
+
+    def send_built_page(self, page_path):
+        # Pages keep their fixed URLs so links between them still work; the
+        # fingerprinted name doubles as a strong ETag for cheap revalidation.
+        etag = f'"{os.path.basename(page_path)}"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        with open(page_path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_database(self):
+        try:
+            name, f = self.catalog.open_current_file()
+        except FileNotFoundError:
+            return self.send_error(404, "Database not published")
+        with f:
+            etag = f'"{name}"'
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/vnd.sqlite3')
+            self.send_header('Content-Length', str(os.fstat(f.fileno()).st_size))
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('ETag', etag)
+            self.end_headers()
+            shutil.copyfileobj(f, self.wfile)
+
+    def send_api(self, path, query):
+        def param(key, default=None):
+            return query.get(key, [default])[0]
+
+        def int_param(key, default=None, low=None, high=None):
+            value = param(key)
+            if value is None:
+                if default is None:
+                    raise ValueError(f"Missing parameter '{key}'")
+                return default
+            value = int(value)
+            if low is not None:
+                value = max(low, value)
+            if high is not None:
+                value = min(high, value)
+            return value
+
+        try:
+            if path == '/api/thumbnail':
+                return self.send_thumbnail(int_param('id'))
+            payload = self.run_api_query(path, param, int_param)
+        except FileNotFoundError as e:
+            return self.send_error(503, str(e))
+        except (ValueError, sqlite3.Error) as e:
+            return self.send_error(400, str(e))
+        if payload is None:
+            return self.send_error(404, "Unknown API endpoint")
+        self.send_json(payload)
+
+    def run_api_query(self, path, param, int_param):
+        with self.catalog.connection() as conn:
+            if path == '/api/status':
+                books = conn.execute('SELECT COUNT(*) FROM Books').fetchone()[0]
+                current = self.catalog.current
+                return {'ok': True, 'version': current.name, 'mode': current.mode, 'books': books}
+            if path == '/api/categories':
+                rows = conn.execute('SELECT ID, Category FROM Categories ORDER BY Category').fetchall()
+            elif path == '/api/subjects':
+                rows = conn.execute(
+                    'SELECT ID, Subject FROM Subjects WHERE Category_ID = ? ORDER BY Subject',
+                    (int_param('category_id'),)).fetchall()
+            elif path == '/api/search':
+                term = f"%{(param('q') or '').strip()}%"
+                field = param('field', 'any')
+                if field == 'title':
+                    sql = f'SELECT {BOOK_LIST_COLUMNS} FROM Books WHERE Title LIKE ? ORDER BY Title LIMIT 200'
+                    rows = conn.execute(sql, (term,)).fetchall()
+                elif field == 'author':
+                    sql = f'SELECT {BOOK_LIST_COLUMNS} FROM Books WHERE Author LIKE ? ORDER BY Author, Title LIMIT 200'
+                    rows = conn.execute(sql, (term,)).fetchall()
+                else:
+                    sql = f'SELECT {BOOK_LIST_COLUMNS} FROM Books WHERE Title LIKE ? OR Author LIKE ? ORDER BY Title LIMIT 200'
+                    rows = conn.execute(sql, (term, term)).fetchall()
+            elif path == '/api/books':
+                conditions, params = [], []
+                if param('category_id'):
+                    conditions.append('Category_ID = ?')
+                    params.append(int(param('category_id')))
+                if param('subject_id'):
+                    conditions.append('Subject_ID = ?')
+                    params.append(int(param('subject_id')))
+                sql = f'SELECT {BOOK_LIST_COLUMNS} FROM Books'
+                if conditions:
+                    sql += ' WHERE ' + ' AND '.join(conditions)
+                sql += ' ORDER BY Title LIMIT ? OFFSET ?'
+                # A negative LIMIT means no limit to SQLite
+                params += [int_param('limit', 100, 1, API_MAX_LIMIT), int_param('offset', 0, 0)]
+                rows = conn.execute(sql, params).fetchall()
+            elif path == '/api/book':
+                rows = conn.execute(
+                    f'SELECT {BOOK_DETAIL_COLUMNS} FROM Books WHERE ID = ?', (int_param('id'),)).fetchall()
+            else:
+                return None
+            return [dict(row) for row in rows]
+
+    def send_thumbnail(self, book_id):
+        with self.catalog.connection() as conn:
+            row = conn.execute('SELECT Thumbnail FROM Books WHERE ID = ?', (book_id,)).fetchone()
+        if row is None or row[0] is None:
+            return self.send_error(404, "No thumbnail")
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/png' if row[0].startswith(b'\x89PNG') else 'image/jpeg')
+        self.send_header('Content-Length', str(len(row[0])))
+        self.end_headers()
+        self.wfile.write(row[0])
+
+    def send_json(self, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-cache')
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class LibraryServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    # Thumbnail grids open several connections per visitor at once; the
+    # default backlog of 5 turns bursts into SYN retries.
+    request_queue_size = 128
+
+
+def find_and_start_server(catalog, port=None, open_browser=True):
+    config = load_config()
 
     host = config.get('server_host', '127.0.0.1')
-    ports = config.get('server_port_range', [8080, 8081, 8082, 3000, 8000, 8010, 8090, 5000, 9000])
+    ports = [port] if port else config.get('server_port_range', [8080, 8081, 8082, 3000, 8000, 8010, 8090, 5000, 9000])
+
+    Handler = LibraryRequestHandler
+    Handler.catalog = catalog
+    Handler.database_url_path = '/' + catalog.source_path.replace(os.sep, '/').lstrip('/')
+    assets_path = config.get('static_assets_path', 'Static/Assets')
+    Handler.assets = AssetManifest(assets_path)
+    Handler.immutable_prefixes = (
+        '/' + config.get('static_catalog_path', 'Static/Catalog').strip('/') + '/',
+        '/' + assets_path.strip('/') + '/',
+    )
 
     for port in ports:
         try:
-            Handler = http.server.SimpleHTTPRequestHandler
-            with socketserver.TCPServer((host, port), Handler) as httpd:
+            with LibraryServer((host, port), Handler) as httpd:
                 url = f"http://{host}:{port}/new-desktop-library.html"
-                print(f"Serving on {url}")
-                webbrowser.open(url)
+                print(f"Serving on {url}", flush=True)
+                if open_browser:
+                    webbrowser.open(url)
                 httpd.serve_forever()
                 return
         except OSError as e:
@@ -30,4 +638,21 @@ def find_and_start_server():
     print("Could not find an available port.")
 
 if __name__ == "__main__":
-    find_and_start_server()
+    parser = argparse.ArgumentParser(description="Serve OurLibrary locally with hot-swappable database versions")
+    parser.add_argument("--publish", metavar="DB_PATH", nargs="?", const="",
+                        help="Publish a database as a new version and exit (defaults to local_database_path)")
+    parser.add_argument("--rollback", action="store_true", help="Switch to the previous database version and exit")
+    parser.add_argument("--port", type=int, help="Serve on this port instead of trying server_port_range")
+    parser.add_argument("--no-browser", action="store_true", help="Do not open a browser window")
+    args = parser.parse_args()
+
+    catalog = CatalogDatabase(load_config())
+    if args.publish is not None or args.rollback:
+        catalog.load()
+        if args.rollback:
+            catalog.rollback()
+        else:
+            catalog.publish(args.publish or None)
+    else:
+        catalog.start()
+        find_and_start_server(catalog, args.port, not args.no_browser)